@@ -153,4 +153,64 @@ EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = 'resend'  # Resend için sabit
 EMAIL_HOST_PASSWORD = os.environ.get('RESEND_API_KEY', '')
-DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'onboarding@resend.dev')
\ No newline at end of file
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'onboarding@resend.dev')
+
+# Kampanya gönderim motoru
+EMAIL_SEND_CONCURRENCY = int(os.environ.get('EMAIL_SEND_CONCURRENCY', 4))  # Eşzamanlı iş parçacığı
+EMAIL_SEND_RATE_LIMIT = float(os.environ.get('EMAIL_SEND_RATE_LIMIT', 10))  # Gönderici başına saniyede en fazla istek (0 = sınırsız)
+EMAIL_SEND_BURST = float(os.environ.get('EMAIL_SEND_BURST', 0)) or None  # Anlık patlama kapasitesi (boşsa hız kadar)
+EMAIL_RATE_LIMIT_SCOPE = os.environ.get('EMAIL_RATE_LIMIT_SCOPE', 'shared')  # 'shared': kota tüm süreçlerce veritabanından paylaşılır, 'process': süreç başına
+EMAIL_SEND_TRANSPORT = os.environ.get('EMAIL_SEND_TRANSPORT', 'single')  # 'single' veya 'batch'
+EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', 100))  # Batch isteği başına e-posta (Resend en fazla 100)
+EMAIL_OUTBOX_CLAIM_SIZE = int(os.environ.get('EMAIL_OUTBOX_CLAIM_SIZE', 500))  # İşçinin tek seferde sahiplendiği mesaj sayısı
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.environ.get('EMAIL_OUTBOX_LEASE_SECONDS', 600))  # Bu süreyi aşan sahiplenmeler tekrar kuyruğa alınır
+EMAIL_LOG_BUFFER_SIZE = int(os.environ.get('EMAIL_LOG_BUFFER_SIZE', 500))  # Toplu yazılan EmailLog satırı sayısı
+
+# E-posta açılma/tıklanma takibi
+TRACKING_BASE_URL = os.environ.get('TRACKING_BASE_URL', 'https://mail-rmi9.onrender.com')  # Production'da gerçek domain
+TRACKING_FLUSH_INTERVAL = float(os.environ.get('TRACKING_FLUSH_INTERVAL', 2))  # Takip olaylarının toplu yazılma aralığı (saniye)
+TRACKING_BUFFER_SIZE = int(os.environ.get('TRACKING_BUFFER_SIZE', 1000))  # Bu kadar olay birikince beklemeden yazılır
+TRACKING_MAX_RETRIES = int(os.environ.get('TRACKING_MAX_RETRIES', 5))  # Bu kadar başarısız flush'tan sonra olaylar tek tek yazılır, yazılamayanlar atlanır
+
+# Abone içe aktarma
+SUBSCRIBER_IMPORT_CHUNK_SIZE = int(os.environ.get('SUBSCRIBER_IMPORT_CHUNK_SIZE', 1000))  # Parça başına satır
+SUBSCRIBER_IMPORT_MAX_UPLOAD_SIZE = int(os.environ.get('SUBSCRIBER_IMPORT_MAX_UPLOAD_SIZE', 0)) or None  # Bayt, boşsa sınırsız
+IMPORT_JOB_LEASE_SECONDS = int(os.environ.get('IMPORT_JOB_LEASE_SECONDS', 600))  # İlerleme bildirmeyen iş bu süre sonunda tekrar kuyruğa alınır
+
+# Yüklenen dosyalar
+MEDIA_URL = 'media/'
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+
+# Dışa aktarma
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))  # Veritabanından parça başına okunan satır
+
+# Önbellek (varsayılan işlem içi bellek; çok işlemli kurulumda DB veya dosya önbelleği seçin)
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'mailotomasyon'),
+    }
+}
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', 300))  # Dashboard verisinin en uzun önbellek süresi (saniye)
+
+# Kampanya zamanlayıcısı (manage.py run_scheduler)
+SCHEDULER_POLL_INTERVAL = float(os.environ.get('SCHEDULER_POLL_INTERVAL', 10))  # Yeni planlanan kampanyalar için en uzun bekleme (saniye)
+SCHEDULER_LOOKAHEAD = int(os.environ.get('SCHEDULER_LOOKAHEAD', 300))  # Her sorguda heap'e alınan ileri pencere (saniye)
+SCHEDULER_DISPATCH_CONCURRENCY = int(os.environ.get('SCHEDULER_DISPATCH_CONCURRENCY', 4))  # Aynı anda kuyruğa alınan kampanya
+
+# Otomasyon akışları (manage.py run_automations)
+AUTOMATION_CLAIM_SIZE = int(os.environ.get('AUTOMATION_CLAIM_SIZE', 500))  # İşçinin tek seferde sahiplendiği akış sayısı
+AUTOMATION_LEASE_SECONDS = int(os.environ.get('AUTOMATION_LEASE_SECONDS', 600))  # Bu süreyi aşan sahiplenmeler tekrar beklemeye alınır
+AUTOMATION_MAX_ATTEMPTS = int(os.environ.get('AUTOMATION_MAX_ATTEMPTS', 3))  # Adım başına gönderim denemesi
+AUTOMATION_POLL_INTERVAL = float(os.environ.get('AUTOMATION_POLL_INTERVAL', 30))  # Yeni akışlar için en uzun bekleme (saniye)
+AUTOMATION_TRIGGER_INDEX_TTL = int(os.environ.get('AUTOMATION_TRIGGER_INDEX_TTL', 60))  # Liste -> abonelik otomasyonu önbelleğinin ömrü (saniye)
+
+# Webhook gönderimi (manage.py run_webhooks)
+WEBHOOK_TIMEOUT = float(os.environ.get('WEBHOOK_TIMEOUT', 10))  # İstek başına zaman aşımı (saniye)
+WEBHOOK_CONCURRENCY = int(os.environ.get('WEBHOOK_CONCURRENCY', 4))  # Eşzamanlı istek ve bağlantı havuzu boyutu
+WEBHOOK_CLAIM_SIZE = int(os.environ.get('WEBHOOK_CLAIM_SIZE', 200))  # İşçinin tek seferde sahiplendiği gönderim sayısı
+WEBHOOK_LEASE_SECONDS = int(os.environ.get('WEBHOOK_LEASE_SECONDS', 300))  # Bu süreyi aşan sahiplenmeler tekrar kuyruğa alınır
+WEBHOOK_MAX_ATTEMPTS = int(os.environ.get('WEBHOOK_MAX_ATTEMPTS', 8))  # Başarısız sayılmadan önceki deneme sayısı
+WEBHOOK_RETRY_BASE_SECONDS = float(os.environ.get('WEBHOOK_RETRY_BASE_SECONDS', 10))  # İlk tekrar denemesinden önceki bekleme, her denemede iki katına çıkar
+WEBHOOK_RETRY_MAX_SECONDS = float(os.environ.get('WEBHOOK_RETRY_MAX_SECONDS', 3600))  # Tekrar denemeleri arasındaki en uzun bekleme
+WEBHOOK_INDEX_TTL = int(os.environ.get('WEBHOOK_INDEX_TTL', 60))  # Kullanıcı -> webhook olay türleri önbelleğinin ömrü (saniye)
@@ -28,6 +28,13 @@ class SubscriberAdmin(admin.ModelAdmin):
     search_fields = ['email', 'name', 'mail_list__name']
     readonly_fields = ['subscribed_at', 'unsubscribed_at']
 
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ['mail_list', 'user', 'status', 'processed', 'inserted', 'skipped', 'invalid', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['mail_list__name', 'user__username']
+    readonly_fields = ['claimed_by', 'processed', 'inserted', 'skipped', 'invalid', 'started_at', 'finished_at']
+
 @admin.register(EmailTemplate)
 class EmailTemplateAdmin(admin.ModelAdmin):
     list_display = ['name', 'user', 'template_type', 'is_default', 'created_at']
@@ -61,12 +68,46 @@ class EmailLogAdmin(admin.ModelAdmin):
     search_fields = ['campaign__name', 'subscriber__email']
     readonly_fields = ['created_at', 'opened_at', 'clicked_at']
 
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ['campaign', 'subscriber', 'status', 'attempts', 'claimed_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['campaign__name', 'subscriber__email']
+    readonly_fields = ['claimed_by', 'claimed_at', 'sent_at']
+
+@admin.register(SendRateLimit)
+class SendRateLimitAdmin(admin.ModelAdmin):
+    list_display = ['key', 'next_free_us', 'updated_at']
+    search_fields = ['key']
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['webhook', 'event_type', 'status', 'attempts', 'next_attempt_at', 'response_status']
+    list_filter = ['status', 'event_type']
+    search_fields = ['webhook__name', 'webhook__url']
+    readonly_fields = ['claimed_by', 'claimed_at', 'delivered_at', 'response_status']
+
+@admin.register(JourneyState)
+class JourneyStateAdmin(admin.ModelAdmin):
+    list_display = ['automation', 'subscriber', 'next_step', 'status', 'due_at', 'attempts']
+    list_filter = ['status']
+    search_fields = ['automation__name', 'subscriber__email']
+    raw_id_fields = ['subscriber']
+
 @admin.register(ClickTrack)
 class ClickTrackAdmin(admin.ModelAdmin):
     list_display = ['email_log', 'url', 'click_count']
     list_filter = ['created_at']
     search_fields = ['email_log__subscriber__email', 'url']
 
+@admin.register(EngagementSketch)
+class EngagementSketchAdmin(admin.ModelAdmin):
+    list_display = ['campaign', 'kind', 'date', 'cardinality', 'updated_at']
+    list_filter = ['kind', 'date']
+    search_fields = ['campaign__name']
+    exclude = ['registers']
+    readonly_fields = ['cardinality']
+
 @admin.register(Blacklist)
 class BlacklistAdmin(admin.ModelAdmin):
     list_display = ['email', 'user', 'reason', 'created_at']
@@ -75,7 +116,7 @@ class BlacklistAdmin(admin.ModelAdmin):
 
 @admin.register(Webhook)
 class WebhookAdmin(admin.ModelAdmin):
-    list_display = ['name', 'user', 'event_type', 'is_active', 'created_at']
+    list_display = ['name', 'user', 'event_type', 'batch_size', 'is_active', 'created_at']
     list_filter = ['event_type', 'is_active']
     search_fields = ['name', 'user__username', 'url']
 
@@ -86,6 +127,10 @@ class AnalyticsAdmin(admin.ModelAdmin):
     search_fields = ['user__username']
     readonly_fields = ['delivery_rate', 'open_rate', 'click_rate', 'bounce_rate']
 
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ['name', 'processed_until', 'updated_at']
+
 # User admin'i genişletme
 class UserProfileInline(admin.StackedInline):
     model = UserProfile
@@ -0,0 +1,389 @@
+# otomasyon/automations.py
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from .dashboard_cache import invalidate_dashboard
+from .email_backend import CampaignSendEngine, EmailSender, make_worker_id
+from .models import Automation, AutomationStep, Campaign, EmailLog, JourneyState
+
+JOURNEY_FIELDS = [
+    'next_step', 'status', 'due_at', 'attempts', 'claimed_by',
+    'claimed_at', 'completed_at', 'error', 'updated_at',
+]
+
+def ordered_steps(automation_ids):
+    """{automation_id: [adımlar]} sözlüğü, adımlar step_order sırasıyla"""
+    steps = {}
+    for step in AutomationStep.objects.filter(
+        automation_id__in=automation_ids
+    ).select_related('campaign').order_by('step_order', 'created_at'):
+        steps.setdefault(step.automation_id, []).append(step)
+    return steps
+
+def step_delay(automation, step, first=False):
+    """Adımın bir önceki olaydan (tetiklenme veya önceki gönderim) itibaren beklemesi
+
+    İlk adıma otomasyonun delay_minutes değeri eklenir; sonraki adımlar arasında
+    en az interval_minutes kadar beklenir.
+    """
+    delay = timezone.timedelta(days=step.delay_days)
+    if first:
+        return delay + timezone.timedelta(minutes=automation.delay_minutes)
+    return max(delay, timezone.timedelta(minutes=automation.interval_minutes))
+
+def start_journeys(automation, subscriber_ids, started_at=None, steps=None):
+    """Aboneleri otomasyonun ilk adımına yerleştirir; zaten akışta olanlar atlanır
+
+    Oluşturulan akış sayısını döndürür.
+    """
+    if steps is None:
+        steps = ordered_steps([automation.id]).get(automation.id)
+    if not steps:
+        return 0
+    first = steps[0]
+    due_at = (started_at or timezone.now()) + step_delay(automation, first, first=True)
+
+    subscriber_ids = set(subscriber_ids)
+    existing = set(JourneyState.objects.filter(
+        automation=automation,
+        subscriber_id__in=subscriber_ids
+    ).values_list('subscriber_id', flat=True))
+    journeys = [
+        JourneyState(automation=automation, subscriber_id=subscriber_id, next_step=first, due_at=due_at)
+        for subscriber_id in subscriber_ids - existing
+    ]
+    if journeys:
+        JourneyState.objects.bulk_create(journeys, ignore_conflicts=True, batch_size=1000)
+        Automation.increment_counters(automation.pk, total_triggered=len(journeys))
+    return len(journeys)
+
+SubscriptionTrigger = namedtuple('SubscriptionTrigger', ['automation_id', 'first_step_id', 'delay'])
+
+class SubscriptionTriggerIndex:
+    """Liste -> aktif 'subscription' otomasyonları eşlemesinin işlem içi önbelleği
+
+    Tek sorguyla kurulur; Automation/AutomationStep değiştiğinde signals.py
+    tarafından geçersiz kılınır. Başka süreçlerdeki değişiklikler en geç
+    AUTOMATION_TRIGGER_INDEX_TTL saniye sonra görülür.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.triggers = None
+        self.built_at = 0
+
+    def invalidate(self):
+        with self.lock:
+            self.triggers = None
+
+    def _build(self):
+        triggers = {}
+        seen = set()
+        for row in AutomationStep.objects.filter(
+            automation__is_active=True,
+            automation__trigger_type='subscription'
+        ).order_by('automation_id', 'step_order', 'created_at').values(
+            'id', 'delay_days', 'automation_id', 'automation__mail_list_id', 'automation__delay_minutes'
+        ):
+            # Her otomasyonun yalnızca ilk adımı gerekir
+            if row['automation_id'] in seen:
+                continue
+            seen.add(row['automation_id'])
+            delay = timezone.timedelta(days=row['delay_days'], minutes=row['automation__delay_minutes'])
+            triggers.setdefault(row['automation__mail_list_id'], []).append(
+                SubscriptionTrigger(row['automation_id'], row['id'], delay)
+            )
+        return triggers
+
+    def get(self, mail_list_id):
+        """Listeye bağlı tetikleyiciler; önbellek sıcakken sorgu çalıştırmaz"""
+        ttl = getattr(settings, 'AUTOMATION_TRIGGER_INDEX_TTL', 60)
+        with self.lock:
+            if self.triggers is None or time.monotonic() - self.built_at > ttl:
+                self.triggers = self._build()
+                self.built_at = time.monotonic()
+            return self.triggers.get(mail_list_id, [])
+
+subscription_triggers = SubscriptionTriggerIndex()
+
+def start_subscription_journeys(members, started_at=None):
+    """Yeni abonelikler için listelerinin 'subscription' otomasyon akışlarını başlatır
+
+    members (subscriber_id, mail_list_id) çiftleridir. Tüm akışlar tek toplu
+    INSERT ile yazılır; tetikleyicisi olmayan listeler için sorgu çalışmaz.
+    """
+    started_at = started_at or timezone.now()
+    journeys = []
+    triggered = {}
+    for subscriber_id, mail_list_id in members:
+        for trigger in subscription_triggers.get(mail_list_id):
+            journeys.append(JourneyState(
+                automation_id=trigger.automation_id,
+                subscriber_id=subscriber_id,
+                next_step_id=trigger.first_step_id,
+                due_at=started_at + trigger.delay
+            ))
+            counts = triggered.setdefault(trigger.automation_id, {'total_triggered': 0})
+            counts['total_triggered'] += 1
+    if journeys:
+        JourneyState.objects.bulk_create(journeys, ignore_conflicts=True, batch_size=1000)
+        Automation.bulk_increment_counters(triggered)
+    return len(journeys)
+
+def release_stale_journeys(lease_seconds=None):
+    """Çöken işçilerin üzerinde kalan akışları tekrar bekleme durumuna al"""
+    if lease_seconds is None:
+        lease_seconds = getattr(settings, 'AUTOMATION_LEASE_SECONDS', 600)
+    expired = timezone.now() - timezone.timedelta(seconds=lease_seconds)
+    return JourneyState.objects.filter(
+        status='running',
+        claimed_at__lt=expired
+    ).update(status='waiting', claimed_by='')
+
+def claim_due_journeys(worker_id, limit=None, now=None):
+    """Zamanı gelmiş akışlardan bir grubu (status, due_at) index'i üzerinden sahiplen
+
+    Tablonun geri kalanı taranmaz; yalnızca due_at <= şimdi olan satırlar okunur.
+    """
+    limit = limit or getattr(settings, 'AUTOMATION_CLAIM_SIZE', 500)
+    now = now or timezone.now()
+    due = JourneyState.objects.filter(
+        status='waiting',
+        due_at__lte=now,
+        automation__is_active=True
+    )
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True, of=('self',))
+        ids = list(due.order_by('due_at').values_list('id', flat=True)[:limit])
+        if not ids:
+            return []
+        JourneyState.objects.filter(id__in=ids, status='waiting').update(
+            status='running',
+            claimed_by=worker_id,
+            claimed_at=now,
+            attempts=F('attempts') + 1
+        )
+
+    return list(
+        JourneyState.objects.filter(
+            id__in=ids,
+            status='running',
+            claimed_by=worker_id
+        ).select_related('subscriber', 'automation').order_by('due_at')
+    )
+
+def seconds_until_next_due(max_wait):
+    """Bir sonraki akışın zamanına kalan süre (en fazla max_wait)"""
+    next_due = JourneyState.objects.filter(
+        status='waiting',
+        automation__is_active=True
+    ).aggregate(next_due=Min('due_at'))['next_due']
+    if next_due is None:
+        return max_wait
+    return min(max(0, (next_due - timezone.now()).total_seconds()), max_wait)
+
+def advance_journey(journey, steps, now):
+    """Akışı sıradaki adıma taşır, adım kalmadıysa tamamlar"""
+    step_ids = [step.id for step in steps]
+    position = step_ids.index(journey.next_step_id) if journey.next_step_id in step_ids else len(steps)
+    following = steps[position + 1] if position + 1 < len(steps) else None
+
+    journey.attempts = 0
+    journey.claimed_by = ''
+    journey.claimed_at = None
+    journey.error = ''
+    journey.updated_at = now
+    if following is None:
+        journey.status = 'completed'
+        journey.next_step = None
+        journey.due_at = None
+        journey.completed_at = now
+    else:
+        journey.status = 'waiting'
+        journey.next_step = following
+        journey.due_at = now + step_delay(journey.automation, following)
+
+def retry_journey(journey, error, now):
+    """Gönderilemeyen adımı üstel beklemeyle tekrar planlar, deneme hakkı bittiyse bırakır"""
+    journey.error = error
+    journey.claimed_by = ''
+    journey.claimed_at = None
+    journey.updated_at = now
+    if journey.attempts >= getattr(settings, 'AUTOMATION_MAX_ATTEMPTS', 3):
+        journey.status = 'failed'
+    else:
+        journey.status = 'waiting'
+        journey.due_at = now + timezone.timedelta(minutes=2 ** journey.attempts)
+
+def _conditions_met(step, previous_step, engagement, subscriber_id):
+    """Adım koşullarını önceki adımın kampanyasındaki etkileşime göre değerlendirir
+
+    Desteklenen koşullar: {"opened_previous": true/false}, {"clicked_previous": true/false}
+    """
+    conditions = step.conditions or {}
+    if previous_step is None or not conditions:
+        return True
+    opened, clicked = engagement.get((previous_step.campaign_id, subscriber_id), (False, False))
+    if 'opened_previous' in conditions and bool(conditions['opened_previous']) != opened:
+        return False
+    if 'clicked_previous' in conditions and bool(conditions['clicked_previous']) != clicked:
+        return False
+    return True
+
+class JourneySendEngine(CampaignSendEngine):
+    """CampaignSendEngine'in akış adımları için sürümü
+
+    Gönderim havuzu ve hız sınırı aynıdır; sonuçlar outbox yerine akış
+    satırlarına yazılır.
+    """
+    def __init__(self, email_sender, steps_by_automation, **kwargs):
+        super().__init__(email_sender, **kwargs)
+        self.steps_by_automation = steps_by_automation
+
+    def _idempotency_key(self, campaign, group):
+        # Aynı kampanya aboneye normal gönderimle de gitmiş olabilir; anahtar akış adımına bağlanır
+        digest = hashlib.sha1(
+            ','.join(sorted(f"{journey.id}:{journey.next_step_id}" for journey in group)).encode()
+        ).hexdigest()
+        return f"journey_{campaign.id}_{digest}"
+
+    def _groups(self, campaign, journeys):
+        # Akış satırları sabit gruplara atanmaz; anahtar akış ve adım kimliklerinden üretilir
+        for start in range(0, len(journeys), self.batch_size):
+            yield journeys[start:start + self.batch_size]
+
+    def _record_result(self, campaign, journey, success, text):
+        now = timezone.now()
+        subscriber = journey.subscriber
+        self.log_buffer.append(EmailLog(
+            campaign=campaign,
+            subscriber=subscriber,
+            status='sent' if success else 'bounced',
+            message_id=f"{campaign.id}_{subscriber.id}"
+        ))
+
+        if success:
+            advance_journey(journey, self.steps_by_automation[journey.automation_id], now)
+            self.sent_buffer.append(journey)
+            self.total_sent += 1
+            print(f"Resend ile otomasyon e-postası gönderildi: {subscriber.email}")
+        else:
+            retry_journey(journey, text, now)
+            self.failed_buffer.append(journey)
+            self.total_failed += 1
+            print(f"Resend otomasyon gönderimi başarısız: {subscriber.email} - {text}")
+
+        if len(self.log_buffer) >= self.log_buffer_size:
+            self._flush_records(campaign)
+
+    def _flush_records(self, campaign):
+        if not self.log_buffer:
+            return
+        sent_by_automation = {}
+        for journey in self.sent_buffer:
+            counts = sent_by_automation.setdefault(journey.automation_id, {'total_sent': 0})
+            counts['total_sent'] += 1
+        try:
+            with transaction.atomic():
+                EmailLog.objects.bulk_create(self.log_buffer, batch_size=self.log_buffer_size)
+                JourneyState.objects.bulk_update(
+                    self.sent_buffer + self.failed_buffer,
+                    JOURNEY_FIELDS,
+                    batch_size=self.log_buffer_size
+                )
+                Campaign.increment_counters(
+                    campaign.pk,
+                    total_sent=len(self.sent_buffer),
+                    bounces=len(self.failed_buffer)
+                )
+                Automation.bulk_increment_counters(sent_by_automation)
+            invalidate_dashboard(campaign.user_id)
+        except Exception as e:
+            # Yazılamayan akışlar 'running' durumunda kalır ve kira süresi dolunca tekrar denenir
+            print(f"Resend otomasyon log yazma hatası: {str(e)}")
+
+        self.log_buffer = []
+        self.sent_buffer = []
+        self.failed_buffer = []
+
+def process_journeys(journeys, email_sender=None):
+    """Sahiplenilmiş akışların sıradaki adımlarını gönderir
+
+    Abonesi pasifleşen akışlar iptal edilir, koşulu tutmayan adımlar atlanır;
+    kalanlar adım (kampanya) bazında gruplanıp gönderim motoruna verilir.
+    """
+    email_sender = email_sender or EmailSender()
+    steps_by_automation = ordered_steps({journey.automation_id for journey in journeys})
+    now = timezone.now()
+
+    # Koşullu adımlar için önceki adımların etkileşimi tek sorguda okunur
+    previous = {}
+    for journey in journeys:
+        steps = steps_by_automation.get(journey.automation_id, [])
+        for index, step in enumerate(steps):
+            if step.id == journey.next_step_id and index > 0 and step.conditions:
+                previous[journey.id] = steps[index - 1]
+    engagement = {}
+    if previous:
+        for campaign_id, subscriber_id, opened_at, clicked_at in EmailLog.objects.filter(
+            campaign_id__in={step.campaign_id for step in previous.values()},
+            subscriber_id__in={journey.subscriber_id for journey in journeys if journey.id in previous}
+        ).values_list('campaign_id', 'subscriber_id', 'opened_at', 'clicked_at'):
+            seen = engagement.get((campaign_id, subscriber_id), (False, False))
+            engagement[(campaign_id, subscriber_id)] = (
+                seen[0] or opened_at is not None,
+                seen[1] or clicked_at is not None
+            )
+
+    settled = []
+    to_send = {}
+    for journey in journeys:
+        steps = steps_by_automation.get(journey.automation_id, [])
+        step = next((step for step in steps if step.id == journey.next_step_id), None)
+        if not journey.subscriber.is_active:
+            journey.status = 'cancelled'
+            journey.claimed_by = ''
+            journey.updated_at = now
+            settled.append(journey)
+        elif step is None or not _conditions_met(step, previous.get(journey.id), engagement, journey.subscriber_id):
+            # Silinmiş veya koşulu tutmayan adım gönderilmeden geçilir
+            advance_journey(journey, steps, now)
+            settled.append(journey)
+        else:
+            to_send.setdefault(step.id, (step, []))[1].append(journey)
+
+    if settled:
+        JourneyState.objects.bulk_update(settled, JOURNEY_FIELDS, batch_size=500)
+
+    for step, group in to_send.values():
+        engine = JourneySendEngine(email_sender, steps_by_automation)
+        print(f"Resend ile {len(group)} otomasyon e-postası gönderilecek: {step.automation_id} / {step.campaign.name}")
+        engine.run(step.campaign, group)
+
+    return len(journeys)
+
+def run_due_journeys(worker_id=None, limit=None, email_sender=None):
+    """Zamanı gelmiş akış kalmayana kadar sahiplen ve işle"""
+    worker_id = worker_id or make_worker_id()
+    email_sender = email_sender or EmailSender()
+    processed = 0
+
+    while True:
+        release_stale_journeys()
+        journeys = claim_due_journeys(worker_id, limit)
+        if not journeys:
+            break
+        try:
+            processed += process_journeys(journeys, email_sender)
+        finally:
+            close_old_connections()
+
+    return processed
@@ -0,0 +1,51 @@
+# otomasyon/dashboard_cache.py
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Campaign, MailList
+
+def dashboard_cache_key(user_id):
+    return f"dashboard:{user_id}"
+
+def get_dashboard_payload(user, days, build):
+    """Kullanıcının dashboard verisini önbellekten döndürür, yoksa build(user, days) ile üretir
+
+    Tüm pencereler (7/30/90/365 gün) tek anahtarda tutulur; böylece sayfa yüklemesi
+    tek önbellek okuması, geçersiz kılma da tek silme işlemidir.
+    """
+    key = dashboard_cache_key(user.pk)
+    timeout = settings.DASHBOARD_CACHE_TIMEOUT
+    payloads = cache.get(key) or {}
+    cached = payloads.get(days)
+    if cached is not None and time.time() - cached[0] < timeout:
+        return cached[1]
+
+    payload = build(user, days)
+    payloads[days] = (time.time(), payload)
+    cache.set(key, payloads, timeout)
+    return payload
+
+def invalidate_dashboard(*user_ids):
+    """Verilen kullanıcıların önbellekteki dashboard verisini siler
+
+    Açık bir işlem varsa silme commit sonrasına ertelenir; aksi halde eşzamanlı bir
+    istek henüz commit edilmemiş eski veriyi tekrar önbelleğe yazabilir.
+    """
+    keys = [dashboard_cache_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+def invalidate_campaign_dashboards(campaign_ids):
+    """Kampanya sahiplerinin dashboard'unu geçersiz kılar (F() ve toplu güncelleme yolları için)"""
+    campaign_ids = set(campaign_ids)
+    if campaign_ids:
+        invalidate_dashboard(*Campaign.objects.filter(pk__in=campaign_ids).values_list('user_id', flat=True))
+
+@lru_cache(maxsize=4096)
+def mail_list_owner(mail_list_id):
+    """Listenin sahibini döndürür; liste sahibi değişmediği için işlem içinde saklanır"""
+    return MailList.objects.filter(pk=mail_list_id).values_list('user_id', flat=True).first()
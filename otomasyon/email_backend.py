@@ -1,11 +1,21 @@
 # dashboard/email_backend.py
 import resend
 from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
 from django.utils import timezone
-from .models import Campaign, EmailLog, Subscriber
+from .dashboard_cache import invalidate_campaign_dashboards, invalidate_dashboard
+from .models import Campaign, EmailLog, OutboxMessage, SendRateLimit, Subscriber
+from .tracking import make_token
+from .webhooks import enqueue_event
+import hashlib
+import os
+import socket
 import threading
+import queue
+import time
+import uuid
 import re
-import urllib.parse
 
 # Resend API key'ini ayarla
 resend.api_key = settings.EMAIL_HOST_PASSWORD
@@ -13,6 +23,8 @@ resend.api_key = settings.EMAIL_HOST_PASSWORD
 class EmailSender:
     def __init__(self):
         self.from_email = settings.DEFAULT_FROM_EMAIL
+        # Kampanya başına derlenmiş tracking şablonları
+        self.tracking_templates = {}
     
     def test_connection(self):
         """Resend bağlantısını test et"""
@@ -43,81 +55,590 @@ class EmailSender:
         except Exception as e:
             return False, f"Resend gönderim hatası: {str(e)}"
     
-    def send_campaign_email(self, campaign, subscriber, email_content):
+    def build_campaign_message(self, campaign, subscriber, email_content):
+        """Aboneye özel Resend mesaj parametrelerini hazırla"""
+        # Tracking link'leri ekle - şablon kampanya başına bir kez derlenir
+        source = campaign.html_content or f"<p>{email_content}</p>"
+        cached = self.tracking_templates.get(campaign.id)
+        if cached is None or cached[0] != source:
+            cached = self.tracking_templates[campaign.id] = (source, TrackingTemplate(source))
+        html_content = cached[1].render(subscriber.id, campaign.id)
+        
+        return {
+            "from": self.from_email,
+            "to": subscriber.email,
+            "subject": campaign.subject,
+            "html": html_content,
+            "text": email_content,
+            "headers": {
+                "X-Entity-Ref-ID": f"{campaign.id}_{subscriber.id}"
+            }
+        }
+    
+    def send_campaign_email(self, campaign, subscriber, email_content, idempotency_key=None):
         """Resend ile tekil e-posta gönderimi"""
         try:
-            # Tracking link'leri ekle
-            html_content = add_tracking_links(
-                campaign.html_content or f"<p>{email_content}</p>", 
-                subscriber.id, 
-                campaign.id
+            # Resend ile gönder - aynı anahtarla tekrar deneme çift gönderim yapmaz
+            options = {"idempotency_key": idempotency_key} if idempotency_key else None
+            r = resend.Emails.send(
+                self.build_campaign_message(campaign, subscriber, email_content),
+                options
             )
             
-            # Resend ile gönder
-            r = resend.Emails.send({
-                "from": self.from_email,
-                "to": subscriber.email,
-                "subject": campaign.subject,
-                "html": html_content,
-                "text": email_content,
-                "headers": {
-                    "X-Entity-Ref-ID": f"{campaign.id}_{subscriber.id}"
-                }
-            })
-            
             return True, "E-posta Resend ile gönderildi"
             
         except Exception as e:
             print(f"Resend gönderim hatası: {str(e)}")
             return False, f"Resend hatası: {str(e)}"
+    
+    def send_campaign_batch(self, campaign, subscribers, email_content, idempotency_key=None):
+        """Resend batch API ile tek istekte çoklu gönderim
+        
+        Her abone için (başarılı, mesaj) çiftini aynı sırayla döndürür.
+        """
+        try:
+            messages = [
+                self.build_campaign_message(campaign, subscriber, email_content)
+                for subscriber in subscribers
+            ]
+            
+            # Permissive modda hatalı mesajlar tüm batch'i düşürmez
+            options = {"batch_validation": "permissive"}
+            if idempotency_key:
+                options["idempotency_key"] = idempotency_key
+            r = resend.Batch.send(messages, options)
+            
+        except Exception as e:
+            print(f"Resend batch gönderim hatası: {str(e)}")
+            return [(False, f"Resend hatası: {str(e)}")] * len(subscribers)
+        
+        errors = {
+            error['index']: error['message']
+            for error in (r.get('errors') or [])
+        }
+        return [
+            (False, f"Resend hatası: {errors[index]}") if index in errors
+            else (True, "E-posta Resend batch ile gönderildi")
+            for index in range(len(subscribers))
+        ]
+
+_CLICK_LINK_RE = re.compile(r'href="(https?://[^"]+)"', re.IGNORECASE)
+_BODY_TAG_RE = re.compile(r'<body[^>]*>', re.IGNORECASE)
+_HTML_MARKERS = ('<html', '<body', '<div')
+
+class TrackingTemplate:
+    """Kampanya içeriğinin tracking slotlarıyla önceden derlenmiş hali
+    
+    HTML bir kez ayrıştırılır; abone başına render sadece slotlara imzalı
+    token'ları yerleştirip parçaları birleştirir.
+    """
+    OPEN_SLOT = 'open'
+    CLICK_SLOT = 'click'
+    
+    def __init__(self, content, base_url=None):
+        self.base_url = (base_url or settings.TRACKING_BASE_URL).rstrip('/')
+        self.parts = []
+        if not content:
+            return
+        
+        # HTML içeriği kontrol et
+        lowered = content.lower()
+        is_html = any(marker in lowered for marker in _HTML_MARKERS)
+        
+        if not is_html:
+            # Plain text için HTML'e çevir
+            self.parts = [f"<p>{content}</p>", (self.OPEN_SLOT,)]
+            return
+        
+        # HTML içerik - linkleri slotlara ayır
+        position = 0
+        for match in _CLICK_LINK_RE.finditer(content):
+            self._add_literal(content[position:match.start()], '<body' in content)
+            self.parts.append((self.CLICK_SLOT, match.group(1)))
+            position = match.end()
+        self._add_literal(content[position:], '<body' in content)
+        
+        # Body etiketi yoksa açılma takip resmi sona eklenir
+        if '<body' not in content:
+            self.parts.append((self.OPEN_SLOT,))
+    
+    def _add_literal(self, text, has_body):
+        if not has_body:
+            self.parts.append(text)
+            return
+        # Açılma takip resmi her body etiketinin hemen arkasına gelir
+        position = 0
+        for match in _BODY_TAG_RE.finditer(text):
+            self.parts.append(text[position:match.end()])
+            self.parts.append((self.OPEN_SLOT,))
+            position = match.end()
+        self.parts.append(text[position:])
+    
+    def render(self, subscriber_id, campaign_id):
+        """Abone için tracking link'li içeriği üret"""
+        track_url = f'{self.base_url}/track'
+        open_token = None
+        rendered = []
+        for part in self.parts:
+            if isinstance(part, str):
+                rendered.append(part)
+            elif part[0] == self.CLICK_SLOT:
+                token = make_token(campaign_id, subscriber_id, part[1])
+                rendered.append(f'href="{track_url}/click/{token}/"')
+            else:
+                open_token = open_token or make_token(campaign_id, subscriber_id)
+                rendered.append(
+                    f'<img src="{track_url}/open/{open_token}/" width="1" height="1" style="display:none;" alt="" />'
+                )
+        return ''.join(rendered)
 
 def add_tracking_links(content, subscriber_id, campaign_id):
     """Tracking link'leri ekle - Resend uyumlu"""
-    if not content:
-        return ""
+    return TrackingTemplate(content).render(subscriber_id, campaign_id)
+
+class TokenBucket:
+    """Patlama kapasitesi ve sürekli hız ile token bucket hız sınırlayıcı
+    
+    Bekleyen çağrılar token'larını önceden ayırır, böylece aynı bucket'ı
+    paylaşan tüm iş parçacıkları toplamda sürekli hızı aşmaz.
+    """
+    def __init__(self, rate, burst=None, clock=None):
+        self.rate = rate
+        self.capacity = max(1.0, burst or rate or 1)
+        self.tokens = self.capacity
+        self.clock = clock or time.monotonic
+        self.updated_at = self.clock()
+        self.lock = threading.Lock()
+    
+    def reserve(self, tokens=1):
+        """Token'ları ayırır ve gönderimden önce beklenecek süreyi (saniye) döndürür"""
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= tokens
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+    
+    def acquire(self, tokens=1):
+        if not self.rate:
+            return
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+class SharedTokenBucket:
+    """Durumu veritabanında tutulan, tüm gönderim süreçlerinin paylaştığı token bucket
+    
+    Satırda tek bir değer saklanır: kotayı aşmadan gönderilebilecek bir sonraki
+    teorik zaman (GCRA). Her istek bu zamanı 1/rate ileri iter; zaman şimdiden
+    capacity/rate kadar öndeyse istek aradaki fark kadar bekler. Güncelleme
+    koşullu UPDATE ile yapılır, kilit tutulmaz; böylece send_outbox süreçleri,
+    web sürecindeki gönderim ve run_scheduler işçileri toplamda hızı aşmaz.
+    """
+    def __init__(self, key, rate, burst=None):
+        self.key = key
+        self.rate = rate
+        self.capacity = max(1.0, burst or rate or 1)
+        # Veritabanına ulaşılamazsa süreç içi sınıra düşülür
+        self.fallback = TokenBucket(rate, burst)
+    
+    def reserve(self, tokens=1, now=None):
+        """Token'ları ayırır ve gönderimden önce beklenecek süreyi (saniye) döndürür"""
+        now_us = int((time.time() if now is None else now) * 1_000_000)
+        interval = tokens * 1_000_000 / self.rate
+        tolerance = self.capacity * 1_000_000 / self.rate
+        while True:
+            current = SendRateLimit.objects.filter(key=self.key).values_list('next_free_us', flat=True).first()
+            if current is None:
+                SendRateLimit.objects.bulk_create([SendRateLimit(key=self.key)], ignore_conflicts=True)
+                continue
+            next_free = int(max(current, now_us) + interval)
+            # Başka bir süreç araya girdiyse satır değişmiştir, yeniden okunur
+            if SendRateLimit.objects.filter(key=self.key, next_free_us=current).update(next_free_us=next_free):
+                return max(0, next_free - tolerance - now_us) / 1_000_000
+    
+    def acquire(self, tokens=1):
+        if not self.rate:
+            return
+        try:
+            wait = self.reserve(tokens)
+        except DatabaseError as e:
+            print(f"Paylaşılan hız sınırı okunamadı, süreç içi sınır kullanılıyor: {str(e)}")
+            self.fallback.acquire(tokens)
+            return
+        if wait > 0:
+            time.sleep(wait)
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(key, rate=None, burst=None):
+    """Gönderici hesabı başına hız sınırlayıcı
+    
+    EMAIL_RATE_LIMIT_SCOPE='shared' (varsayılan) ile kota veritabanı üzerinden
+    tüm süreçlerce paylaşılır; 'process' ile yalnızca bu süreç içinde uygulanır
+    ve N süreç toplamda N x EMAIL_SEND_RATE_LIMIT hızına çıkabilir.
+    """
+    if rate is None:
+        rate = getattr(settings, 'EMAIL_SEND_RATE_LIMIT', 10)
+    if burst is None:
+        burst = getattr(settings, 'EMAIL_SEND_BURST', None)
+    scope = getattr(settings, 'EMAIL_RATE_LIMIT_SCOPE', 'shared')
+    bucket_class = SharedTokenBucket if scope == 'shared' else TokenBucket
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if (limiter is None or not isinstance(limiter, bucket_class) or limiter.rate != rate
+                or limiter.capacity != max(1.0, burst or rate or 1)):
+            if bucket_class is SharedTokenBucket:
+                limiter = SharedTokenBucket(key, rate, burst)
+            else:
+                limiter = TokenBucket(rate, burst)
+            _rate_limiters[key] = limiter
+        return limiter
+
+class CampaignSendEngine:
+    """Alıcı kuyruğundan beslenen sınırlı iş parçacığı havuzu ile gönderim
+    
+    'batch' modunda kuyruğa mesaj grupları girer ve her grup tek bir
+    Resend batch isteği ile gönderilir.
+    """
+    def __init__(self, email_sender, concurrency=None, rate_limit=None, transport=None, batch_size=None):
+        self.email_sender = email_sender
+        self.concurrency = max(1, concurrency or getattr(settings, 'EMAIL_SEND_CONCURRENCY', 4))
+        self.transport = transport or getattr(settings, 'EMAIL_SEND_TRANSPORT', 'single')
+        if self.transport == 'batch':
+            self.batch_size = min(100, max(1, batch_size or getattr(settings, 'EMAIL_BATCH_SIZE', 100)))
+        else:
+            self.batch_size = 1
+        # Aynı gönderici hesabını kullanan tüm kampanyalar aynı kotayı paylaşır
+        self.rate_limiter = get_rate_limiter(email_sender.from_email, rate=rate_limit)
+        self.log_buffer_size = max(1, getattr(settings, 'EMAIL_LOG_BUFFER_SIZE', 500))
+        self.recipients = queue.Queue(maxsize=self.concurrency * 4)
+        self.results = queue.Queue()
+    
+    def _worker(self, campaign):
+        # İş parçacıkları kayıt yazmaz; veritabanını yalnızca paylaşılan hız sınırı için kullanır
+        try:
+            self._send_groups(campaign)
+        finally:
+            connection.close()
+    
+    def _send_groups(self, campaign):
+        while True:
+            group = self.recipients.get()
+            if group is None:
+                break
+            # Hız sınırı istek başına uygulanır
+            self.rate_limiter.acquire()
+            try:
+                if self.transport == 'batch':
+                    outcomes = self.email_sender.send_campaign_batch(
+                        campaign,
+                        [message.subscriber for message in group],
+                        campaign.content,
+                        idempotency_key=self._idempotency_key(campaign, group)
+                    )
+                else:
+                    message = group[0]
+                    outcomes = [self.email_sender.send_campaign_email(
+                        campaign,
+                        message.subscriber,
+                        campaign.content,
+                        idempotency_key=self._idempotency_key(campaign, group)
+                    )]
+            except Exception as e:
+                outcomes = [(False, str(e))] * len(group)
+            for message, (success, text) in zip(group, outcomes):
+                self.results.put((message, success, text))
     
-    # Base URL
-    base_url = 'https://mail-rmi9.onrender.com/'  # Production'da gerçek domain
+    def _idempotency_key(self, campaign, group):
+        """Aynı grubun tekrar denemesi aynı anahtarı üretir, sağlayıcı çift göndermez"""
+        if self.transport == 'batch':
+            return f"batch_{campaign.id}_{group[0].batch_key}"
+        return f"{campaign.id}_{group[0].subscriber_id}"
     
-    # Açılma takip resmi
-    open_tracking_url = f'{base_url}/track/open/{subscriber_id}/{campaign_id}/'
-    open_tracking_img = f'<img src="{open_tracking_url}" width="1" height="1" style="display:none;" alt="" />'
+    def _groups(self, campaign, messages):
+        """Mesajları istek gruplarına böler
+        
+        Batch modunda grup ataması gönderimden önce outbox satırlarına yazılır.
+        Kira süresi dolup tekrar sahiplenilen mesajlar kayıtlı gruplarıyla
+        gönderilir; anahtar aynı kaldığı için sağlayıcı ikinci kez göndermez.
+        """
+        if self.batch_size == 1:
+            for message in messages:
+                yield [message]
+            return
+        
+        assigned = {}
+        fresh = []
+        for message in messages:
+            if message.batch_key:
+                assigned.setdefault(message.batch_key, []).append(message)
+            else:
+                fresh.append(message)
+        yield from assigned.values()
+        
+        for start in range(0, len(fresh), self.batch_size):
+            group = fresh[start:start + self.batch_size]
+            batch_key = hashlib.sha1(
+                ','.join(sorted(str(message.id) for message in group)).encode()
+            ).hexdigest()
+            OutboxMessage.objects.filter(pk__in=[message.pk for message in group]).update(batch_key=batch_key)
+            for message in group:
+                message.batch_key = batch_key
+            yield group
     
-    # Link takip fonksiyonu
-    def add_click_tracking(match):
-        original_url = match.group(1)
-        encoded_url = urllib.parse.quote(original_url, safe='')
-        tracking_url = f'{base_url}/track/click/{subscriber_id}/{campaign_id}/?url={encoded_url}'
-        return f'href="{tracking_url}"'
+    def run(self, campaign, messages):
+        """Outbox mesajlarını havuza dağıtır, sonuçları bu iş parçacığında kaydeder"""
+        self.total_sent = 0
+        self.total_failed = 0
+        self.log_buffer = []
+        self.sent_buffer = []
+        self.failed_buffer = []
+        
+        workers = [
+            threading.Thread(target=self._worker, args=(campaign,), daemon=True)
+            for _ in range(self.concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        for group in self._groups(campaign, messages):
+            self._enqueue(campaign, group)
+        
+        for _ in workers:
+            self.recipients.put(None)
+        while any(worker.is_alive() for worker in workers):
+            self._drain_results(campaign, timeout=0.1)
+        self._drain_results(campaign)
+        self._flush_records(campaign)
+        
+        return self.total_sent, self.total_failed
+    
+    def _enqueue(self, campaign, group):
+        while True:
+            try:
+                self.recipients.put(group, timeout=0.1)
+                break
+            except queue.Full:
+                self._drain_results(campaign)
+        self._drain_results(campaign)
     
-    # HTML içeriği kontrol et
-    is_html = '<html' in content.lower() or '<body' in content.lower() or '<div' in content.lower()
+    def _drain_results(self, campaign, timeout=None):
+        while True:
+            try:
+                if timeout:
+                    result = self.results.get(timeout=timeout)
+                    timeout = None
+                else:
+                    result = self.results.get_nowait()
+            except queue.Empty:
+                return
+            self._record_result(campaign, *result)
     
-    if is_html:
-        # HTML içerik - linkleri değiştir
-        content = re.sub(r'href="(https?://[^"]+)"', add_click_tracking, content, flags=re.IGNORECASE)
+    def _record_result(self, campaign, message, success, text):
+        subscriber = message.subscriber
+        # Log satırları ve outbox durumları tamponlanıp toplu yazılır
+        self.log_buffer.append(EmailLog(
+            campaign=campaign,
+            subscriber=subscriber,
+            status='sent' if success else 'bounced',
+            message_id=f"{campaign.id}_{subscriber.id}"
+        ))
         
-        # Açılma takip resmini ekle
-        if '<body' in content:
-            content = re.sub(r'<body[^>]*>', lambda m: m.group(0) + open_tracking_img, content, flags=re.IGNORECASE)
+        if success:
+            self.sent_buffer.append(message.pk)
+            self.total_sent += 1
+            print(f"Resend ile gönderildi: {subscriber.email}")
         else:
-            content += open_tracking_img
-    else:
-        # Plain text için HTML'e çevir
-        content = f"<p>{content}</p>"
-        content += open_tracking_img
+            message.status = 'failed'
+            message.error = text
+            self.failed_buffer.append(message)
+            self.total_failed += 1
+            print(f"Resend başarısız: {subscriber.email} - {text}")
+        
+        if len(self.log_buffer) >= self.log_buffer_size:
+            self._flush_records(campaign)
+    
+    def _flush_records(self, campaign):
+        if not self.log_buffer:
+            return
+        try:
+            with transaction.atomic():
+                EmailLog.objects.bulk_create(self.log_buffer, batch_size=self.log_buffer_size)
+                if self.sent_buffer:
+                    OutboxMessage.objects.filter(pk__in=self.sent_buffer).update(
+                        status='sent',
+                        sent_at=timezone.now(),
+                        error=''
+                    )
+                if self.failed_buffer:
+                    OutboxMessage.objects.bulk_update(
+                        self.failed_buffer,
+                        ['status', 'error'],
+                        batch_size=self.log_buffer_size
+                    )
+                # Birden fazla işçi aynı kampanyayı gönderebilir, sayaçlar artımlı güncellenir
+                Campaign.increment_counters(
+                    campaign.pk,
+                    total_sent=len(self.sent_buffer),
+                    bounces=len(self.failed_buffer)
+                )
+            # F() güncellemeleri sinyal üretmez, dashboard önbelleği burada temizlenir
+            invalidate_dashboard(campaign.user_id)
+        except Exception as e:
+            # Yazılamayan mesajlar 'sending' durumunda kalır ve kira süresi dolunca tekrar denenir
+            print(f"Resend log yazma hatası: {str(e)}")
+        
+        self.log_buffer = []
+        self.sent_buffer = []
+        self.failed_buffer = []
+
+def make_worker_id():
+    """Outbox sahiplenmeleri için benzersiz işçi kimliği"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+def enqueue_campaign(campaign, chunk_size=1000):
+    """Kampanyanın aktif abonelerini outbox'a ekle
+    
+    Tekrar çağrılması güvenlidir; zaten kuyrukta olan aboneler atlanır.
+    """
+    subscriber_ids = Subscriber.objects.filter(
+        mail_list__in=campaign.mail_lists.all(),
+        is_active=True
+    ).values_list('id', flat=True)
+    
+    chunk = []
+    for subscriber_id in subscriber_ids.iterator(chunk_size=chunk_size):
+        chunk.append(OutboxMessage(campaign=campaign, subscriber_id=subscriber_id))
+        if len(chunk) >= chunk_size:
+            OutboxMessage.objects.bulk_create(chunk, ignore_conflicts=True)
+            chunk = []
+    if chunk:
+        OutboxMessage.objects.bulk_create(chunk, ignore_conflicts=True)
+    
+    return campaign.outbox.filter(status='pending').count()
+
+def release_stale_claims(lease_seconds=None):
+    """Çöken işçilerin üzerinde kalan mesajları tekrar kuyruğa al"""
+    if lease_seconds is None:
+        lease_seconds = getattr(settings, 'EMAIL_OUTBOX_LEASE_SECONDS', 600)
+    expired = timezone.now() - timezone.timedelta(seconds=lease_seconds)
+    return OutboxMessage.objects.filter(
+        status='sending',
+        claimed_at__lt=expired
+    ).update(status='pending', claimed_by='')
+
+def claim_outbox_batch(worker_id, limit=None, campaign_id=None):
+    """Bekleyen mesajlardan bir grubu bu işçi adına sahiplen
+    
+    PostgreSQL'de SELECT ... FOR UPDATE SKIP LOCKED kullanılır; diğer
+    veritabanlarında koşullu UPDATE aynı mesajın iki işçiye verilmesini önler.
+    """
+    limit = limit or getattr(settings, 'EMAIL_OUTBOX_CLAIM_SIZE', 500)
+    pending = OutboxMessage.objects.filter(
+        status='pending',
+        campaign__status='sending'
+    )
+    if campaign_id:
+        pending = pending.filter(campaign_id=campaign_id)
+    
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True, of=('self',))
+        ids = list(pending.order_by('created_at').values_list('id', flat=True)[:limit])
+        if not ids:
+            return []
+        # Daha önce bir batch grubuna atanmış mesajlar grubun geri kalanıyla birlikte alınır
+        batch_keys = set(
+            OutboxMessage.objects.filter(id__in=ids).exclude(batch_key='').values_list('batch_key', flat=True)
+        )
+        if batch_keys:
+            ids += list(
+                pending.filter(batch_key__in=batch_keys).exclude(id__in=ids).values_list('id', flat=True)
+            )
+        OutboxMessage.objects.filter(id__in=ids, status='pending').update(
+            status='sending',
+            claimed_by=worker_id,
+            claimed_at=timezone.now(),
+            attempts=F('attempts') + 1
+        )
+    
+    return list(
+        OutboxMessage.objects.filter(
+            id__in=ids,
+            status='sending',
+            claimed_by=worker_id
+        ).select_related('subscriber', 'campaign').order_by('created_at')
+    )
+
+def finish_campaign(campaign_id):
+    """Kuyrukta mesajı kalmayan kampanyayı 'sent' durumuna geçir"""
+    if OutboxMessage.objects.filter(
+        campaign_id=campaign_id,
+        status__in=['pending', 'sending']
+    ).exists():
+        return False
+    finished = bool(Campaign.objects.filter(id=campaign_id, status='sending').update(status='sent'))
+    if finished:
+        invalidate_campaign_dashboards([campaign_id])
+        campaign = Campaign.objects.only('user_id', 'name', 'subject', 'total_sent', 'sent_at').get(id=campaign_id)
+        enqueue_event(campaign.user_id, 'campaign_sent', {
+            'campaign_id': campaign.id,
+            'name': campaign.name,
+            'subject': campaign.subject,
+            'total_sent': campaign.total_sent,
+            'sent_at': campaign.sent_at,
+        }, coalesce_key=f"campaign_sent:{campaign.id}")
+    return finished
+
+def drain_outbox(worker_id=None, campaign_id=None, claim_size=None, email_sender=None):
+    """Outbox boşalana kadar mesaj sahiplen ve gönder
+    
+    İstenildiği kadar süreç aynı anda çalıştırılabilir.
+    """
+    worker_id = worker_id or make_worker_id()
+    email_sender = email_sender or EmailSender()
+    processed = 0
+    
+    while True:
+        release_stale_claims()
+        messages = claim_outbox_batch(worker_id, claim_size, campaign_id)
+        if not messages:
+            break
+        
+        by_campaign = {}
+        for message in messages:
+            by_campaign.setdefault(message.campaign_id, []).append(message)
+        
+        for group_campaign_id, group in by_campaign.items():
+            campaign = group[0].campaign
+            engine = CampaignSendEngine(email_sender)
+            print(f"Resend ile {len(group)} mesaj {engine.concurrency} iş parçacığı ile gönderilecek: {campaign.name}")
+            engine.run(campaign, group)
+            finish_campaign(group_campaign_id)
+        
+        processed += len(messages)
     
-    return content
+    return processed
 
 def send_campaign_emails(campaign_id):
-    """Kampanya e-postalarını Resend ile gönder"""
+    """Kampanya e-postalarını Resend ile gönder
+    
+    Aboneler önce outbox'a yazılır; yarıda kalan gönderim tekrar çağrıldığında
+    veya send_outbox komutu ile kaldığı yerden devam eder.
+    """
     try:
         campaign = Campaign.objects.get(id=campaign_id)
         print(f"Resend ile kampanya başlatılıyor: {campaign.name}")
         
+        # Sadece durum alanları güncellenir, diğer işçilerin sayaçları ezilmez
         campaign.status = 'sending'
-        campaign.sent_at = timezone.now()
-        campaign.save()
+        campaign.sent_at = campaign.sent_at or timezone.now()
+        Campaign.objects.filter(pk=campaign.pk).update(
+            status=campaign.status, sent_at=campaign.sent_at, updated_at=timezone.now()
+        )
+        invalidate_dashboard(campaign.user_id)
         
         email_sender = EmailSender()
         
@@ -125,78 +646,26 @@ def send_campaign_emails(campaign_id):
         connection_ok, connection_msg = email_sender.test_connection()
         if not connection_ok:
             print(f"Resend bağlantı hatası: {connection_msg}")
-            campaign.status = 'failed'
-            campaign.save()
+            Campaign.objects.filter(pk=campaign.pk).update(status='failed')
+            invalidate_dashboard(campaign.user_id)
             return
         
-        # Tüm aktif aboneleri al
-        subscribers = Subscriber.objects.filter(
-            mail_list__in=campaign.mail_lists.all(),
-            is_active=True
-        )
-        
-        total_subscribers = subscribers.count()
-        total_sent = 0
-        total_failed = 0
-        
-        print(f"Resend ile {total_subscribers} aboneye gönderilecek")
-        
-        for subscriber in subscribers:
-            try:
-                # E-posta logu oluştur
-                email_log = EmailLog.objects.create(
-                    campaign=campaign,
-                    subscriber=subscriber,
-                    status='sent',
-                    message_id=f"{campaign.id}_{subscriber.id}"
-                )
-                
-                # Resend ile gönder
-                success, message = email_sender.send_campaign_email(
-                    campaign, 
-                    subscriber, 
-                    campaign.content
-                )
-                
-                if success:
-                    total_sent += 1
-                    print(f"Resend ile gönderildi: {subscriber.email} ({total_sent}/{total_subscribers})")
-                else:
-                    total_failed += 1
-                    email_log.status = 'bounced'
-                    email_log.save()
-                    print(f"Resend başarısız: {subscriber.email} - {message}")
-                
-                # Her 10 e-postada bir güncelle
-                if total_sent % 10 == 0:
-                    campaign.total_sent = total_sent
-                    campaign.bounces = total_failed
-                    campaign.save()
-                
-                # Küçük bekleme (rate limit için)
-                import time
-                time.sleep(0.1)
-                
-            except Exception as e:
-                total_failed += 1
-                print(f"Resend abone işleme hatası ({subscriber.email}): {str(e)}")
-                continue
+        total_pending = enqueue_campaign(campaign)
+        print(f"Resend ile {total_pending} aboneye gönderilecek")
         
-        # Kampanya durumunu güncelle
-        campaign.status = 'sent'
-        campaign.total_sent = total_sent
-        campaign.bounces = total_failed
-        campaign.save()
+        drain_outbox(campaign_id=campaign.id, email_sender=email_sender)
+        finish_campaign(campaign.id)
         
-        print(f"Resend kampanya tamamlandı: {total_sent} başarılı, {total_failed} başarısız")
+        campaign.refresh_from_db()
+        print(f"Resend kampanya tamamlandı: {campaign.total_sent} başarılı, {campaign.bounces} başarısız")
         
     except Campaign.DoesNotExist:
         print(f"Kampanya bulunamadı: {campaign_id}")
     except Exception as e:
         print(f"Resend kampanya gönderim hatası: {str(e)}")
         try:
-            campaign.status = 'failed'
-            campaign.save()
+            Campaign.objects.filter(pk=campaign.pk).update(status='failed')
+            invalidate_dashboard(campaign.user_id)
         except:
             pass
 
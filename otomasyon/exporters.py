@@ -0,0 +1,130 @@
+# otomasyon/exporters.py
+import csv
+import datetime
+import json
+import uuid
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import ClickTrack, EmailLog
+
+class Echo:
+    """csv.writer için yazılan satırı olduğu gibi döndüren sahte tampon"""
+    def write(self, value):
+        return value
+
+def iter_csv(header, rows):
+    """Başlık ve satırları CSV metin parçaları olarak üret"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+def iter_gzip(chunks, level=6, flush_size=64 * 1024):
+    """Metin parçalarını anında gzip ile sıkıştırarak üret"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= flush_size:
+            compressed = compressor.compress(b''.join(pending))
+            pending, pending_size = [], 0
+            if compressed:
+                yield compressed
+    compressed = compressor.compress(b''.join(pending)) + compressor.flush()
+    if compressed:
+        yield compressed
+
+# Dışa aktarılabilen etkileşim verileri: (model, kapsam alanı önekleri, sütunlar)
+ENGAGEMENT_EXPORTS = {
+    'logs': (EmailLog, 'campaign', [
+        'id', 'campaign_id', 'subscriber_id', 'subscriber__email', 'status', 'message_id',
+        'opened_at', 'clicked_at', 'bounce_type', 'user_agent', 'ip_address', 'created_at',
+    ]),
+    'clicks': (ClickTrack, 'email_log__campaign', [
+        'id', 'email_log_id', 'email_log__campaign_id', 'email_log__subscriber_id',
+        'url', 'click_count', 'created_at', 'updated_at',
+    ]),
+}
+
+def parse_bound(value, end=False):
+    """'YYYY-MM-DD' veya ISO zaman damgasını zaman dilimli datetime'a çevir"""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Geçersiz tarih: {value}")
+        moment = datetime.datetime.combine(day + datetime.timedelta(days=1) if end else day, datetime.time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+def engagement_queryset(kind, user=None, campaign_id=None, since=None, until=None):
+    """Dışa aktarılacak satırları filtrele (henüz çalıştırılmaz)"""
+    if kind not in ENGAGEMENT_EXPORTS:
+        raise ValueError(f"Bilinmeyen dışa aktarma türü: {kind}")
+    model, campaign_path, fields = ENGAGEMENT_EXPORTS[kind]
+    
+    queryset = model.objects.all()
+    if user is not None:
+        queryset = queryset.filter(**{f'{campaign_path}__user': user})
+    if campaign_id:
+        queryset = queryset.filter(**{f'{campaign_path}_id': uuid.UUID(str(campaign_id))})
+    if since:
+        queryset = queryset.filter(created_at__gte=since)
+    if until:
+        queryset = queryset.filter(created_at__lt=until)
+    return queryset, fields
+
+def iter_keyset(queryset, fields, batch_size=None):
+    """(created_at, id) üzerinden keyset sayfalama ile sözlük satırları üret
+    
+    OFFSET kullanılmaz; her sayfa bir önceki sayfanın son anahtarından
+    devam eder, bellekte en fazla bir sayfa tutulur.
+    """
+    batch_size = batch_size or getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+    ordered = queryset.order_by('created_at', 'id')
+    last = None
+    while True:
+        page = ordered
+        if last:
+            page = page.filter(Q(created_at__gt=last[0]) | Q(created_at=last[0], id__gt=last[1]))
+        rows = list(page.values(*fields)[:batch_size])
+        if not rows:
+            return
+        yield from rows
+        last = (rows[-1]['created_at'], rows[-1]['id'])
+        if len(rows) < batch_size:
+            return
+
+def iter_ndjson(rows):
+    """Her satır için bir JSON nesnesi"""
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+def iter_engagement_export(kind, export_format='ndjson', **filters):
+    """Etkileşim verisini NDJSON veya CSV metin parçaları olarak üret"""
+    queryset, fields = engagement_queryset(kind, **filters)
+    rows = iter_keyset(queryset, fields)
+    if export_format == 'csv':
+        return iter_csv(fields, (
+            [_csv_value(row[field]) for field in fields] for row in rows
+        ))
+    if export_format == 'ndjson':
+        return iter_ndjson(rows)
+    raise ValueError(f"Bilinmeyen format: {export_format}")
+
+def _csv_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return '' if value is None else value
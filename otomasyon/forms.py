@@ -1,4 +1,5 @@
 from django import forms
+from django.conf import settings
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
@@ -446,7 +447,7 @@ class WebhookForm(forms.ModelForm):
     """Webhook formu"""
     class Meta:
         model = Webhook
-        fields = ['name', 'url', 'event_type', 'secret_key']
+        fields = ['name', 'url', 'event_type', 'secret_key', 'batch_size', 'batch_interval_ms']
         widgets = {
             'name': forms.TextInput(attrs={
                 'class': 'form-control',
@@ -461,6 +462,16 @@ class WebhookForm(forms.ModelForm):
                 'class': 'form-control',
                 'placeholder': 'Gizli anahtar (isteğe bağlı)'
             }),
+            'batch_size': forms.NumberInput(attrs={
+                'class': 'form-control',
+                'min': 1,
+                'max': 1000
+            }),
+            'batch_interval_ms': forms.NumberInput(attrs={
+                'class': 'form-control',
+                'min': 0,
+                'step': 100
+            }),
         }
 
     def __init__(self, *args, **kwargs):
@@ -474,12 +485,12 @@ class WebhookForm(forms.ModelForm):
         return url
 
 class CSVImportForm(forms.Form):
-    """CSV içe aktarma formu"""
+    """CSV/XLSX içe aktarma formu"""
     csv_file = forms.FileField(
-        label='CSV Dosyası',
+        label='CSV veya Excel Dosyası',
         widget=forms.FileInput(attrs={
             'class': 'form-control',
-            'accept': '.csv,.txt'
+            'accept': '.csv,.txt,.xlsx'
         })
     )
     has_headers = forms.BooleanField(
@@ -499,6 +510,7 @@ class CSVImportForm(forms.Form):
     )
     
     name_column = forms.CharField(
+        initial='name',
         required=False,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
@@ -511,12 +523,13 @@ class CSVImportForm(forms.Form):
         csv_file = self.cleaned_data.get('csv_file')
         if csv_file:
             # Dosya uzantısı kontrolü
-            if not csv_file.name.endswith('.csv'):
-                raise ValidationError('Lütfen geçerli bir CSV dosyası yükleyin.')
+            if not csv_file.name.lower().endswith(('.csv', '.xlsx')):
+                raise ValidationError('Lütfen geçerli bir CSV veya XLSX dosyası yükleyin.')
             
-            # Dosya boyutu kontrolü (max 5MB)
-            if csv_file.size > 5 * 1024 * 1024:
-                raise ValidationError('Dosya boyutu 5MB\'dan küçük olmalıdır.')
+            # Dosya boyutu kontrolü - içe aktarma arka planda akış halinde yapılır
+            max_size = getattr(settings, 'SUBSCRIBER_IMPORT_MAX_UPLOAD_SIZE', None)
+            if max_size and csv_file.size > max_size:
+                raise ValidationError(f'Dosya boyutu {max_size // (1024 * 1024)}MB\'dan küçük olmalıdır.')
         
         return csv_file
 
@@ -0,0 +1,259 @@
+# otomasyon/importers.py
+import csv
+import io
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .automations import start_subscription_journeys, subscription_triggers
+from .dashboard_cache import invalidate_dashboard
+from .email_backend import make_worker_id
+from .models import ImportJob, Subscriber
+from .webhooks import enqueue_user_events, subscriber_data, webhook_events
+
+class ImportStats:
+    """İçe aktarma sayaçları"""
+    def __init__(self):
+        self.processed = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.invalid = 0
+    
+    def as_dict(self):
+        return {
+            'processed': self.processed,
+            'inserted': self.inserted,
+            'skipped': self.skipped,
+            'invalid': self.invalid,
+        }
+
+def _column_index(header, column, default=None):
+    """Başlık satırında sütunu büyük/küçük harf duyarsız bul"""
+    if not column:
+        return default
+    wanted = column.strip().lower()
+    for index, name in enumerate(header):
+        if (name or '').strip().lower() == wanted:
+            return index
+    return default
+
+def iter_table_rows(rows, email_column='email', name_column='name', has_headers=True):
+    """Satır dizisinden (email, ad) çiftleri üret
+    
+    Başlık yoksa ilk sütun e-posta, ikinci sütun ad kabul edilir.
+    """
+    rows = iter(rows)
+    email_index, name_index = 0, 1
+    if has_headers:
+        header = [str(value) if value is not None else '' for value in next(rows, [])]
+        email_index = _column_index(header, email_column)
+        name_index = _column_index(header, name_column)
+        if email_index is None:
+            raise ValueError(f"'{email_column}' sütunu bulunamadı")
+    
+    for row in rows:
+        # openpyxl boş/biçimli satırlar için (None, None, ...) döndürür; bunlar geçersiz sayılmaz
+        if not row or all(value is None or not str(value).strip() for value in row):
+            continue
+        email = row[email_index] if email_index < len(row) else None
+        name = row[name_index] if name_index is not None and name_index < len(row) else None
+        yield (str(email or '').strip(), str(name or '').strip())
+
+def iter_csv_rows(fileobj, email_column='email', name_column='name', has_headers=True):
+    """Yüklenen CSV dosyasını belleğe almadan satır satır oku"""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', errors='replace', newline='')
+    try:
+        yield from iter_table_rows(csv.reader(text), email_column, name_column, has_headers)
+    finally:
+        # Alttaki dosya nesnesini kapatmadan ayır
+        text.detach()
+
+def iter_xlsx_rows(fileobj, email_column='email', name_column='name', has_headers=True):
+    """XLSX dosyasını openpyxl read-only modunda satır satır oku
+    
+    Çalışma kitabı belleğe yüklenmez; sadece ilk sayfa okunur.
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        yield from iter_table_rows(rows, email_column, name_column, has_headers)
+    finally:
+        workbook.close()
+
+def iter_upload_rows(fileobj, filename, email_column='email', name_column='name', has_headers=True):
+    """Dosya uzantısına göre CSV veya XLSX okuyucusunu seç"""
+    if filename.lower().endswith('.xlsx'):
+        reader = iter_xlsx_rows
+    else:
+        reader = iter_csv_rows
+    return reader(fileobj, email_column, name_column, has_headers)
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def import_rows(mail_list, rows, chunk_size=None, stats=None, on_chunk=None):
+    """(email, ad) satırlarını parça parça toplu olarak içe aktar
+    
+    Her parça için mevcut e-postalar tek sorguyla bulunur, yeniler
+    bulk_create ile eklenir. Sayaçlar sonda bir kez hesaplanır.
+    """
+    chunk_size = chunk_size or getattr(settings, 'SUBSCRIBER_IMPORT_CHUNK_SIZE', 1000)
+    stats = stats or ImportStats()
+    
+    for chunk in _chunks(rows, chunk_size):
+        candidates = {}
+        for email, name in chunk:
+            stats.processed += 1
+            try:
+                validate_email(email)
+            except ValidationError:
+                stats.invalid += 1
+                continue
+            if email in candidates:
+                stats.skipped += 1
+                continue
+            candidates[email] = name
+        
+        existing = set(
+            Subscriber.objects.filter(
+                mail_list=mail_list,
+                email__in=list(candidates)
+            ).values_list('email', flat=True)
+        )
+        new_subscribers = [
+            Subscriber(mail_list=mail_list, email=email, name=name[:100], source='import')
+            for email, name in candidates.items() if email not in existing
+        ]
+        Subscriber.objects.bulk_create(new_subscribers, ignore_conflicts=True)
+        # ignore_conflicts, eşzamanlı eklenen e-postaları sessizce atlar; sadece yazılan satırlar sayılır
+        inserted = Subscriber.objects.filter(id__in=[subscriber.id for subscriber in new_subscribers])
+        # bulk_create sinyal üretmez; akışlar ve 'subscription' webhook'ları parça başına toplu açılır
+        triggers = new_subscribers and subscription_triggers.get(mail_list.id)
+        notify = new_subscribers and webhook_events.has(mail_list.user_id, 'subscription')
+        if triggers or notify:
+            inserted = list(inserted)
+            inserted_count = len(inserted)
+            if triggers:
+                start_subscription_journeys([(subscriber.id, mail_list.id) for subscriber in inserted])
+            if notify:
+                enqueue_user_events(mail_list.user_id, 'subscription', [
+                    (f"subscription:{subscriber.id}", subscriber_data(subscriber))
+                    for subscriber in inserted
+                ])
+        else:
+            inserted_count = inserted.count() if new_subscribers else 0
+        
+        stats.inserted += inserted_count
+        stats.skipped += len(candidates) - inserted_count
+        if on_chunk:
+            on_chunk(stats)
+    
+    # Abone sayısını güncelle; bulk_create sinyal üretmediği için dashboard elle temizlenir
+    mail_list.update_counts()
+    invalidate_dashboard(mail_list.user_id)
+    return stats
+
+def release_stale_jobs(lease_seconds=None):
+    """İlerleme bildirmeyi bırakan (çöken) işleri tekrar kuyruğa al
+    
+    İçe aktarma tekrar çalıştırılabilir; daha önce eklenen aboneler atlanır.
+    """
+    if lease_seconds is None:
+        lease_seconds = getattr(settings, 'IMPORT_JOB_LEASE_SECONDS', 600)
+    expired = timezone.now() - timezone.timedelta(seconds=lease_seconds)
+    return ImportJob.objects.filter(status='running', updated_at__lt=expired).update(
+        status='pending',
+        claimed_by=''
+    )
+
+def claim_import_job(worker_id, job_id=None):
+    """Bekleyen bir işi koşullu UPDATE ile sahiplen"""
+    pending = ImportJob.objects.filter(status='pending')
+    if job_id:
+        pending = pending.filter(id=job_id)
+    
+    for candidate_id in pending.order_by('created_at').values_list('id', flat=True)[:10]:
+        claimed = ImportJob.objects.filter(id=candidate_id, status='pending').update(
+            status='running',
+            claimed_by=worker_id,
+            started_at=timezone.now(),
+            updated_at=timezone.now()
+        )
+        if claimed:
+            return ImportJob.objects.select_related('mail_list').get(id=candidate_id)
+    return None
+
+def run_import_job(job):
+    """Sahiplenilmiş işi çalıştır ve ilerlemeyi parça başına kaydet"""
+    def save_progress(stats):
+        ImportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now(), **stats.as_dict())
+    
+    try:
+        with job.file.open('rb') as fileobj:
+            rows = iter_upload_rows(
+                fileobj,
+                job.file.name,
+                email_column=job.email_column,
+                name_column=job.name_column,
+                has_headers=job.has_headers
+            )
+            stats = import_rows(job.mail_list, rows, on_chunk=save_progress)
+    except Exception as e:
+        print(f"İçe aktarma hatası ({job.id}): {str(e)}")
+        ImportJob.objects.filter(pk=job.pk).update(
+            status='failed',
+            error=str(e),
+            finished_at=timezone.now(),
+            updated_at=timezone.now()
+        )
+        return False
+    
+    ImportJob.objects.filter(pk=job.pk).update(
+        status='completed',
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+        **stats.as_dict()
+    )
+    # Yüklenen dosyaya artık gerek yok
+    job.file.delete(save=False)
+    return True
+
+def process_import_jobs(worker_id=None, job_id=None):
+    """Bekleyen işleri sırayla çalıştır; çalıştırılan iş sayısını döndür"""
+    worker_id = worker_id or make_worker_id()
+    processed = 0
+    release_stale_jobs()
+    while True:
+        job = claim_import_job(worker_id, job_id)
+        if job is None:
+            return processed
+        run_import_job(job)
+        processed += 1
+        if job_id:
+            return processed
+
+def start_import_job_async(job_id):
+    """İşi hemen arka planda başlat; işçi komutu da aynı işi sahiplenebilir"""
+    def target():
+        try:
+            process_import_jobs(job_id=job_id)
+        finally:
+            close_old_connections()
+    
+    thread = threading.Thread(target=target)
+    thread.daemon = True
+    thread.start()
+    return thread
@@ -0,0 +1,84 @@
+import contextlib
+import io
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from otomasyon.email_backend import CampaignSendEngine
+from otomasyon.models import Campaign, EmailLog, MailList, OutboxMessage, Subscriber
+
+
+class BenchmarkRollback(Exception):
+    pass
+
+
+class NullSender:
+    """Sağlayıcıyı çağırmadan her mesajı başarılı sayan gönderici"""
+    from_email = 'benchmark@example.com'
+
+    def send_campaign_email(self, campaign, subscriber, email_content, idempotency_key=None):
+        return True, 'ok'
+
+
+class Command(BaseCommand):
+    help = ("Gönderim döngüsündeki EmailLog yazımını ölçer: satır başına INSERT "
+            "ile toplu yazımı yapılandırılmış veritabanında karşılaştırır")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=1000, help='Ölçülecek mesaj sayısı')
+
+    def handle(self, *args, **options):
+        count = options['messages']
+        self.stdout.write(f"Veritabanı: {connection.vendor}, mesaj: {count}")
+
+        # Tüm veriler tek transaction içinde oluşturulur ve sonunda geri alınır
+        try:
+            with transaction.atomic():
+                campaign, messages = self._fixture(count)
+                self._measure('Satır başına INSERT', lambda: self._per_row(campaign, messages))
+                EmailLog.objects.filter(campaign=campaign).delete()
+                self._measure('Toplu yazım (bulk_create)', lambda: self._bulk(campaign, messages))
+                raise BenchmarkRollback
+        except BenchmarkRollback:
+            pass
+
+    def _fixture(self, count):
+        user = User.objects.create(username=f'benchmark-{time.time_ns()}')
+        mail_list = MailList.objects.create(user=user, name='Benchmark')
+        Subscriber.objects.bulk_create(
+            Subscriber(mail_list=mail_list, email=f'bench{i}@example.com') for i in range(count)
+        )
+        campaign = Campaign.objects.create(user=user, name='Benchmark', subject='Benchmark', content='Benchmark')
+        OutboxMessage.objects.bulk_create(
+            OutboxMessage(campaign=campaign, subscriber=subscriber)
+            for subscriber in mail_list.subscribers.all()
+        )
+        messages = list(campaign.outbox.select_related('subscriber'))
+        return campaign, messages
+
+    def _per_row(self, campaign, messages):
+        # Eski gönderim döngüsünün davranışı: mesaj başına ayrı yazımlar
+        for message in messages:
+            EmailLog.objects.create(
+                campaign=campaign,
+                subscriber=message.subscriber,
+                status='sent',
+                message_id=f"{campaign.id}_{message.subscriber_id}"
+            )
+            OutboxMessage.objects.filter(pk=message.pk).update(status='sent')
+
+    def _bulk(self, campaign, messages):
+        # Gönderim motorunun gerçek yolu; mesaj başına çıktılar bastırılır
+        engine = CampaignSendEngine(NullSender(), concurrency=1, rate_limit=0, transport='single')
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine.run(campaign, messages)
+
+    def _measure(self, label, func):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+        self.stdout.write(f"{label}: {len(queries)} sorgu, {elapsed:.3f} sn")
@@ -0,0 +1,55 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from otomasyon.exporters import iter_engagement_export, iter_gzip, parse_bound
+
+
+class Command(BaseCommand):
+    help = "EmailLog veya ClickTrack verisini NDJSON/CSV olarak keyset sayfalama ile dışa aktarır"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', dest='kind', choices=['logs', 'clicks'], default='logs')
+        parser.add_argument('--format', dest='export_format', choices=['ndjson', 'csv'], default='ndjson')
+        parser.add_argument('--campaign', help='Sadece bu kampanya')
+        parser.add_argument('--user', help='Sadece bu kullanıcının kampanyaları (kullanıcı adı)')
+        parser.add_argument('--since', help='Başlangıç (YYYY-MM-DD veya ISO zaman damgası, dahil)')
+        parser.add_argument('--until', help='Bitiş (YYYY-MM-DD dahil veya ISO zaman damgası, hariç)')
+        parser.add_argument('--gzip', action='store_true', help='Çıktıyı gzip ile sıkıştır')
+        parser.add_argument('--output', '-o', help='Çıktı dosyası (varsayılan: standart çıktı)')
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"Kullanıcı bulunamadı: {options['user']}")
+
+        try:
+            content = iter_engagement_export(
+                options['kind'],
+                options['export_format'],
+                user=user,
+                campaign_id=options['campaign'],
+                since=parse_bound(options['since']),
+                until=parse_bound(options['until'], end=True),
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['gzip']:
+            chunks = iter_gzip(content)
+        else:
+            chunks = (chunk.encode('utf-8') for chunk in content)
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from otomasyon.email_backend import make_worker_id
+from otomasyon.importers import process_import_jobs
+
+
+class Command(BaseCommand):
+    help = "Bekleyen abone içe aktarma işlerini çalıştırır"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Kuyruk boşaldığında beklemeye devam et')
+        parser.add_argument('--interval', type=float, default=5, help='Boş kuyrukta bekleme süresi (saniye)')
+
+    def handle(self, *args, **options):
+        worker_id = make_worker_id()
+        self.stdout.write(f"İçe aktarma işçisi başlatıldı: {worker_id}")
+
+        while True:
+            processed = process_import_jobs(worker_id=worker_id)
+            if processed:
+                self.stdout.write(f"{processed} iş tamamlandı")
+            if not options['loop']:
+                break
+            if not processed:
+                time.sleep(options['interval'])
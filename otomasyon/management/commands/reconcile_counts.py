@@ -0,0 +1,100 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from otomasyon.models import Campaign, EmailLog, MailList, Subscriber
+from otomasyon.rollups import rollup_analytics
+
+
+class Command(BaseCommand):
+    help = "Mail listesi ve kampanya sayaçlarını gerçek sayılarla karşılaştırır ve sapmaları düzeltir"
+
+    # EmailLog'dan kesin olarak yeniden sayılabilen kampanya sayaçları; toplam
+    # açılma/tıklama (opens, clicks) loglarda tutulmadığı için düzeltilemez
+    CAMPAIGN_COUNTS = {
+        'total_sent': Count('id', filter=~Q(status='bounced')),
+        'bounces': Count('id', filter=Q(status='bounced')),
+        'unique_opens': Count('subscriber', distinct=True, filter=Q(opened_at__isnull=False)),
+        'unique_clicks': Count('subscriber', distinct=True, filter=Q(clicked_at__isnull=False)),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--list', dest='list_id', help='Sadece bu mail listesini kontrol et')
+        parser.add_argument('--campaign', dest='campaign_id', help='Sadece bu kampanyayı kontrol et')
+        parser.add_argument(
+            '--analytics',
+            action='store_true',
+            help='Analytics özetlerini de baştan hesapla (silinen kayıtların bıraktığı sapmaları düzeltir)'
+        )
+
+    def handle(self, *args, **options):
+        # --list ya da --campaign verilirse sadece o tür kontrol edilir
+        if options['list_id'] or not options['campaign_id']:
+            fixed = self.reconcile_lists(options['list_id'])
+            self.stdout.write(self.style.SUCCESS(f"{fixed} liste düzeltildi"))
+        if options['campaign_id'] or not options['list_id']:
+            fixed = self.reconcile_campaigns(options['campaign_id'])
+            self.stdout.write(self.style.SUCCESS(f"{fixed} kampanya düzeltildi"))
+
+        if options['analytics']:
+            users, rows = rollup_analytics(full=True)
+            self.stdout.write(self.style.SUCCESS(f"{users} kullanıcı için {rows} günlük özet yeniden yazıldı"))
+
+    def reconcile_lists(self, list_id=None):
+        """Liste sayaçlarını abonelerden tek gruplu sorguyla yeniden sayar"""
+        mail_lists = MailList.objects.all()
+        subscribers = Subscriber.objects.all()
+        if list_id:
+            mail_lists = mail_lists.filter(id=list_id)
+            subscribers = subscribers.filter(mail_list_id=list_id)
+
+        # Tüm listelerin gerçek sayıları tek gruplu sorguda hesaplanır
+        actual = {
+            row['mail_list']: (row['active'], row['inactive'])
+            for row in subscribers.values('mail_list').annotate(
+                active=Count('id', filter=Q(is_active=True)),
+                inactive=Count('id', filter=Q(is_active=False)),
+            ).order_by()
+        }
+
+        drifted = []
+        for mail_list in mail_lists.only('id', 'name', 'subscriber_count', 'unsubscribed_count'):
+            active, inactive = actual.get(mail_list.id, (0, 0))
+            if (mail_list.subscriber_count, mail_list.unsubscribed_count) != (active, inactive):
+                self.stdout.write(
+                    f"{mail_list.name}: {mail_list.subscriber_count}/{mail_list.unsubscribed_count} -> {active}/{inactive}"
+                )
+                mail_list.subscriber_count = active
+                mail_list.unsubscribed_count = inactive
+                drifted.append(mail_list)
+
+        if drifted:
+            MailList.objects.bulk_update(drifted, ['subscriber_count', 'unsubscribed_count'], batch_size=500)
+        return len(drifted)
+
+    def reconcile_campaigns(self, campaign_id=None):
+        """Kampanya sayaçlarını EmailLog'dan tek gruplu sorguyla yeniden sayar"""
+        campaigns = Campaign.objects.all()
+        logs = EmailLog.objects.all()
+        if campaign_id:
+            campaigns = campaigns.filter(id=campaign_id)
+            logs = logs.filter(campaign_id=campaign_id)
+
+        fields = list(self.CAMPAIGN_COUNTS)
+        actual = {
+            row.pop('campaign'): row
+            for row in logs.values('campaign').annotate(**self.CAMPAIGN_COUNTS).order_by()
+        }
+
+        drifted = []
+        for campaign in campaigns.only('id', 'name', *fields):
+            counts = actual.get(campaign.id, dict.fromkeys(fields, 0))
+            current = {field: getattr(campaign, field) for field in fields}
+            if current != counts:
+                self.stdout.write(f"{campaign.name}: {current} -> {counts}")
+                for field, value in counts.items():
+                    setattr(campaign, field, value)
+                drifted.append(campaign)
+
+        if drifted:
+            Campaign.objects.bulk_update(drifted, fields, batch_size=500)
+        return len(drifted)
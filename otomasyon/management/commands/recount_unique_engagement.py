@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from otomasyon.hll import HyperLogLog
+from otomasyon.models import Campaign, EmailLog, EngagementSketch
+
+
+class Command(BaseCommand):
+    help = "Tekil açılma/tıklama sayılarını EmailLog'dan kesin olarak yeniden sayar (çevrimdışı iş)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campaign', dest='campaign_id', help='Sadece bu kampanyayı say')
+        parser.add_argument(
+            '--rebuild-sketches',
+            action='store_true',
+            help="HyperLogLog taslaklarını da EmailLog'dan yeniden oluştur"
+        )
+
+    def handle(self, *args, **options):
+        campaigns = Campaign.objects.all()
+        logs = EmailLog.objects.all()
+        if options['campaign_id']:
+            campaigns = campaigns.filter(id=options['campaign_id'])
+            logs = logs.filter(campaign_id=options['campaign_id'])
+
+        # Tüm kampanyaların kesin sayıları tek gruplu sorguda hesaplanır
+        exact = {
+            row['campaign']: (row['opens'], row['clicks'])
+            for row in logs.values('campaign').annotate(
+                opens=Count('subscriber', distinct=True, filter=Q(opened_at__isnull=False)),
+                clicks=Count('subscriber', distinct=True, filter=Q(clicked_at__isnull=False)),
+            ).order_by()
+        }
+
+        drifted = []
+        for campaign in campaigns.only('id', 'name', 'unique_opens', 'unique_clicks'):
+            opens, clicks = exact.get(campaign.id, (0, 0))
+            if (campaign.unique_opens, campaign.unique_clicks) != (opens, clicks):
+                self.stdout.write(
+                    f"{campaign.name}: {campaign.unique_opens}/{campaign.unique_clicks} -> {opens}/{clicks}"
+                )
+                campaign.unique_opens = opens
+                campaign.unique_clicks = clicks
+                drifted.append(campaign)
+
+        if drifted:
+            Campaign.objects.bulk_update(drifted, ['unique_opens', 'unique_clicks'], batch_size=500)
+        self.stdout.write(self.style.SUCCESS(f"{len(drifted)} kampanya düzeltildi"))
+
+        if options['rebuild_sketches']:
+            count = self.rebuild_sketches(campaigns, logs)
+            self.stdout.write(self.style.SUCCESS(f"{count} taslak yeniden oluşturuldu"))
+
+    def rebuild_sketches(self, campaigns, logs):
+        """Kampanya ve gün taslaklarını ilk açılma/tıklama zamanlarından yeniden kurar
+
+        EmailLog sadece ilk açılma/tıklama zamanını tuttuğu için günlük taslaklar
+        aboneyi yalnızca ilk etkileşim gününe yazar.
+        """
+        sketches = {}
+        for campaign_id, subscriber_id, opened_at, clicked_at in logs.filter(
+            Q(opened_at__isnull=False) | Q(clicked_at__isnull=False)
+        ).values_list('campaign_id', 'subscriber_id', 'opened_at', 'clicked_at').iterator(chunk_size=2000):
+            for kind, moment in (('open', opened_at), ('click', clicked_at)):
+                if moment is None:
+                    continue
+                for date in (None, timezone.localtime(moment).date()):
+                    key = (campaign_id, kind, date)
+                    if key not in sketches:
+                        sketches[key] = HyperLogLog()
+                    sketches[key].add(subscriber_id)
+
+        rows = []
+        for (campaign_id, kind, date), sketch in sketches.items():
+            row = EngagementSketch(campaign_id=campaign_id, kind=kind, date=date)
+            row.store(sketch)
+            rows.append(row)
+
+        with transaction.atomic():
+            EngagementSketch.objects.filter(campaign__in=campaigns).delete()
+            EngagementSketch.objects.bulk_create(rows, batch_size=100)
+        return len(rows)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from otomasyon.rollups import rollup_analytics
+
+
+class Command(BaseCommand):
+    help = "Son çalıştırmadan bu yana değişen günlerin Analytics özetlerini günceller (cron ile periyodik çalıştırın)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='İşaretçiyi yok say ve tüm geçmişi yeniden hesapla')
+
+    def handle(self, *args, **options):
+        users, rows = rollup_analytics(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"{users} kullanıcı için {rows} günlük özet yazıldı"))
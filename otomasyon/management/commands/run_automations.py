@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from otomasyon.automations import run_due_journeys, seconds_until_next_due, start_journeys
+from otomasyon.email_backend import make_worker_id
+from otomasyon.models import Automation
+
+
+class Command(BaseCommand):
+    help = "Zamanı gelen otomasyon akışı adımlarını gönderir"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Sürekli çalış, bir sonraki akışın zamanına kadar bekle')
+        parser.add_argument('--max-wait', type=float, help='Döngüde en uzun bekleme süresi (saniye)')
+        parser.add_argument(
+            '--enroll',
+            metavar='AUTOMATION_ID',
+            help='Otomasyonun hedef listesindeki mevcut aktif aboneleri akışa ekle'
+        )
+
+    def handle(self, *args, **options):
+        if options['enroll']:
+            try:
+                automation = Automation.objects.get(id=options['enroll'])
+            except (Automation.DoesNotExist, ValueError):
+                raise CommandError(f"Otomasyon bulunamadı: {options['enroll']}")
+            subscriber_ids = automation.mail_list.subscribers.filter(is_active=True).values_list('id', flat=True)
+            started = 0
+            chunk = []
+            for subscriber_id in subscriber_ids.iterator(chunk_size=1000):
+                chunk.append(subscriber_id)
+                if len(chunk) >= 1000:
+                    started += start_journeys(automation, chunk)
+                    chunk = []
+            if chunk:
+                started += start_journeys(automation, chunk)
+            self.stdout.write(self.style.SUCCESS(f"{started} abone akışa eklendi"))
+            return
+
+        worker_id = make_worker_id()
+        max_wait = options['max_wait'] or getattr(settings, 'AUTOMATION_POLL_INTERVAL', 30)
+        self.stdout.write(f"Otomasyon işçisi başlatıldı: {worker_id}")
+
+        while True:
+            processed = run_due_journeys(worker_id=worker_id)
+            if processed:
+                self.stdout.write(f"{processed} akış işlendi")
+            if not options['loop']:
+                break
+            time.sleep(max(1, seconds_until_next_due(max_wait)))
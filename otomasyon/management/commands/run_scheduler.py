@@ -0,0 +1,35 @@
+import threading
+
+from django.core.management.base import BaseCommand
+
+from otomasyon.scheduler import run_scheduler
+
+
+class Command(BaseCommand):
+    help = "Planlanmış kampanyaları zamanı geldiğinde sahiplenip gönderime alan sürekli çalışan zamanlayıcı"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, help='Veritabanı yoklama aralığı (saniye)')
+        parser.add_argument('--lookahead', type=int, help='Her yoklamada heap\'e alınan ileri pencere (saniye)')
+        parser.add_argument('--dispatch-concurrency', type=int, help='Aynı anda kuyruğa alınacak kampanya sayısı')
+        parser.add_argument(
+            '--send-workers',
+            type=int,
+            default=1,
+            help='Gömülü outbox işçisi sayısı (0: gönderimi ayrı send_outbox süreçleri yapar)'
+        )
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+        self.stdout.write("Kampanya zamanlayıcısı başlatıldı")
+        try:
+            run_scheduler(
+                stop_event,
+                dispatch_concurrency=options['dispatch_concurrency'],
+                send_workers=options['send_workers'],
+                poll_interval=options['poll_interval'],
+                lookahead=options['lookahead'],
+            )
+        except KeyboardInterrupt:
+            stop_event.set()
+            self.stdout.write("Zamanlayıcı durduruluyor")
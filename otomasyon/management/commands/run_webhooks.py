@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from otomasyon.email_backend import make_worker_id
+from otomasyon.webhooks import drain_webhooks, make_session
+
+
+class Command(BaseCommand):
+    help = "Kuyruktaki webhook gönderimlerini imzalayıp gönderir, başarısızları geri çekilmeyle tekrar dener"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--claim-size', type=int, help='Tek seferde sahiplenilecek gönderim sayısı')
+        parser.add_argument('--concurrency', type=int, help='Eşzamanlı istek sayısı')
+        parser.add_argument('--loop', action='store_true', help='Kuyruk boşaldığında beklemeye devam et')
+        parser.add_argument('--interval', type=float, default=1, help='Boş kuyrukta bekleme süresi (saniye)')
+
+    def handle(self, *args, **options):
+        worker_id = make_worker_id()
+        # Oturum döngü boyunca açık kalır; aynı alıcıya bağlantılar yeniden kullanılır
+        session = make_session(options['concurrency'])
+        self.stdout.write(f"Webhook işçisi başlatıldı: {worker_id}")
+
+        try:
+            while True:
+                processed = drain_webhooks(
+                    worker_id,
+                    session=session,
+                    claim_size=options['claim_size'],
+                    concurrency=options['concurrency'],
+                )
+                if processed:
+                    self.stdout.write(f"{processed} webhook gönderimi işlendi")
+                if not options['loop']:
+                    break
+                if not processed:
+                    time.sleep(options['interval'])
+        finally:
+            session.close()
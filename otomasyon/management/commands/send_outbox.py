@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from otomasyon.email_backend import drain_outbox, make_worker_id
+
+
+class Command(BaseCommand):
+    help = "Outbox'taki bekleyen kampanya e-postalarını gönderir"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campaign', help='Sadece bu kampanyanın mesajlarını gönder')
+        parser.add_argument('--claim-size', type=int, help='Tek seferde sahiplenilecek mesaj sayısı')
+        parser.add_argument('--loop', action='store_true', help='Kuyruk boşaldığında beklemeye devam et')
+        parser.add_argument('--interval', type=float, default=5, help='Boş kuyrukta bekleme süresi (saniye)')
+
+    def handle(self, *args, **options):
+        worker_id = make_worker_id()
+        self.stdout.write(f"Outbox işçisi başlatıldı: {worker_id}")
+
+        while True:
+            processed = drain_outbox(
+                worker_id=worker_id,
+                campaign_id=options['campaign'],
+                claim_size=options['claim_size'],
+            )
+            if processed:
+                self.stdout.write(f"{processed} mesaj işlendi")
+            if not options['loop']:
+                break
+            if not processed:
+                time.sleep(options['interval'])
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-17 13:41
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('pending', 'Bekliyor'), ('sending', 'Gönderiliyor'), ('sent', 'Gönderildi'), ('failed', 'Başarısız')], default='pending', max_length=20, verbose_name='Durum')),
+                ('attempts', models.IntegerField(default=0, verbose_name='Deneme Sayısı')),
+                ('claimed_by', models.CharField(blank=True, max_length=100, verbose_name='Sahiplenen İşçi')),
+                ('claimed_at', models.DateTimeField(blank=True, null=True, verbose_name='Sahiplenme Zamanı')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Gönderim Zamanı')),
+                ('error', models.TextField(blank=True, verbose_name='Hata')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox', to='otomasyon.campaign')),
+                ('subscriber', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox', to='otomasyon.subscriber')),
+            ],
+            options={
+                'verbose_name': 'Gönderim Kuyruğu',
+                'verbose_name_plural': 'Gönderim Kuyruğu',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='otomasyon_o_status_779eda_idx'), models.Index(fields=['status', 'claimed_at'], name='otomasyon_o_status_6f7908_idx')],
+                'unique_together': {('campaign', 'subscriber')},
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-17 13:47
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0002_outboxmessage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('file', models.FileField(upload_to='imports/%Y/%m/', verbose_name='Dosya')),
+                ('email_column', models.CharField(default='email', max_length=100, verbose_name='E-posta Sütunu')),
+                ('name_column', models.CharField(blank=True, max_length=100, verbose_name='İsim Sütunu')),
+                ('has_headers', models.BooleanField(default=True, verbose_name='Başlık Satırı Var')),
+                ('status', models.CharField(choices=[('pending', 'Bekliyor'), ('running', 'Çalışıyor'), ('completed', 'Tamamlandı'), ('failed', 'Başarısız')], default='pending', max_length=20, verbose_name='Durum')),
+                ('claimed_by', models.CharField(blank=True, max_length=100, verbose_name='Sahiplenen İşçi')),
+                ('processed', models.IntegerField(default=0, verbose_name='İşlenen Satır')),
+                ('inserted', models.IntegerField(default=0, verbose_name='Eklenen')),
+                ('skipped', models.IntegerField(default=0, verbose_name='Atlanan')),
+                ('invalid', models.IntegerField(default=0, verbose_name='Geçersiz')),
+                ('error', models.TextField(blank=True, verbose_name='Hata')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Başlama Zamanı')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş Zamanı')),
+                ('mail_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='otomasyon.maillist')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'İçe Aktarma İşi',
+                'verbose_name_plural': 'İçe Aktarma İşleri',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='otomasyon_i_status_7b24b2_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-17 13:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0003_importjob'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emaillog',
+            name='otomasyon_e_created_ba9554_idx',
+        ),
+        migrations.AddIndex(
+            model_name='clicktrack',
+            index=models.Index(fields=['created_at', 'id'], name='otomasyon_c_created_515630_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['created_at', 'id'], name='otomasyon_e_created_38952e_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-17 13:51
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0004_engagement_export_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='İş Adı')),
+                ('processed_until', models.DateTimeField(blank=True, null=True, verbose_name='İşlenen Son Zaman')),
+            ],
+            options={
+                'verbose_name': 'Özet İşaretçisi',
+                'verbose_name_plural': 'Özet İşaretçileri',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-17 13:56
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0005_rollupwatermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EngagementSketch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('open', 'Açılma'), ('click', 'Tıklanma')], max_length=10, verbose_name='Tür')),
+                ('date', models.DateField(blank=True, null=True, verbose_name='Gün')),
+                ('registers', models.BinaryField(default=bytes, verbose_name="Register'lar")),
+                ('cardinality', models.IntegerField(default=0, verbose_name='Tahmini Tekil Sayı')),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sketches', to='otomasyon.campaign')),
+            ],
+            options={
+                'verbose_name': 'Etkileşim Taslağı',
+                'verbose_name_plural': 'Etkileşim Taslakları',
+                'constraints': [models.UniqueConstraint(fields=('campaign', 'kind', 'date'), name='unique_daily_sketch'), models.UniqueConstraint(condition=models.Q(('date__isnull', True)), fields=('campaign', 'kind'), name='unique_campaign_sketch')],
+            },
+        ),
+    ]
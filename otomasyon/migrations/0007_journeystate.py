@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-17 14:04
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0006_engagementsketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JourneyState',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('waiting', 'Bekliyor'), ('running', 'İşleniyor'), ('completed', 'Tamamlandı'), ('cancelled', 'İptal Edildi'), ('failed', 'Başarısız')], default='waiting', max_length=20, verbose_name='Durum')),
+                ('due_at', models.DateTimeField(blank=True, null=True, verbose_name='Zamanı')),
+                ('attempts', models.IntegerField(default=0, verbose_name='Deneme')),
+                ('claimed_by', models.CharField(blank=True, max_length=100, verbose_name='İşçi')),
+                ('claimed_at', models.DateTimeField(blank=True, null=True, verbose_name='Sahiplenme Zamanı')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Tamamlanma Zamanı')),
+                ('error', models.TextField(blank=True, verbose_name='Hata')),
+                ('automation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='journeys', to='otomasyon.automation')),
+                ('next_step', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='otomasyon.automationstep', verbose_name='Sıradaki Adım')),
+                ('subscriber', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='journeys', to='otomasyon.subscriber')),
+            ],
+            options={
+                'verbose_name': 'Otomasyon Akışı',
+                'verbose_name_plural': 'Otomasyon Akışları',
+                'indexes': [models.Index(fields=['status', 'due_at'], name='otomasyon_j_status_bc580c_idx'), models.Index(fields=['status', 'claimed_at'], name='otomasyon_j_status_478f57_idx')],
+                'unique_together': {('automation', 'subscriber')},
+            },
+        ),
+    ]
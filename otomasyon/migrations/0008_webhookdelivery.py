@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-17 14:10
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0007_journeystate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookDelivery',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event_type', models.CharField(max_length=50, verbose_name='Olay Türü')),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='İçerik')),
+                ('coalesce_key', models.CharField(blank=True, max_length=200, verbose_name='Birleştirme Anahtarı')),
+                ('status', models.CharField(choices=[('pending', 'Bekliyor'), ('sending', 'Gönderiliyor'), ('delivered', 'Teslim Edildi'), ('failed', 'Başarısız')], default='pending', max_length=20, verbose_name='Durum')),
+                ('attempts', models.IntegerField(default=0, verbose_name='Deneme Sayısı')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Sonraki Deneme')),
+                ('claimed_by', models.CharField(blank=True, max_length=100, verbose_name='Sahiplenen İşçi')),
+                ('claimed_at', models.DateTimeField(blank=True, null=True, verbose_name='Sahiplenme Zamanı')),
+                ('delivered_at', models.DateTimeField(blank=True, null=True, verbose_name='Teslim Zamanı')),
+                ('response_status', models.IntegerField(blank=True, null=True, verbose_name='Yanıt Kodu')),
+                ('error', models.TextField(blank=True, verbose_name='Hata')),
+                ('webhook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='otomasyon.webhook')),
+            ],
+            options={
+                'verbose_name': 'Webhook Gönderimi',
+                'verbose_name_plural': 'Webhook Gönderimleri',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='otomasyon_w_status_c0e85f_idx'), models.Index(fields=['status', 'claimed_at'], name='otomasyon_w_status_ae149a_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('attempts', 0), ('status', 'pending'), models.Q(('coalesce_key', ''), _negated=True)), fields=('webhook', 'coalesce_key'), name='unique_pending_webhook_delivery')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-17 14:11
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0008_webhookdelivery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhook',
+            name='batch_interval_ms',
+            field=models.PositiveIntegerField(default=1000, validators=[django.core.validators.MaxValueValidator(600000)], verbose_name='Toplu Gönderim Aralığı (ms)'),
+        ),
+        migrations.AddField(
+            model_name='webhook',
+            name='batch_size',
+            field=models.PositiveIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(1000)], verbose_name='Toplu Gönderim Boyutu'),
+        ),
+    ]
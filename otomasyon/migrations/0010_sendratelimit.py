@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-17 14:23
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0009_webhook_batching'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SendRateLimit',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(max_length=255, unique=True, verbose_name='Gönderici')),
+                ('next_free_us', models.BigIntegerField(default=0, verbose_name='Sonraki Boş Zaman (µs)')),
+            ],
+            options={
+                'verbose_name': 'Gönderim Hız Sınırı',
+                'verbose_name_plural': 'Gönderim Hız Sınırları',
+            },
+        ),
+    ]
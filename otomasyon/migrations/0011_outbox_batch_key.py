@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('otomasyon', '0010_sendratelimit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='batch_key',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='Grup Anahtarı'),
+        ),
+    ]
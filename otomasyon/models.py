@@ -1,9 +1,13 @@
 from django.db import models
+from django.db.models import Case, F, IntegerField, Value, When
 from django.contrib.auth.models import User
-from django.core.validators import EmailValidator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import EmailValidator, MaxValueValidator, MinValueValidator
 import uuid
 from django.utils import timezone
 
+from .hll import HyperLogLog
+
 class BaseModel(models.Model):
     """Tüm modeller için temel model"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -13,6 +17,67 @@ class BaseModel(models.Model):
     class Meta:
         abstract = True
 
+class CounterMixin:
+    """Sayaç alanlarını satırı okumadan tek sütunlu UPDATE ile artırır
+    
+    COUNTER_FIELDS dışındaki alanlar için ValueError verilir. Mevcut kaydın
+    update_fields verilmeden yapılan save() çağrıları sayaç sütunlarını yazmaz.
+    """
+    COUNTER_FIELDS = ()
+    
+    @classmethod
+    def _counter_updates(cls, deltas):
+        unknown = set(deltas) - set(cls.COUNTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Sayaç olmayan alan: {', '.join(sorted(unknown))}")
+        return {field: F(field) + amount for field, amount in deltas.items() if amount}
+    
+    @classmethod
+    def increment_counters(cls, pk, **deltas):
+        """UPDATE ... SET x = x + n, y = y + m WHERE id = pk"""
+        updates = cls._counter_updates(deltas)
+        if not updates:
+            return 0
+        return cls.objects.filter(pk=pk).update(**updates)
+    
+    @classmethod
+    def bulk_increment_counters(cls, deltas_by_pk):
+        """Birden fazla satırın sayaçlarını tek UPDATE ile artırır
+        
+        deltas_by_pk: {pk: {'alan': artış, ...}, ...}
+        """
+        fields = set()
+        for deltas in deltas_by_pk.values():
+            cls._counter_updates(deltas)
+            fields.update(field for field, amount in deltas.items() if amount)
+        if not fields:
+            return 0
+        
+        updates = {}
+        for field in fields:
+            whens = [
+                When(pk=pk, then=Value(deltas[field]))
+                for pk, deltas in deltas_by_pk.items() if deltas.get(field)
+            ]
+            updates[field] = F(field) + Case(*whens, default=Value(0), output_field=IntegerField())
+        return cls.objects.filter(pk__in=list(deltas_by_pk)).update(**updates)
+    
+    def save(self, *args, **kwargs):
+        # Sayaçlar sadece artış farklarıyla yazılır; bellekteki eski nesnenin tam kaydı
+        # eşzamanlı F() artışlarının üzerine yazmasın diye sayaç sütunları atlanır
+        if not self._state.adding and self.pk is not None and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+    
+    def increment(self, **deltas):
+        """Bu kaydın sayaçlarını artırır ve bellekteki değerleri günceller"""
+        self.increment_counters(self.pk, **deltas)
+        for field, amount in deltas.items():
+            setattr(self, field, getattr(self, field) + amount)
+
 class Company(BaseModel):
     """Şirket/Organizasyon modeli"""
     name = models.CharField(max_length=200, verbose_name="Şirket Adı")
@@ -46,7 +111,7 @@ class UserProfile(BaseModel):
     def __str__(self):
         return f"{self.user.username} Profili"
 
-class MailList(BaseModel):
+class MailList(CounterMixin, BaseModel):
     """E-posta liste modeli"""
     LIST_TYPES = (
         ('customer', 'Müşteri'),
@@ -57,6 +122,8 @@ class MailList(BaseModel):
         ('newsletter', 'Bülten'),
     )
     
+    COUNTER_FIELDS = ('subscriber_count', 'unsubscribed_count')
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='mail_lists')
     name = models.CharField(max_length=200, verbose_name="Liste Adı")
     description = models.TextField(blank=True, verbose_name="Açıklama")
@@ -79,23 +146,17 @@ class MailList(BaseModel):
         return f"{self.name} ({self.subscriber_count})"
     
     def update_counts(self):
-        """Abone sayılarını günceller"""
-        self.subscriber_count = self.subscribers.filter(is_active=True).count()
-        self.unsubscribed_count = self.subscribers.filter(is_active=False).count()
-        self.save()
-
-    def save(self, *args, **kwargs):
-        # Abone sayısını otomatik güncelle
-        if self.pk:
-            self.subscriber_count = self.subscribers.filter(is_active=True).count()
-            self.unsubscribed_count = self.subscribers.filter(is_active=False).count()
-        super().save(*args, **kwargs)
-
-    def update_counts(self):
-        """Abone sayılarını manuel güncelle"""
-        self.subscriber_count = self.subscribers.filter(is_active=True).count()
-        self.unsubscribed_count = self.subscribers.filter(is_active=False).count()
-        self.save()
+        """Abone sayılarını baştan hesaplar (sapma düzeltme ve toplu işlemler için)"""
+        counts = self.subscribers.aggregate(
+            active=models.Count('id', filter=models.Q(is_active=True)),
+            inactive=models.Count('id', filter=models.Q(is_active=False)),
+        )
+        self.subscriber_count = counts['active']
+        self.unsubscribed_count = counts['inactive']
+        MailList.objects.filter(pk=self.pk).update(
+            subscriber_count=self.subscriber_count,
+            unsubscribed_count=self.unsubscribed_count
+        )
 
 class Subscriber(BaseModel):
     """Abone modeli"""
@@ -135,25 +196,90 @@ class Subscriber(BaseModel):
     def __str__(self):
         return f"{self.email} - {self.mail_list.name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Sayaç farkları için yüklendiği andaki liste/durum saklanır
+        if 'mail_list_id' in field_names and 'is_active' in field_names:
+            instance._counted_state = (instance.mail_list_id, instance.is_active)
+        return instance
+    
+    @staticmethod
+    def _count_field(is_active):
+        return 'subscriber_count' if is_active else 'unsubscribed_count'
+    
     def unsubscribe(self):
         """Aboneliği sonlandırır"""
         self.is_active = False
         self.unsubscribed_at = timezone.now()
         self.save()
-        self.mail_list.update_counts()
 
     def save(self, *args, **kwargs):
+        adding = self._state.adding
+        previous = getattr(self, '_counted_state', None)
         super().save(*args, **kwargs)
-        # Mail listesi sayılarını güncelle
-        if self.mail_list_id:
-            self.mail_list.update_counts()
+        
+        # Mail listesi sayılarını artış farklarıyla güncelle (liste taranmaz)
+        current = (self.mail_list_id, self.is_active)
+        if adding:
+            MailList.increment_counters(self.mail_list_id, **{self._count_field(self.is_active): 1})
+        elif previous and previous != current:
+            MailList.increment_counters(previous[0], **{self._count_field(previous[1]): -1})
+            MailList.increment_counters(current[0], **{self._count_field(current[1]): 1})
+        self._counted_state = current
     
     def delete(self, *args, **kwargs):
-        mail_list = self.mail_list
-        super().delete(*args, **kwargs)
+        mail_list_id, is_active = getattr(self, '_counted_state', (self.mail_list_id, self.is_active))
+        result = super().delete(*args, **kwargs)
         # Mail listesi sayılarını güncelle
-        if mail_list:
-            mail_list.update_counts()
+        MailList.increment_counters(mail_list_id, **{self._count_field(is_active): -1})
+        return result
+
+class ImportJob(BaseModel):
+    """Arka planda çalışan abone içe aktarma işi"""
+    STATUS_CHOICES = (
+        ('pending', 'Bekliyor'),
+        ('running', 'Çalışıyor'),
+        ('completed', 'Tamamlandı'),
+        ('failed', 'Başarısız'),
+    )
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='import_jobs')
+    mail_list = models.ForeignKey(
+        MailList, 
+        on_delete=models.CASCADE, 
+        related_name='import_jobs'
+    )
+    file = models.FileField(upload_to='imports/%Y/%m/', verbose_name="Dosya")
+    email_column = models.CharField(max_length=100, default='email', verbose_name="E-posta Sütunu")
+    name_column = models.CharField(max_length=100, blank=True, verbose_name="İsim Sütunu")
+    has_headers = models.BooleanField(default=True, verbose_name="Başlık Satırı Var")
+    
+    status = models.CharField(
+        max_length=20, 
+        choices=STATUS_CHOICES, 
+        default='pending',
+        verbose_name="Durum"
+    )
+    claimed_by = models.CharField(max_length=100, blank=True, verbose_name="Sahiplenen İşçi")
+    processed = models.IntegerField(default=0, verbose_name="İşlenen Satır")
+    inserted = models.IntegerField(default=0, verbose_name="Eklenen")
+    skipped = models.IntegerField(default=0, verbose_name="Atlanan")
+    invalid = models.IntegerField(default=0, verbose_name="Geçersiz")
+    error = models.TextField(blank=True, verbose_name="Hata")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Başlama Zamanı")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Bitiş Zamanı")
+    
+    class Meta:
+        verbose_name = "İçe Aktarma İşi"
+        verbose_name_plural = "İçe Aktarma İşleri"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.mail_list.name} - {self.get_status_display()}"
 
 class EmailTemplate(BaseModel):
     """E-posta şablon modeli"""
@@ -186,7 +312,7 @@ class EmailTemplate(BaseModel):
     def __str__(self):
         return self.name
 
-class Campaign(BaseModel):
+class Campaign(CounterMixin, BaseModel):
     """Kampanya modeli"""
     STATUS_CHOICES = (
         ('draft', 'Taslak'),
@@ -197,6 +323,11 @@ class Campaign(BaseModel):
         ('failed', 'Başarısız'),
     )
     
+    COUNTER_FIELDS = (
+        'total_sent', 'delivered', 'opens', 'unique_opens', 'clicks',
+        'unique_clicks', 'bounces', 'complaints', 'unsubscribes',
+    )
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='campaigns')
     name = models.CharField(max_length=200, verbose_name="Kampanya Adı")
     subject = models.CharField(max_length=200, verbose_name="Konu")
@@ -273,13 +404,18 @@ class Campaign(BaseModel):
             return (self.bounces / self.total_sent) * 100
         return 0
     
-    def update_stats(self):
-        """İstatistikleri gerçek zamanlı güncelle"""
-        self.unique_opens = self.logs.filter(status='opened').values('subscriber').distinct().count()
-        self.unique_clicks = self.logs.filter(status='clicked').values('subscriber').distinct().count()
-        self.save()
+    def unique_estimates(self):
+        """HyperLogLog taslaklarından tekil açılma/tıklama tahmini (~%1 hata)
+        
+        unique_opens/unique_clicks alanları takip tamponunca kesin tutulur ve
+        burada değiştirilmez; sapma için: python manage.py recount_unique_engagement
+        """
+        estimates = dict(
+            self.sketches.filter(date__isnull=True).values_list('kind', 'cardinality')
+        )
+        return {'open': estimates.get('open', 0), 'click': estimates.get('click', 0)}
 
-class Automation(BaseModel):
+class Automation(CounterMixin, BaseModel):
     """Otomasyon modeli"""
     TRIGGER_TYPES = (
         ('subscription', 'Abonelik'),
@@ -288,6 +424,8 @@ class Automation(BaseModel):
         ('webhook', 'Webhook'),
     )
     
+    COUNTER_FIELDS = ('total_triggered', 'total_sent')
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='automations')
     name = models.CharField(max_length=200, verbose_name="Otomasyon Adı")
     description = models.TextField(blank=True, verbose_name="Açıklama")
@@ -349,6 +487,54 @@ class AutomationStep(BaseModel):
     def __str__(self):
         return f"{self.automation.name} - Adım {self.step_order}"
 
+class JourneyState(BaseModel):
+    """Abonenin bir otomasyon akışındaki konumu: sıradaki adım ve zamanı"""
+    STATUS_CHOICES = (
+        ('waiting', 'Bekliyor'),
+        ('running', 'İşleniyor'),
+        ('completed', 'Tamamlandı'),
+        ('cancelled', 'İptal Edildi'),
+        ('failed', 'Başarısız'),
+    )
+    
+    automation = models.ForeignKey(
+        Automation, 
+        on_delete=models.CASCADE, 
+        related_name='journeys'
+    )
+    subscriber = models.ForeignKey(
+        Subscriber, 
+        on_delete=models.CASCADE, 
+        related_name='journeys'
+    )
+    next_step = models.ForeignKey(
+        AutomationStep, 
+        on_delete=models.SET_NULL, 
+        null=True, 
+        blank=True,
+        related_name='+',
+        verbose_name="Sıradaki Adım"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='waiting', verbose_name="Durum")
+    due_at = models.DateTimeField(null=True, blank=True, verbose_name="Zamanı")
+    attempts = models.IntegerField(default=0, verbose_name="Deneme")
+    claimed_by = models.CharField(max_length=100, blank=True, verbose_name="İşçi")
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="Sahiplenme Zamanı")
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name="Tamamlanma Zamanı")
+    error = models.TextField(blank=True, verbose_name="Hata")
+    
+    class Meta:
+        verbose_name = "Otomasyon Akışı"
+        verbose_name_plural = "Otomasyon Akışları"
+        unique_together = ['automation', 'subscriber']
+        indexes = [
+            models.Index(fields=['status', 'due_at']),
+            models.Index(fields=['status', 'claimed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.automation.name} - {self.subscriber.email}"
+
 class EmailLog(BaseModel):
     """E-posta log modeli"""
     STATUS_CHOICES = (
@@ -389,12 +575,70 @@ class EmailLog(BaseModel):
         indexes = [
             models.Index(fields=['campaign', 'subscriber']),
             models.Index(fields=['status']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.campaign.name} - {self.subscriber.email} - {self.get_status_display()}"
+
+class OutboxMessage(BaseModel):
+    """Kalıcı gönderim kuyruğu - kampanya/abone başına tek satır"""
+    STATUS_CHOICES = (
+        ('pending', 'Bekliyor'),
+        ('sending', 'Gönderiliyor'),
+        ('sent', 'Gönderildi'),
+        ('failed', 'Başarısız'),
+    )
+    
+    campaign = models.ForeignKey(
+        Campaign, 
+        on_delete=models.CASCADE, 
+        related_name='outbox'
+    )
+    subscriber = models.ForeignKey(
+        Subscriber, 
+        on_delete=models.CASCADE, 
+        related_name='outbox'
+    )
+    status = models.CharField(
+        max_length=20, 
+        choices=STATUS_CHOICES, 
+        default='pending',
+        verbose_name="Durum"
+    )
+    attempts = models.IntegerField(default=0, verbose_name="Deneme Sayısı")
+    claimed_by = models.CharField(max_length=100, blank=True, verbose_name="Sahiplenen İşçi")
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="Sahiplenme Zamanı")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Gönderim Zamanı")
+    error = models.TextField(blank=True, verbose_name="Hata")
+    # Batch gönderiminde mesajın atandığı grup; tekrar denemede aynı grup ve idempotency anahtarı kullanılır
+    batch_key = models.CharField(max_length=64, blank=True, db_index=True, verbose_name="Grup Anahtarı")
+    
+    class Meta:
+        verbose_name = "Gönderim Kuyruğu"
+        verbose_name_plural = "Gönderim Kuyruğu"
+        unique_together = ['campaign', 'subscriber']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['status', 'claimed_at']),
         ]
     
     def __str__(self):
         return f"{self.campaign.name} - {self.subscriber.email} - {self.get_status_display()}"
 
+class SendRateLimit(BaseModel):
+    """Gönderici hesabı başına tüm süreçlerin paylaştığı hız sınırı durumu"""
+    key = models.CharField(max_length=255, unique=True, verbose_name="Gönderici")
+    # Bir sonraki isteğin kota aşmadan gönderilebileceği teorik zaman (epoch, mikrosaniye)
+    next_free_us = models.BigIntegerField(default=0, verbose_name="Sonraki Boş Zaman (µs)")
+    
+    class Meta:
+        verbose_name = "Gönderim Hız Sınırı"
+        verbose_name_plural = "Gönderim Hız Sınırları"
+    
+    def __str__(self):
+        return self.key
+
 class ClickTrack(BaseModel):
     """Tıklanma takip modeli"""
     email_log = models.ForeignKey(
@@ -409,10 +653,62 @@ class ClickTrack(BaseModel):
         verbose_name = "Tıklanma Takibi"
         verbose_name_plural = "Tıklanma Takipleri"
         unique_together = ['email_log', 'url']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.email_log.subscriber.email} - {self.url}"
 
+class EngagementSketch(BaseModel):
+    """Kampanya (date boş) veya kampanya-gün bazında tekil açılma/tıklama HyperLogLog taslağı"""
+    KIND_CHOICES = (
+        ('open', 'Açılma'),
+        ('click', 'Tıklanma'),
+    )
+    
+    campaign = models.ForeignKey(
+        Campaign, 
+        on_delete=models.CASCADE, 
+        related_name='sketches'
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name="Tür")
+    date = models.DateField(null=True, blank=True, verbose_name="Gün")
+    registers = models.BinaryField(default=bytes, verbose_name="Register'lar")
+    cardinality = models.IntegerField(default=0, verbose_name="Tahmini Tekil Sayı")
+    
+    class Meta:
+        verbose_name = "Etkileşim Taslağı"
+        verbose_name_plural = "Etkileşim Taslakları"
+        constraints = [
+            models.UniqueConstraint(fields=['campaign', 'kind', 'date'], name='unique_daily_sketch'),
+            models.UniqueConstraint(
+                fields=['campaign', 'kind'],
+                condition=models.Q(date__isnull=True),
+                name='unique_campaign_sketch'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.campaign.name} - {self.kind} - {self.date or 'toplam'}"
+    
+    @property
+    def sketch(self):
+        return HyperLogLog.from_bytes(self.registers)
+    
+    def store(self, sketch):
+        """Taslağı ve tahmini sayıyı alanlara yazar (kaydetmez)"""
+        self.registers = sketch.to_bytes()
+        self.cardinality = sketch.count()
+    
+    @classmethod
+    def merged(cls, queryset):
+        """Sorgudaki taslakları birleştirip tek taslak döndürür (ör. kampanyalar/günler arası tekil kişi)"""
+        return HyperLogLog.union(
+            HyperLogLog.from_bytes(registers)
+            for registers in queryset.values_list('registers', flat=True)
+        )
+
 class Blacklist(BaseModel):
     """Kara liste modeli"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blacklist')
@@ -457,6 +753,19 @@ class Webhook(BaseModel):
     is_active = models.BooleanField(default=True, verbose_name="Aktif")
     secret_key = models.CharField(max_length=100, blank=True, verbose_name="Gizli Anahtar")
     
+    # Toplu gönderim: 1'den büyükse olaylar batch_size'a ulaşana ya da en eskisi
+    # batch_interval_ms kadar bekleyene kadar biriktirilir ve tek JSON dizisi olarak gönderilir
+    batch_size = models.PositiveIntegerField(
+        default=1,
+        validators=[MinValueValidator(1), MaxValueValidator(1000)],
+        verbose_name="Toplu Gönderim Boyutu"
+    )
+    batch_interval_ms = models.PositiveIntegerField(
+        default=1000,
+        validators=[MaxValueValidator(600000)],
+        verbose_name="Toplu Gönderim Aralığı (ms)"
+    )
+    
     class Meta:
         verbose_name = "Webhook"
         verbose_name_plural = "Webhooks"
@@ -464,6 +773,56 @@ class Webhook(BaseModel):
     def __str__(self):
         return f"{self.name} - {self.get_event_type_display()}"
 
+class WebhookDelivery(BaseModel):
+    """Kalıcı webhook gönderim kuyruğu - olay başına tek satır"""
+    STATUS_CHOICES = (
+        ('pending', 'Bekliyor'),
+        ('sending', 'Gönderiliyor'),
+        ('delivered', 'Teslim Edildi'),
+        ('failed', 'Başarısız'),
+    )
+    
+    webhook = models.ForeignKey(
+        Webhook, 
+        on_delete=models.CASCADE, 
+        related_name='deliveries'
+    )
+    event_type = models.CharField(max_length=50, verbose_name="Olay Türü")
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder, verbose_name="İçerik")
+    coalesce_key = models.CharField(max_length=200, blank=True, verbose_name="Birleştirme Anahtarı")
+    status = models.CharField(
+        max_length=20, 
+        choices=STATUS_CHOICES, 
+        default='pending',
+        verbose_name="Durum"
+    )
+    attempts = models.IntegerField(default=0, verbose_name="Deneme Sayısı")
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name="Sonraki Deneme")
+    claimed_by = models.CharField(max_length=100, blank=True, verbose_name="Sahiplenen İşçi")
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="Sahiplenme Zamanı")
+    delivered_at = models.DateTimeField(null=True, blank=True, verbose_name="Teslim Zamanı")
+    response_status = models.IntegerField(null=True, blank=True, verbose_name="Yanıt Kodu")
+    error = models.TextField(blank=True, verbose_name="Hata")
+    
+    class Meta:
+        verbose_name = "Webhook Gönderimi"
+        verbose_name_plural = "Webhook Gönderimleri"
+        constraints = [
+            # Aynı olay ilk gönderimini beklerken tekrar gelirse yeni satır açılmaz
+            models.UniqueConstraint(
+                fields=['webhook', 'coalesce_key'],
+                condition=models.Q(status='pending', attempts=0) & ~models.Q(coalesce_key=''),
+                name='unique_pending_webhook_delivery'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['status', 'claimed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.webhook.name} - {self.event_type} - {self.get_status_display()}"
+
 class Analytics(BaseModel):
     """Analitik modeli"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='analytics')
@@ -503,4 +862,16 @@ class Analytics(BaseModel):
             self.delivery_rate = (self.emails_delivered / self.emails_sent) * 100
             self.open_rate = (self.emails_opened / self.emails_sent) * 100
             self.click_rate = (self.emails_clicked / self.emails_sent) * 100
-            self.bounce_rate = (self.emails_bounced / self.emails_sent) * 100
\ No newline at end of file
+            self.bounce_rate = (self.emails_bounced / self.emails_sent) * 100
+
+class RollupWatermark(BaseModel):
+    """Periyodik özet işlerinin en son işlediği zaman damgası"""
+    name = models.CharField(max_length=100, unique=True, verbose_name="İş Adı")
+    processed_until = models.DateTimeField(null=True, blank=True, verbose_name="İşlenen Son Zaman")
+    
+    class Meta:
+        verbose_name = "Özet İşaretçisi"
+        verbose_name_plural = "Özet İşaretçileri"
+    
+    def __str__(self):
+        return f"{self.name} - {self.processed_until}"
@@ -0,0 +1,204 @@
+# otomasyon/rollups.py
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Min, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, TruncDate
+from django.utils import timezone
+
+from .dashboard_cache import invalidate_dashboard
+from .models import Analytics, Campaign, EmailLog, RollupWatermark, Subscriber
+
+ANALYTICS_ROLLUP = 'analytics_daily'
+# Geç commit edilen işlemler kaçmasın diye işaretçinin biraz gerisinden başlanır
+WATERMARK_OVERLAP = datetime.timedelta(minutes=5)
+
+ANALYTICS_FIELDS = [
+    'total_campaigns', 'total_subscribers', 'new_subscribers', 'unsubscribed',
+    'emails_sent', 'emails_delivered', 'emails_opened', 'emails_clicked', 'emails_bounced',
+    'delivery_rate', 'open_rate', 'click_rate', 'bounce_rate', 'updated_at',
+]
+
+def _mark_dirty(dirty, user_id, moment):
+    """Kullanıcının yeniden hesaplanacak en eski gününü günceller"""
+    if user_id is None or moment is None:
+        return
+    day = timezone.localtime(moment).date()
+    if user_id not in dirty or day < dirty[user_id]:
+        dirty[user_id] = day
+
+def find_dirty_days(since=None):
+    """since sonrasında değişen kayıtlardan {user_id: en eski etkilenen gün} çıkarır
+
+    since None ise tüm geçmiş yeniden hesaplanır; Analytics satırı olan ama
+    verisi silinmiş kullanıcılar da bu durumda sıfırlanır.
+
+    Silinen kampanya/abone/loglar ve başka kullanıcının listesine taşınan aboneler
+    iz bırakmadığı için artımlı çalışmada günleri kirletmez. Bu sapmalar
+    `reconcile_counts --analytics` (tam yeniden hesaplama) ile düzeltilir.
+    """
+    logs = EmailLog.objects.all()
+    subscribers = Subscriber.objects.all()
+    campaigns = Campaign.objects.filter(sent_at__isnull=False)
+    if since is not None:
+        logs = logs.filter(updated_at__gt=since)
+        campaigns = campaigns.filter(updated_at__gt=since)
+
+    dirty = {}
+    # E-posta metrikleri gönderim gününe yazıldığı için açılma/tıklama da o günü etkiler
+    for row in logs.values('campaign__user').annotate(first=Min('created_at')).order_by():
+        _mark_dirty(dirty, row['campaign__user'], row['first'])
+
+    # Yeni aboneler katıldıkları günden itibaren etkiler
+    new_subscribers = subscribers if since is None else subscribers.filter(created_at__gt=since)
+    for row in new_subscribers.values('mail_list__user').annotate(
+        first_subscribed=Min('subscribed_at'),
+        first_unsubscribed=Min('unsubscribed_at'),
+    ).order_by():
+        _mark_dirty(dirty, row['mail_list__user'], row['first_subscribed'])
+        _mark_dirty(dirty, row['mail_list__user'], row['first_unsubscribed'])
+
+    # Eski abonelerdeki değişiklik (abonelikten çıkma, düzenleme) değişiklik gününden
+    # itibaren etkiler; subscribed_at'ten işaretlemek her düzenlemede kullanıcının
+    # tüm geçmişini yeniden hesaplatırdı
+    if since is not None:
+        for row in subscribers.filter(updated_at__gt=since, created_at__lte=since).values(
+            'mail_list__user'
+        ).annotate(
+            first_changed=Min('updated_at'),
+            first_unsubscribed=Min('unsubscribed_at', filter=Q(unsubscribed_at__gt=since)),
+        ).order_by():
+            _mark_dirty(dirty, row['mail_list__user'], row['first_changed'])
+            _mark_dirty(dirty, row['mail_list__user'], row['first_unsubscribed'])
+
+    for row in campaigns.values('user').annotate(first=Min('sent_at')).order_by():
+        _mark_dirty(dirty, row['user'], row['first'])
+
+    if since is None:
+        for user_id, first_day in Analytics.objects.values('user').annotate(
+            first=Min('date')
+        ).order_by().values_list('user', 'first'):
+            if user_id not in dirty or first_day < dirty[user_id]:
+                dirty[user_id] = first_day
+    return dirty
+
+def _count_by_day(queryset, field, **counts):
+    """queryset'i field gününe göre gruplar ve {gün: {ad: sayı}} döndürür"""
+    rows = queryset.annotate(day=TruncDate(field)).values('day').annotate(**counts).order_by()
+    return {row.pop('day'): row for row in rows}
+
+def rebuild_user_days(user_id, first_day, last_day=None):
+    """Kullanıcının first_day..last_day aralığındaki Analytics satırlarını yeniden yazar
+
+    Toplam abone sayısı kümülatif olduğu için aralık her zaman bugüne kadar uzatılır.
+    """
+    last_day = last_day or timezone.localdate()
+    start = timezone.make_aware(datetime.datetime.combine(first_day, datetime.time.min))
+
+    logs = _count_by_day(
+        EmailLog.objects.filter(campaign__user_id=user_id, created_at__gte=start),
+        'created_at',
+        sent=Count('id'),
+        opened=Count('id', filter=Q(opened_at__isnull=False)),
+        clicked=Count('id', filter=Q(clicked_at__isnull=False)),
+        bounced=Count('id', filter=Q(status='bounced')),
+    )
+    subscribers = Subscriber.objects.filter(mail_list__user_id=user_id)
+    joined = _count_by_day(subscribers.filter(subscribed_at__gte=start), 'subscribed_at', count=Count('id'))
+    left = _count_by_day(
+        subscribers.filter(is_active=False, unsubscribed_at__gte=start),
+        'unsubscribed_at',
+        count=Count('id')
+    )
+    sent_campaigns = _count_by_day(
+        Campaign.objects.filter(user_id=user_id, sent_at__gte=start),
+        'sent_at',
+        count=Count('id')
+    )
+    # Aralık başındaki abone sayısı, günlük farklar bunun üzerine eklenir
+    total_subscribers = subscribers.aggregate(
+        total=Count('id', filter=Q(subscribed_at__lt=start))
+        - Count('id', filter=Q(is_active=False, unsubscribed_at__lt=start))
+    )['total'] or 0
+
+    rows = []
+    day = first_day
+    while day <= last_day:
+        emails = logs.get(day, {})
+        new_count = joined.get(day, {}).get('count', 0)
+        left_count = left.get(day, {}).get('count', 0)
+        total_subscribers += new_count - left_count
+
+        row = Analytics(
+            user_id=user_id,
+            date=day,
+            total_campaigns=sent_campaigns.get(day, {}).get('count', 0),
+            total_subscribers=total_subscribers,
+            new_subscribers=new_count,
+            unsubscribed=left_count,
+            emails_sent=emails.get('sent', 0),
+            emails_delivered=emails.get('sent', 0) - emails.get('bounced', 0),
+            emails_opened=emails.get('opened', 0),
+            emails_clicked=emails.get('clicked', 0),
+            emails_bounced=emails.get('bounced', 0),
+        )
+        row.calculate_rates()
+        rows.append(row)
+        day += datetime.timedelta(days=1)
+
+    Analytics.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['user', 'date'],
+        update_fields=ANALYTICS_FIELDS,
+        batch_size=500
+    )
+    invalidate_dashboard(user_id)
+    return len(rows)
+
+def rollup_analytics(full=False):
+    """İşaretçiden bu yana değişen kullanıcı/günlerin Analytics satırlarını günceller
+
+    Döndürülen değer (kullanıcı sayısı, yazılan satır sayısı) çiftidir.
+    """
+    started_at = timezone.now()
+    watermark, _ = RollupWatermark.objects.get_or_create(name=ANALYTICS_ROLLUP)
+    since = None
+    if not full and watermark.processed_until is not None:
+        since = watermark.processed_until - WATERMARK_OVERLAP
+
+    dirty = find_dirty_days(since)
+    today = timezone.localdate()
+    written = 0
+    for user_id, first_day in dirty.items():
+        with transaction.atomic():
+            written += rebuild_user_days(user_id, first_day, today)
+
+    watermark.processed_until = started_at
+    watermark.save(update_fields=['processed_until', 'updated_at'])
+    return len(dirty), written
+
+def rate_expression(numerator, denominator):
+    """numerator / denominator yüzdesini veritabanında hesaplayan ifade; payda 0 ise 0"""
+    return Coalesce(
+        Cast(numerator, FloatField()) * 100 / NullIf(denominator, 0),
+        Value(0.0)
+    )
+
+def analytics_totals(user, days=None):
+    """Kullanıcının Analytics satırlarından son `days` günün toplam ve oranlarını
+    tek aggregate sorgusuyla döndürür"""
+    rows = Analytics.objects.filter(user=user)
+    if days:
+        rows = rows.filter(date__gt=timezone.localdate() - datetime.timedelta(days=days))
+    return rows.aggregate(
+        emails_sent=Sum('emails_sent', default=0),
+        emails_opened=Sum('emails_opened', default=0),
+        emails_clicked=Sum('emails_clicked', default=0),
+        emails_bounced=Sum('emails_bounced', default=0),
+        new_subscribers=Sum('new_subscribers', default=0),
+        unsubscribed=Sum('unsubscribed', default=0),
+        # Oranlar yukarıdaki toplamlar üzerinden aynı sorguda hesaplanır
+        open_rate=rate_expression(F('emails_opened'), F('emails_sent')),
+        click_rate=rate_expression(F('emails_clicked'), F('emails_sent')),
+    )
@@ -0,0 +1,153 @@
+# otomasyon/scheduler.py
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .dashboard_cache import invalidate_dashboard
+from .email_backend import drain_outbox, enqueue_campaign, finish_campaign, make_worker_id
+from .models import Campaign
+
+def claim_scheduled_campaign(campaign_id, now=None):
+    """Zamanı gelen kampanyayı 'scheduled' -> 'sending' geçişiyle sahiplenir
+
+    Koşullu UPDATE sayesinde aynı kampanyayı birden fazla zamanlayıcı çalışsa bile
+    yalnızca biri alır. Sahiplenilemezse None döner.
+    """
+    now = now or timezone.now()
+    claimed = Campaign.objects.filter(
+        id=campaign_id,
+        status='scheduled',
+        scheduled_time__lte=now
+    ).update(status='sending', sent_at=now, updated_at=now)
+    if not claimed:
+        return None
+    return Campaign.objects.get(id=campaign_id)
+
+def dispatch_campaign(campaign_id):
+    """Kampanyayı sahiplenir ve alıcılarını outbox'a yazar
+
+    Sahiplenme ve kuyruğa alma tek işlemde yapılır; süreç arada çökerse kampanya
+    'scheduled' durumunda kalır ve bir sonraki turda tekrar alınır.
+    Gönderimi outbox işçileri (drain_outbox / send_outbox) yapar.
+    """
+    try:
+        with transaction.atomic():
+            campaign = claim_scheduled_campaign(campaign_id)
+            if campaign is None:
+                return None
+            pending = enqueue_campaign(campaign)
+        invalidate_dashboard(campaign.user_id)
+        print(f"Planlanan kampanya kuyruğa alındı: {campaign.name} ({pending} alıcı)")
+        if not pending:
+            finish_campaign(campaign.id)
+        return pending
+    except Exception as e:
+        print(f"Planlanan kampanya kuyruğa alınamadı ({campaign_id}): {str(e)}")
+        return None
+    finally:
+        close_old_connections()
+
+class CampaignScheduler:
+    """Planlanmış kampanyaları scheduled_time sırasıyla uyandıran min-heap
+
+    Veritabanı yalnızca poll_interval'da bir, scheduled_time index'i üzerinden
+    önümüzdeki lookahead penceresi için sorgulanır; aradaki uyanmalar heap'in
+    tepesindeki zamana göre yapılır.
+    """
+
+    def __init__(self, dispatch, poll_interval=None, lookahead=None, batch_size=500):
+        self.dispatch = dispatch
+        self.poll_interval = poll_interval or getattr(settings, 'SCHEDULER_POLL_INTERVAL', 10)
+        self.lookahead = timezone.timedelta(
+            seconds=lookahead or getattr(settings, 'SCHEDULER_LOOKAHEAD', 300)
+        )
+        self.batch_size = batch_size
+        self.heap = []
+        self.known = set()
+        self.last_refresh = None
+
+    def refresh(self, now):
+        """Pencere içindeki planlanmış kampanyaları heap'e ekler"""
+        upcoming = Campaign.objects.filter(
+            status='scheduled',
+            scheduled_time__lte=now + self.lookahead
+        ).order_by('scheduled_time').values_list('scheduled_time', 'id')[:self.batch_size]
+        for scheduled_time, campaign_id in upcoming:
+            # Zamanı değiştirilen kampanya yeni zamanıyla tekrar eklenir
+            if (scheduled_time, campaign_id) not in self.known:
+                self.known.add((scheduled_time, campaign_id))
+                heapq.heappush(self.heap, (scheduled_time, campaign_id))
+        self.last_refresh = now
+
+    def pop_due(self, now):
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            self.known.discard(entry)
+            due.append(entry[1])
+        return due
+
+    def seconds_until_next(self, now):
+        """Bir sonraki uyanmaya kadar beklenecek süre (en fazla poll_interval)"""
+        wait = self.poll_interval
+        if self.last_refresh is not None:
+            wait -= (now - self.last_refresh).total_seconds()
+        if self.heap:
+            wait = min(wait, (self.heap[0][0] - now).total_seconds())
+        return max(wait, 0)
+
+    def run_once(self, now=None):
+        now = now or timezone.now()
+        if self.last_refresh is None or (now - self.last_refresh).total_seconds() >= self.poll_interval:
+            self.refresh(now)
+        due = self.pop_due(now)
+        for campaign_id in due:
+            self.dispatch(campaign_id)
+        return due
+
+    def run(self, stop_event):
+        while not stop_event.is_set():
+            self.run_once()
+            stop_event.wait(self.seconds_until_next(timezone.now()))
+
+def run_send_worker(stop_event, idle_interval=5):
+    """Outbox boşalana kadar gönderir, boşken bekler (send_outbox --loop ile aynı iş)"""
+    worker_id = make_worker_id()
+    while not stop_event.is_set():
+        try:
+            processed = drain_outbox(worker_id=worker_id)
+        except Exception as e:
+            print(f"Outbox işçisi hatası: {str(e)}")
+            processed = 0
+        finally:
+            close_old_connections()
+        if not processed:
+            stop_event.wait(idle_interval)
+
+def run_scheduler(stop_event, dispatch_concurrency=None, send_workers=1, poll_interval=None, lookahead=None):
+    """Zamanlayıcıyı ve isteğe bağlı gömülü outbox işçilerini stop_event set edilene kadar çalıştırır"""
+    dispatch_concurrency = dispatch_concurrency or getattr(settings, 'SCHEDULER_DISPATCH_CONCURRENCY', 4)
+    workers = [
+        threading.Thread(target=run_send_worker, args=(stop_event,), daemon=True)
+        for _ in range(send_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        # Aynı dakikaya düşen çok sayıda kampanya paralel olarak kuyruğa alınır
+        with ThreadPoolExecutor(max_workers=dispatch_concurrency) as executor:
+            scheduler = CampaignScheduler(
+                dispatch=lambda campaign_id: executor.submit(dispatch_campaign, campaign_id),
+                poll_interval=poll_interval,
+                lookahead=lookahead
+            )
+            scheduler.run(stop_event)
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,56 @@
+# otomasyon/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .automations import start_subscription_journeys, subscription_triggers
+from .dashboard_cache import invalidate_dashboard, mail_list_owner
+from .models import Analytics, Automation, AutomationStep, Campaign, MailList, Subscriber, Webhook
+from .webhooks import enqueue_event, subscriber_data, webhook_events
+
+# Toplu yollar (bulk_create, F() sayaçları, .update()) sinyal üretmez;
+# bu yollar invalidate_dashboard / invalidate_campaign_dashboards'u kendileri çağırır.
+
+@receiver([post_save, post_delete], sender=Campaign)
+@receiver([post_save, post_delete], sender=MailList)
+@receiver([post_save, post_delete], sender=Automation)
+@receiver([post_save, post_delete], sender=Analytics)
+def invalidate_owner_dashboard(sender, instance, **kwargs):
+    invalidate_dashboard(instance.user_id)
+
+@receiver([post_save, post_delete], sender=Subscriber)
+def invalidate_subscriber_dashboard(sender, instance, **kwargs):
+    invalidate_dashboard(mail_list_owner(instance.mail_list_id))
+
+@receiver([post_save, post_delete], sender=Automation)
+@receiver([post_save, post_delete], sender=AutomationStep)
+def invalidate_subscription_triggers(sender, instance, **kwargs):
+    transaction.on_commit(subscription_triggers.invalidate)
+
+@receiver(post_save, sender=Subscriber)
+def trigger_subscription_automations(sender, instance, created, raw=False, **kwargs):
+    # Liste -> otomasyon eşlemesi bellekte tutulur; tetikleyicisi olmayan listede sorgu çalışmaz
+    if created and not raw and instance.is_active:
+        start_subscription_journeys([(instance.id, instance.mail_list_id)])
+
+@receiver(post_save, sender=Subscriber)
+def enqueue_subscriber_webhooks(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    # Subscriber.save, _counted_state'i post_save'den sonra günceller; burada hâlâ önceki durum durur
+    previous = getattr(instance, '_counted_state', None)
+    if created and instance.is_active:
+        event_type = 'subscription'
+    elif previous and previous[1] and not instance.is_active:
+        event_type = 'unsubscription'
+    else:
+        return
+    # Webhook'u olmayan kullanıcı için sorgu çalışmaz (webhook_events önbelleği)
+    enqueue_event(
+        mail_list_owner(instance.mail_list_id), event_type, subscriber_data(instance),
+        coalesce_key=f"{event_type}:{instance.id}"
+    )
+
+@receiver([post_save, post_delete], sender=Webhook)
+def invalidate_webhook_events(sender, instance, **kwargs):
+    transaction.on_commit(webhook_events.invalidate)
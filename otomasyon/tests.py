@@ -1,3 +1,1262 @@
-from django.test import TestCase
+import contextlib
+import csv
+import datetime
+import gzip
+import http.server
+import io
+import json
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .email_backend import (
+    CampaignSendEngine, EmailSender, SharedTokenBucket, TokenBucket, TrackingTemplate, claim_outbox_batch, drain_outbox, enqueue_campaign,
+    finish_campaign, release_stale_claims,
+)
+from .automations import claim_due_journeys, start_journeys, subscription_triggers
+from .hll import HyperLogLog
+from .exporters import iter_keyset
+from .importers import import_rows, iter_csv_rows, iter_xlsx_rows, process_import_jobs
+from .tracking import TrackingBuffer, TrackingEvent, apply_events, make_token, read_token
+from .webhooks import drain_webhooks, enqueue_campaign_events, enqueue_event, sign_payload, webhook_events
+from .rollups import ANALYTICS_ROLLUP, WATERMARK_OVERLAP, find_dirty_days, rollup_analytics
+from .scheduler import CampaignScheduler, claim_scheduled_campaign
+from .models import (
+    Analytics, Automation, AutomationStep, Campaign, ClickTrack, EmailLog, ImportJob, JourneyState, MailList,
+    OutboxMessage, RollupWatermark, Subscriber, Webhook, WebhookDelivery,
+)
+
+
+class AnalyticsQueryCountTests(TestCase):
+    """Analitik sayfalarının sorgu sayısı kampanya/abone sayısıyla büyümemeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('analist', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Bülten')
+        today = timezone.localdate()
+        for i in range(3):
+            Analytics.objects.create(
+                user=cls.user,
+                date=today - datetime.timedelta(days=i),
+                emails_sent=100,
+                emails_opened=25,
+                emails_clicked=5,
+                new_subscribers=2,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def add_campaigns(self, count):
+        offset = Subscriber.objects.count()
+        Campaign.objects.bulk_create([
+            Campaign(
+                user=self.user,
+                name=f'Kampanya {i}',
+                subject='Konu',
+                content='İçerik',
+                status='sent',
+                sent_at=timezone.now(),
+                total_sent=10,
+                unique_opens=i % 10,
+            )
+            for i in range(count)
+        ])
+        Subscriber.objects.bulk_create([
+            Subscriber(mail_list=self.mail_list, email=f'abone{offset + i}@example.com')
+            for i in range(count)
+        ])
+        self.mail_list.update_counts()
+
+    def assertConstantQueries(self, url_name, num):
+        """Sayfayı az ve çok veriyle çağırır; her iki durumda da sorgu sayısı num olmalı"""
+        url = reverse(url_name)
+        self.add_campaigns(2)
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.add_campaigns(50)
+        cache.clear()
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_dashboard(self):
+        response = self.assertConstantQueries('dashboard', 10)
+        self.assertEqual(response.context['total_sent_recent'], 300)
+        self.assertEqual(response.context['success_rate'], 25.0)
+
+    def test_analytics_overview(self):
+        response = self.assertConstantQueries('analytics_overview', 3)
+        self.assertEqual(response.context['total_emails_sent'], 300)
+        self.assertEqual(response.context['click_rate'], 5.0)
+
+    def test_analytics_subscribers(self):
+        response = self.assertConstantQueries('analytics_subscribers', 5)
+        self.assertEqual(response.context['total_subscribers'], 52)
+        self.assertEqual(response.context['new_subscribers'], 6)
+
+    def test_api_analytics(self):
+        response = self.assertConstantQueries('api_analytics', 4)
+        data = response.json()
+        self.assertEqual(data['total_campaigns'], 52)
+        self.assertEqual(data['total_emails_sent'], 300)
+        self.assertEqual(data['average_open_rate'], 43.46)
+
+
+class AnalyticsRollupTests(TestCase):
+    """Günlük özetler sadece değişen günleri yeniden yazmalı ve tekrar çalıştırmada aynı kalmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ozet', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Liste')
+        now = timezone.now()
+        cls.joined = now - datetime.timedelta(days=10)
+        cls.sent = now - datetime.timedelta(days=2)
+        cls.campaign = Campaign.objects.create(
+            user=cls.user, name='Kampanya', subject='Konu', content='İçerik', status='sent', sent_at=cls.sent
+        )
+        cls.subscribers = [
+            Subscriber.objects.create(mail_list=cls.mail_list, email=f'ozet{i}@example.com')
+            for i in range(3)
+        ]
+        Subscriber.objects.update(subscribed_at=cls.joined, created_at=cls.joined, updated_at=cls.joined)
+        Campaign.objects.update(created_at=cls.sent, updated_at=cls.sent)
+        for subscriber, status, opened, clicked in (
+            (cls.subscribers[0], 'sent', True, True),
+            (cls.subscribers[1], 'sent', True, False),
+            (cls.subscribers[2], 'bounced', False, False),
+        ):
+            EmailLog.objects.create(
+                campaign=cls.campaign,
+                subscriber=subscriber,
+                status=status,
+                opened_at=cls.sent if opened else None,
+                clicked_at=cls.sent if clicked else None,
+            )
+        EmailLog.objects.update(created_at=cls.sent, updated_at=cls.sent)
+
+    def row(self, moment):
+        return Analytics.objects.get(user=self.user, date=timezone.localtime(moment).date())
+
+    def watermark(self):
+        return RollupWatermark.objects.get(name=ANALYTICS_ROLLUP).processed_until
+
+    def test_rollup_writes_daily_values(self):
+        started_at = timezone.now()
+        self.assertEqual(rollup_analytics(), (1, 11))
+        self.assertGreaterEqual(self.watermark(), started_at)
+
+        joined = self.row(self.joined)
+        self.assertEqual((joined.new_subscribers, joined.total_subscribers, joined.emails_sent), (3, 3, 0))
+        sent = self.row(self.sent)
+        self.assertEqual(
+            (sent.total_campaigns, sent.emails_sent, sent.emails_delivered, sent.emails_opened,
+             sent.emails_clicked, sent.emails_bounced, sent.total_subscribers),
+            (1, 3, 2, 2, 1, 1, 3)
+        )
+        self.assertAlmostEqual(sent.open_rate, 200 / 3)
+        self.assertAlmostEqual(sent.bounce_rate, 100 / 3)
+
+    def test_rerun_updates_rows_in_place(self):
+        rollup_analytics()
+        # Değişiklik yoksa hiçbir gün yeniden yazılmaz
+        self.assertEqual(rollup_analytics(), (0, 0))
+
+        log = EmailLog.objects.get(subscriber=self.subscribers[1])
+        log.clicked_at = timezone.now()
+        log.save()
+        self.assertEqual(rollup_analytics(), (1, 3))
+        self.assertEqual(self.row(self.sent).emails_clicked, 2)
+        self.assertEqual(Analytics.objects.filter(user=self.user).count(), 11)
+
+    def test_watermark_overlap_catches_late_commits(self):
+        rollup_analytics()
+        watermark = self.watermark()
+        # İşaretçiden hemen önce başlayıp geç commit edilen değişiklik kaçmamalı
+        EmailLog.objects.filter(subscriber=self.subscribers[1]).update(
+            clicked_at=watermark, updated_at=watermark - datetime.timedelta(minutes=1)
+        )
+        self.assertEqual(rollup_analytics(), (1, 3))
+        self.assertEqual(self.row(self.sent).emails_clicked, 2)
+
+        # Örtüşme penceresinden eski değişiklikler zaten işlenmiştir
+        old = self.watermark() - WATERMARK_OVERLAP - datetime.timedelta(minutes=1)
+        EmailLog.objects.update(updated_at=old)
+        self.assertEqual(rollup_analytics(), (0, 0))
+
+    def test_old_subscriber_change_marks_change_day(self):
+        rollup_analytics()
+        Subscriber.objects.get(pk=self.subscribers[0].pk).unsubscribe()
+        since = self.watermark() - WATERMARK_OVERLAP
+        # Abonelik gününden değil, değişiklik gününden itibaren yeniden hesaplanır
+        self.assertEqual(find_dirty_days(since), {self.user.id: timezone.localdate()})
+
+        self.assertEqual(rollup_analytics(), (1, 1))
+        today = Analytics.objects.get(user=self.user, date=timezone.localdate())
+        self.assertEqual((today.unsubscribed, today.total_subscribers), (1, 2))
+        self.assertEqual(self.row(self.joined).new_subscribers, 3)
+
+    def test_reconcile_rebuilds_after_deletes(self):
+        rollup_analytics()
+        self.campaign.delete()
+        # Silme iz bırakmaz; artımlı çalışma günü kirletmez
+        rollup_analytics()
+        self.assertEqual(self.row(self.sent).emails_sent, 3)
+
+        call_command('reconcile_counts', analytics=True, stdout=io.StringIO())
+        sent = self.row(self.sent)
+        self.assertEqual((sent.total_campaigns, sent.emails_sent, sent.emails_opened), (0, 0, 0))
+        self.assertEqual(sent.total_subscribers, 3)
+
+
+class DashboardCacheTests(TestCase):
+    """Dashboard verisi önbellekten gelmeli ve ilgili yazmalarda geçersiz kılınmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('panel', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Liste')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_repeated_load_uses_cache(self):
+        self.client.get(reverse('dashboard'))
+        # Sadece oturum ve kullanıcı sorguları kalır
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_campaigns'], 0)
+
+    def test_campaign_save_invalidates(self):
+        self.client.get(reverse('dashboard'))
+        # Geçersiz kılma commit sonrasında çalışır
+        with self.captureOnCommitCallbacks(execute=True):
+            Campaign.objects.create(user=self.user, name='Yeni', subject='Konu', content='İçerik')
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_campaigns'], 1)
+
+    def test_subscriber_save_invalidates(self):
+        self.client.get(reverse('dashboard'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Subscriber.objects.create(mail_list=self.mail_list, email='yeni@example.com')
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_subscribers'], 1)
+
+    def test_counter_update_invalidates(self):
+        campaign = Campaign.objects.create(user=self.user, name='Yeni', subject='Konu', content='İçerik')
+        self.client.get(reverse('dashboard'))
+        Campaign.objects.filter(pk=campaign.pk).update(status='sending')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(finish_campaign(campaign.pk))
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['campaigns'][0].status, 'sent')
+
+
+
+class TokenBucketTests(TestCase):
+    """Süreç içi token bucket patlamadan sonra istekleri sürekli hıza yaymalı"""
+
+    def test_pacing_with_injected_clock(self):
+        now = [100.0]
+        bucket = TokenBucket(rate=10, burst=2, clock=lambda: now[0])
+        # İlk iki istek patlama kapasitesinden, sonrakiler 1/rate arayla
+        self.assertEqual([round(bucket.reserve(), 3) for _ in range(4)], [0, 0, 0.1, 0.2])
+        # Bekleyenler 0.1 ve 0.2'deki token'ları ayırmıştır; sıradaki token 0.3'te gelir
+        now[0] += 0.25
+        self.assertEqual(round(bucket.reserve(), 3), 0.05)
+        # Uzun beklemeden sonra birikim kapasiteyle sınırlıdır
+        now[0] += 10
+        self.assertEqual([round(bucket.reserve(), 3) for _ in range(3)], [0, 0, 0.1])
+
+    def test_zero_rate_never_waits(self):
+        bucket = TokenBucket(rate=0)
+        with mock.patch('otomasyon.email_backend.time.sleep') as sleep:
+            for _ in range(5):
+                bucket.acquire()
+        sleep.assert_not_called()
+
+
+class SharedRateLimitTests(TestCase):
+    """Aynı göndericiyi kullanan süreçler kotayı birlikte tüketmeli"""
+
+    def test_buckets_share_quota(self):
+        # İki ayrı süreçteki sınırlayıcıları taklit eden iki örnek
+        first = SharedTokenBucket('gonderen@example.com', rate=10, burst=2)
+        second = SharedTokenBucket('gonderen@example.com', rate=10, burst=2)
+        now = time.time()
+        waits = [first.reserve(now=now), second.reserve(now=now), first.reserve(now=now), second.reserve(now=now)]
+        self.assertEqual([round(wait, 3) for wait in waits], [0, 0, 0.1, 0.2])
+
+
+
+class TrackingTokenTests(TestCase):
+    """Takip token'ı kimliği taşımalı ve değiştirilmiş token reddedilmeli"""
+
+    def setUp(self):
+        self.campaign_id = uuid.uuid4()
+        self.subscriber_id = uuid.uuid4()
+
+    def test_round_trip(self):
+        url = 'https://ornek.com/ürün?id=5&ref=mail'
+        identity = read_token(make_token(self.campaign_id, self.subscriber_id, url))
+        self.assertEqual(identity, (self.campaign_id, self.subscriber_id, url))
+        self.assertIsNone(read_token(make_token(self.campaign_id, self.subscriber_id)).url)
+
+    def test_tampered_token_is_rejected(self):
+        token = make_token(self.campaign_id, self.subscriber_id, 'https://ornek.com/')
+        # Son karakter yalnızca dolgu bitleri taşıyabilir, imzanın içinden bir karakter değiştirilir
+        for position in (0, len(token) // 2, len(token) - 2):
+            replacement = 'A' if token[position] != 'A' else 'B'
+            self.assertIsNone(read_token(token[:position] + replacement + token[position + 1:]))
+        self.assertIsNone(read_token(token[:-4]))
+        self.assertIsNone(read_token('geçersiz!'))
+
+
+def rewrite_tracking_links(content, subscriber_id, campaign_id, base_url='https://takip.example.com'):
+    """Şablon öncesi abone başına regex ile yeniden yazma (karşılaştırma için referans)"""
+    if not content:
+        return ''
+    open_token = make_token(campaign_id, subscriber_id)
+    open_img = (
+        f'<img src="{base_url}/track/open/{open_token}/" width="1" height="1" style="display:none;" alt="" />'
+    )
+
+    def add_click_tracking(match):
+        return f'href="{base_url}/track/click/{make_token(campaign_id, subscriber_id, match.group(1))}/"'
+
+    lowered = content.lower()
+    if '<html' in lowered or '<body' in lowered or '<div' in lowered:
+        content = re.sub(r'href="(https?://[^"]+)"', add_click_tracking, content, flags=re.IGNORECASE)
+        if '<body' in content:
+            content = re.sub(r'<body[^>]*>', lambda m: m.group(0) + open_img, content, flags=re.IGNORECASE)
+        else:
+            content += open_img
+    else:
+        content = f"<p>{content}</p>" + open_img
+    return content
+
+
+class TrackingTemplateTests(TestCase):
+    """Önceden derlenmiş şablon abone başına yeniden yazmayla bayt bayt aynı çıktı üretmeli"""
+    BASE_URL = 'https://takip.example.com'
+    CONTENTS = [
+        '<html><body class="ana" style="margin:0">'
+        '<a href="https://ornek.com/">Ana</a> '
+        '<a HREF="https://ornek.com/urun?id=5&amp;ref=mail#detay">Ürün</a> '
+        '<a href="mailto:destek@example.com">Destek</a> '
+        '<a href="http://ornek.com/ürün?q=çay">Çay</a>'
+        '</body></html>',
+        '<div><a href="https://ornek.com/a?x=1">A</a><a href="https://ornek.com/a?x=1">Tekrar</a></div>',
+        'Düz metin, bağlantı yok',
+        '',
+    ]
+
+    def test_render_matches_per_recipient_rewrite(self):
+        campaign_id = uuid.uuid4()
+        for content in self.CONTENTS:
+            template = TrackingTemplate(content, base_url=self.BASE_URL + '/')
+            # Aynı şablon farklı abonelerde tekrar kullanılır
+            for subscriber_id in (uuid.uuid4(), uuid.uuid4()):
+                with self.subTest(content=content[:30]):
+                    self.assertEqual(
+                        template.render(subscriber_id, campaign_id),
+                        rewrite_tracking_links(content, subscriber_id, campaign_id, self.BASE_URL)
+                    )
+
+    @override_settings(TRACKING_BASE_URL=BASE_URL)
+    def test_sender_reuses_compiled_template(self):
+        user = User.objects.create_user('sablon', password='x')
+        mail_list = MailList.objects.create(user=user, name='Liste')
+        campaign = Campaign.objects.create(
+            user=user, name='Kampanya', subject='Konu', content='Metin', html_content=self.CONTENTS[0]
+        )
+        sender = EmailSender()
+        for index in range(2):
+            subscriber = Subscriber.objects.create(mail_list=mail_list, email=f'sablon{index}@example.com')
+            message = sender.build_campaign_message(campaign, subscriber, campaign.content)
+            self.assertEqual(message['html'], rewrite_tracking_links(self.CONTENTS[0], subscriber.id, campaign.id))
+        self.assertEqual(list(sender.tracking_templates), [campaign.id])
+
+
+class TrackingFlushTests(TestCase):
+    """Tampondaki olaylar sayaçlara artış farkı olarak yazılmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('takip', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Liste')
+        cls.campaign = Campaign.objects.create(user=cls.user, name='Kampanya', subject='Konu', content='İçerik')
+        cls.first = Subscriber.objects.create(mail_list=cls.mail_list, email='ilk@example.com')
+        cls.second = Subscriber.objects.create(mail_list=cls.mail_list, email='ikinci@example.com')
+
+    def event(self, kind, subscriber_id, url=None):
+        return TrackingEvent(kind, self.campaign.id, subscriber_id, url, 'ua', '127.0.0.1', timezone.now())
+
+    def flush(self, events):
+        # record() arka plan iş parçacığı başlatır; test olayları doğrudan tampona koyar
+        buffer = TrackingBuffer()
+        buffer.events = events
+        buffer.flush()
+        return buffer
+
+    def test_flush_applies_counter_deltas(self):
+        self.flush([
+            self.event('open', self.first.id),
+            self.event('open', self.first.id),
+            self.event('open', self.second.id),
+            self.event('click', self.first.id, 'https://ornek.com/'),
+            self.event('click', self.first.id, 'https://ornek.com/'),
+        ])
+        self.campaign.refresh_from_db()
+        self.assertEqual(
+            (self.campaign.opens, self.campaign.unique_opens, self.campaign.clicks, self.campaign.unique_clicks),
+            (2, 2, 1, 1)
+        )
+        self.assertEqual(ClickTrack.objects.get().click_count, 2)
+        self.assertEqual(self.campaign.unique_estimates(), {'open': 2, 'click': 1})
+
+    def test_deleted_subscriber_does_not_block_flush(self):
+        deleted = Subscriber.objects.create(mail_list=self.mail_list, email='silinen@example.com')
+        deleted_id = deleted.id
+        deleted.delete()
+        buffer = self.flush([self.event('open', deleted_id), self.event('open', self.first.id)])
+        self.assertEqual(buffer.events, [])
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.unique_opens, 1)
+
+    @override_settings(TRACKING_MAX_RETRIES=2)
+    def test_failing_event_is_isolated_after_retries(self):
+        bad = self.event('open', self.second.id)
+
+        def failing_apply(events):
+            if bad in events:
+                raise ValueError('yazılamadı')
+            apply_events(events)
+
+        buffer = TrackingBuffer()
+        buffer.events = [bad, self.event('open', self.first.id)]
+        with mock.patch('otomasyon.tracking.apply_events', failing_apply):
+            with self.assertRaises(ValueError):
+                buffer.flush()
+            self.assertEqual(len(buffer.events), 2)
+            # Son denemede olaylar tek tek yazılır, bozuk olan atlanır
+            self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(buffer.events, [])
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.unique_opens, 1)
+
+
+class CampaignCounterTests(TestCase):
+    """Bellekteki eski nesnenin kaydı eşzamanlı sayaç artışlarını ezmemeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('kampanya', password='x')
+        cls.campaign = Campaign.objects.create(user=cls.user, name='Kampanya', subject='Konu', content='İçerik')
+        mail_list = MailList.objects.create(user=cls.user, name='Liste')
+        cls.automation = Automation.objects.create(user=cls.user, name='Otomasyon', mail_list=mail_list)
+
+    def test_stale_save_keeps_counters(self):
+        stale = Campaign.objects.get(pk=self.campaign.pk)
+        Campaign.increment_counters(self.campaign.pk, total_sent=5, opens=3, clicks=1)
+        stale.name = 'Yeni Ad'
+        stale.save()
+        campaign = Campaign.objects.get(pk=self.campaign.pk)
+        self.assertEqual(campaign.name, 'Yeni Ad')
+        self.assertEqual((campaign.total_sent, campaign.opens, campaign.clicks), (5, 3, 1))
+
+    def test_stale_automation_toggle_keeps_counters(self):
+        stale = Automation.objects.get(pk=self.automation.pk)
+        Automation.increment_counters(self.automation.pk, total_triggered=2, total_sent=2)
+        stale.is_active = not stale.is_active
+        stale.save()
+        automation = Automation.objects.get(pk=self.automation.pk)
+        self.assertEqual(automation.is_active, stale.is_active)
+        self.assertEqual((automation.total_triggered, automation.total_sent), (2, 2))
+
+
+class SubscriberCounterTests(TestCase):
+    """Liste sayaçları her abone değişikliğinde gerçek sayımla aynı kalmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('sayac', password='x')
+        cls.first_list = MailList.objects.create(user=cls.user, name='Birinci')
+        cls.second_list = MailList.objects.create(user=cls.user, name='İkinci')
+
+    def assertCounts(self, mail_list, active, unsubscribed):
+        counters = MailList.objects.values_list('subscriber_count', 'unsubscribed_count').get(pk=mail_list.pk)
+        self.assertEqual(counters, (active, unsubscribed))
+        # Artımlı sayaçlar baştan sayımla aynı olmalı
+        mail_list.update_counts()
+        self.assertEqual((mail_list.subscriber_count, mail_list.unsubscribed_count), counters)
+
+    def test_insert_unsubscribe_move_delete(self):
+        subscribers = [
+            Subscriber.objects.create(mail_list=self.first_list, email=f'sayac{i}@example.com')
+            for i in range(3)
+        ]
+        self.assertCounts(self.first_list, 3, 0)
+
+        subscribers[0].unsubscribe()
+        self.assertCounts(self.first_list, 2, 1)
+
+        # Veritabanından okunan abone başka listeye taşınır
+        moved = Subscriber.objects.get(pk=subscribers[1].pk)
+        moved.mail_list = self.second_list
+        moved.save()
+        self.assertCounts(self.first_list, 1, 1)
+        self.assertCounts(self.second_list, 1, 0)
+
+        Subscriber.objects.get(pk=subscribers[0].pk).delete()
+        moved.delete()
+        self.assertCounts(self.first_list, 1, 0)
+        self.assertCounts(self.second_list, 0, 0)
+
+
+class ReconcileCountsTests(TestCase):
+    """reconcile_counts bozulan sayaçları gerçek sayılarla değiştirmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('mutabakat', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Liste')
+        cls.empty_list = MailList.objects.create(user=cls.user, name='Boş')
+        cls.campaign = Campaign.objects.create(user=cls.user, name='Kampanya', subject='Konu', content='İçerik')
+        cls.draft = Campaign.objects.create(user=cls.user, name='Taslak', subject='Konu', content='İçerik')
+        now = timezone.now()
+        subscribers = [
+            Subscriber.objects.create(mail_list=cls.mail_list, email=f'mutabakat{i}@example.com')
+            for i in range(3)
+        ]
+        subscribers[2].unsubscribe()
+        for subscriber, status, opened_at, clicked_at in (
+            (subscribers[0], 'sent', now, now),
+            (subscribers[1], 'sent', now, None),
+            (subscribers[2], 'bounced', None, None),
+        ):
+            EmailLog.objects.create(
+                campaign=cls.campaign, subscriber=subscriber, status=status,
+                opened_at=opened_at, clicked_at=clicked_at
+            )
+
+    def corrupt(self):
+        MailList.objects.update(subscriber_count=99, unsubscribed_count=7)
+        Campaign.objects.update(total_sent=50, bounces=9, unique_opens=40, unique_clicks=30)
+
+    def reconcile(self, **options):
+        call_command('reconcile_counts', stdout=io.StringIO(), **options)
+
+    def campaign_counts(self, campaign):
+        return Campaign.objects.values_list('total_sent', 'bounces', 'unique_opens', 'unique_clicks').get(pk=campaign.pk)
+
+    def test_restores_exact_counts(self):
+        self.corrupt()
+        self.reconcile()
+        self.assertEqual(
+            MailList.objects.values_list('subscriber_count', 'unsubscribed_count').get(pk=self.mail_list.pk), (2, 1)
+        )
+        self.assertEqual(
+            MailList.objects.values_list('subscriber_count', 'unsubscribed_count').get(pk=self.empty_list.pk), (0, 0)
+        )
+        self.assertEqual(self.campaign_counts(self.campaign), (2, 1, 2, 1))
+        self.assertEqual(self.campaign_counts(self.draft), (0, 0, 0, 0))
+
+    def test_list_option_leaves_campaigns(self):
+        self.corrupt()
+        self.reconcile(list_id=str(self.mail_list.id))
+        self.assertEqual(MailList.objects.get(pk=self.mail_list.pk).subscriber_count, 2)
+        self.assertEqual(MailList.objects.get(pk=self.empty_list.pk).subscriber_count, 99)
+        self.assertEqual(self.campaign_counts(self.campaign), (50, 9, 40, 30))
+
+
+class SubscriberImportTests(TestCase):
+    """İçe aktarma tekrarları atlamalı, geçersizleri saymalı ve sayaçları doğru bırakmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('aktarici', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='İçe Aktarma')
+        Subscriber.objects.create(mail_list=cls.mail_list, email='mevcut@example.com')
+
+    def test_chunks_dedupe_and_count_invalid(self):
+        upload = io.BytesIO((
+            'Ad,E-posta\n'
+            'Ali,ali@example.com\n'
+            'Mevcut,mevcut@example.com\n'
+            'Ali Tekrar,ali@example.com\n'
+            'Bozuk,adres-degil\n'
+            'Eksik,\n'
+            'Ayşe,ayse@example.com\n'
+            'Ali Yine,ali@example.com\n'
+        ).encode('utf-8'))
+        rows = iter_csv_rows(upload, email_column='e-posta', name_column='ad')
+        # Parça boyutu 3: tekrarlar hem aynı parçada hem sonraki parçalarda yakalanmalı
+        stats = import_rows(self.mail_list, rows, chunk_size=3)
+        self.assertEqual(stats.as_dict(), {'processed': 7, 'inserted': 2, 'skipped': 3, 'invalid': 2})
+        self.assertEqual(
+            dict(self.mail_list.subscribers.values_list('email', 'name')),
+            {'mevcut@example.com': '', 'ali@example.com': 'Ali', 'ayse@example.com': 'Ayşe'}
+        )
+        self.mail_list.refresh_from_db()
+        self.assertEqual(self.mail_list.subscriber_count, 3)
+
+    def test_rows_lost_to_concurrent_insert_are_skipped(self):
+        bulk_create = Subscriber.objects.bulk_create
+
+        def concurrent_bulk_create(subscribers, **kwargs):
+            # Başka bir içe aktarma aynı e-postayı kontrol ile ekleme arasında yazar
+            Subscriber.objects.create(mail_list=self.mail_list, email='yaris@example.com')
+            return bulk_create(subscribers, **kwargs)
+
+        rows = [('yaris@example.com', 'Yarış'), ('yeni@example.com', 'Yeni')]
+        with mock.patch.object(Subscriber.objects, 'bulk_create', concurrent_bulk_create):
+            stats = import_rows(self.mail_list, iter(rows))
+        self.assertEqual(stats.as_dict(), {'processed': 2, 'inserted': 1, 'skipped': 1, 'invalid': 0})
+        self.assertEqual(self.mail_list.subscribers.get(email='yaris@example.com').name, '')
+
+    def test_blank_spreadsheet_rows_are_ignored(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['email', 'name'])
+        sheet.append(['xlsx@example.com', 'Tablo'])
+        # Aradaki boş ve yalnızca biçimlendirilmiş satırlar
+        sheet.cell(row=4, column=2).number_format = '0.00'
+        sheet.append(['   ', None])
+        sheet.append(['ikinci@example.com', None])
+        upload = io.BytesIO()
+        workbook.save(upload)
+        upload.seek(0)
+
+        stats = import_rows(self.mail_list, iter_xlsx_rows(upload))
+        self.assertEqual(stats.as_dict(), {'processed': 2, 'inserted': 2, 'skipped': 0, 'invalid': 0})
+
+class ImportJobTests(TestCase):
+    """Yükleme iş kaydı oluşturmalı; iş ilerlemesi JSON ile izlenmeli ve çöken iş devralınmalı"""
+    CSV = b'email,name\nis1@example.com,Bir\nis2@example.com,Iki\nbozuk\n'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('isler', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Liste')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client.force_login(self.user)
+
+    def progress(self, job):
+        response = self.client.get(reverse('import_job_progress', args=[job.id]))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_upload_creates_job_and_reports_progress(self):
+        # İş parçacığı başlatılmaz; iş aynı işçi yoluyla burada çalıştırılır
+        with mock.patch('otomasyon.importers.start_import_job_async') as start:
+            response = self.client.post(
+                reverse('import_subscribers', args=[self.mail_list.id]),
+                {
+                    'csv_file': SimpleUploadedFile('aboneler.csv', self.CSV, content_type='text/csv'),
+                    'has_headers': 'on',
+                    'email_column': 'email',
+                    'name_column': 'name',
+                },
+                HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+            )
+        job = ImportJob.objects.get()
+        start.assert_called_once_with(job.id)
+        self.assertEqual(response.json(), {
+            'job_id': str(job.id),
+            'progress_url': reverse('import_job_progress', args=[job.id]),
+        })
+        self.assertEqual(self.progress(job)['status'], 'pending')
+
+        self.assertEqual(process_import_jobs(worker_id='isci-1', job_id=job.id), 1)
+        payload = self.progress(job)
+        self.assertEqual(
+            {key: payload[key] for key in ('status', 'processed', 'inserted', 'skipped', 'invalid', 'error')},
+            {'status': 'completed', 'processed': 3, 'inserted': 2, 'skipped': 0, 'invalid': 1, 'error': ''}
+        )
+        self.assertIsNotNone(payload['finished_at'])
+
+    def test_other_users_job_is_hidden(self):
+        other = User.objects.create_user('baskasi', password='x')
+        job = ImportJob.objects.create(user=other, mail_list=self.mail_list, file=ContentFile(self.CSV, 'a.csv'))
+        self.assertEqual(self.client.get(reverse('import_job_progress', args=[job.id])).status_code, 404)
+
+    def test_stale_running_job_is_reclaimed(self):
+        job = ImportJob.objects.create(
+            user=self.user, mail_list=self.mail_list, file=ContentFile(self.CSV, 'aboneler.csv'),
+            status='running', claimed_by='coken-isci'
+        )
+        # Kira süresi içindeki iş başka işçiye verilmez
+        self.assertEqual(process_import_jobs(worker_id='isci-2'), 0)
+        ImportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+
+        self.assertEqual(process_import_jobs(worker_id='isci-2'), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.claimed_by, job.inserted), ('completed', 'isci-2', 2))
+        self.assertEqual(self.mail_list.subscribers.count(), 2)
+
+
+class SubscriberExportTests(TestCase):
+    """Abone dışa aktarma akış halinde CSV (ve istenirse gzip) üretmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('disari', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Bülten')
+        for email, name in (('a@example.com', 'Ayşe Öz'), ('b@example.com', 'Soyad, Ad'), ('c@example.com', '')):
+            Subscriber.objects.create(mail_list=cls.mail_list, email=email, name=name, company='Şirket')
+        Subscriber.objects.create(mail_list=cls.mail_list, email='cikan@example.com', is_active=False)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def export(self, **params):
+        response = self.client.get(reverse('export_subscribers', args=[self.mail_list.id]), params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_streams_active_subscribers(self):
+        response, content = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="Bülten_aboneler.csv"')
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8'))))
+        self.assertEqual(rows[0], ['Email', 'Ad Soyad', 'Telefon', 'Şirket', 'Abonelik Tarihi'])
+        today = timezone.now().strftime('%d.%m.%Y')
+        self.assertEqual(sorted(rows[1:]), [
+            ['a@example.com', 'Ayşe Öz', '', 'Şirket', today],
+            ['b@example.com', 'Soyad, Ad', '', 'Şirket', today],
+            ['c@example.com', '', '', 'Şirket', today],
+        ])
+
+    def test_gzip_decodes_to_same_csv(self):
+        _, plain = self.export()
+        response, compressed = self.export(gzip='1')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertTrue(response['Content-Disposition'].endswith('.csv.gz"'))
+        self.assertEqual(sorted(gzip.decompress(compressed).splitlines()), sorted(plain.splitlines()))
+
+
+class EngagementExportTests(TestCase):
+    """Keyset sayfalama aynı created_at değerini paylaşan satırları sayfa sınırında atlamamalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('etkilesim', password='x')
+        mail_list = MailList.objects.create(user=cls.user, name='Liste')
+        cls.campaign = Campaign.objects.create(user=cls.user, name='Kampanya', subject='Konu', content='İçerik')
+        base = timezone.now().replace(microsecond=0)
+        # 3 + 3 + 1 satır: 2'lik sayfalarda eşit zaman damgaları sayfa sınırına denk gelir
+        for i, offset in enumerate((0, 0, 0, 1, 1, 1, 2)):
+            subscriber = Subscriber.objects.create(mail_list=mail_list, email=f'log{i}@example.com')
+            log = EmailLog.objects.create(campaign=cls.campaign, subscriber=subscriber, status='sent')
+            EmailLog.objects.filter(pk=log.pk).update(created_at=base + datetime.timedelta(seconds=offset))
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_shared_timestamps_across_pages(self):
+        rows = list(iter_keyset(EmailLog.objects.all(), ['id', 'created_at'], batch_size=2))
+        ids = [row['id'] for row in rows]
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(set(ids), set(EmailLog.objects.values_list('id', flat=True)))
+        self.assertEqual(
+            [(row['created_at'], row['id']) for row in rows],
+            sorted((row['created_at'], row['id']) for row in rows)
+        )
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_api_streams_every_row_once(self):
+        response = self.client.get(reverse('api_export_engagement'), {'type': 'logs'})
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        ids = [json.loads(line)['id'] for line in lines]
+        self.assertEqual(sorted(ids), sorted(str(pk) for pk in EmailLog.objects.values_list('id', flat=True)))
+
+    def test_bad_parameters_return_400(self):
+        url = reverse('api_export_engagement')
+        for params in ({'since': 'dün'}, {'until': '2024-13-40'}, {'type': 'bilinmeyen'}, {'campaign': 'x'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+
+class FakeEmailSender:
+    """Resend yerine gönderimleri ve idempotency anahtarlarını kaydeden gönderici"""
+    from_email = 'test@example.com'
+
+    def __init__(self):
+        self.sent = []
+        self.keys = []
+
+    def send_campaign_email(self, campaign, subscriber, email_content, idempotency_key=None):
+        self.sent.append(subscriber.id)
+        self.keys.append(idempotency_key)
+        return True, 'ok'
+
+    def send_campaign_batch(self, campaign, subscribers, email_content, idempotency_key=None):
+        self.sent.extend(subscriber.id for subscriber in subscribers)
+        self.keys.append(idempotency_key)
+        return [(True, 'ok')] * len(subscribers)
+
+
+class OutboxTests(TestCase):
+    """Outbox mesajları tek işçiye verilmeli ve çöken gönderim kaldığı yerden sürmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('gonderici', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Liste')
+        cls.campaign = Campaign.objects.create(
+            user=cls.user, name='Kampanya', subject='Konu', content='İçerik', status='sending'
+        )
+        cls.campaign.mail_lists.add(cls.mail_list)
+        for i in range(4):
+            Subscriber.objects.create(mail_list=cls.mail_list, email=f'outbox{i}@example.com')
+
+    def setUp(self):
+        enqueue_campaign(self.campaign)
+
+    def expire_claims(self):
+        OutboxMessage.objects.update(claimed_at=timezone.now() - datetime.timedelta(hours=1))
+        release_stale_claims()
+
+    def test_workers_never_share_messages(self):
+        first = claim_outbox_batch('isci-1', limit=2)
+        second = claim_outbox_batch('isci-2')
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 2)
+        self.assertFalse({message.id for message in first} & {message.id for message in second})
+        self.assertEqual(claim_outbox_batch('isci-3'), [])
+
+    @override_settings(EMAIL_SEND_RATE_LIMIT=0)
+    def test_released_lease_is_sent_once(self):
+        # İşçi iki mesajı gönderip kaydettikten sonra çöker
+        claimed = claim_outbox_batch('isci-1')
+        OutboxMessage.objects.filter(id__in=[message.id for message in claimed[:2]]).update(status='sent')
+        self.expire_claims()
+
+        sender = FakeEmailSender()
+        self.assertEqual(drain_outbox(worker_id='isci-2', email_sender=sender), 2)
+        self.assertEqual(drain_outbox(worker_id='isci-3', email_sender=sender), 0)
+        self.assertEqual(sorted(sender.sent), sorted(message.subscriber_id for message in claimed[2:]))
+        self.assertFalse(OutboxMessage.objects.exclude(status='sent').exists())
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.status, self.campaign.total_sent), ('sent', 2))
+
+    def test_reclaimed_batches_keep_their_keys(self):
+        engine = CampaignSendEngine(FakeEmailSender(), transport='batch', batch_size=2, rate_limit=0)
+        messages = claim_outbox_batch('isci-1')
+        keys = {engine._idempotency_key(self.campaign, group) for group in engine._groups(self.campaign, messages)}
+        # Gönderim sonrası çöken işçinin mesajları farklı boyutlu sahiplenmelerle geri alınır
+        self.expire_claims()
+        reclaimed = claim_outbox_batch('isci-2', limit=1)
+        self.assertEqual(len(reclaimed), 2)
+        reclaimed += claim_outbox_batch('isci-2')
+        self.assertEqual(
+            {engine._idempotency_key(self.campaign, group) for group in engine._groups(self.campaign, reclaimed)},
+            keys
+        )
+
+    def test_batch_errors_fail_only_their_messages(self):
+        sender = EmailSender()
+        engine = CampaignSendEngine(sender, transport='batch', batch_size=4, concurrency=1, rate_limit=0)
+        response = {'data': [{'id': 'e1'}, {'id': 'e3'}, {'id': 'e4'}], 'errors': [{'index': 1, 'message': 'Geçersiz alıcı'}]}
+
+        with mock.patch('otomasyon.email_backend.resend.Batch.send', return_value=response) as batch_send, \
+                contextlib.redirect_stdout(io.StringIO()):
+            # İlk işçi istek yanıtlandıktan sonra, sonuçları yazamadan çöker
+            with mock.patch.object(CampaignSendEngine, '_flush_records'):
+                engine.run(self.campaign, claim_outbox_batch('isci-1'))
+            self.expire_claims()
+            engine.run(self.campaign, claim_outbox_batch('isci-2'))
+
+        self.assertEqual(batch_send.call_count, 2)
+        (first_messages, first_options), (retry_messages, retry_options) = [call.args for call in batch_send.call_args_list]
+        batch_key = OutboxMessage.objects.values_list('batch_key', flat=True).distinct().get()
+        self.assertEqual(first_options['idempotency_key'], f"batch_{self.campaign.id}_{batch_key}")
+        self.assertEqual(retry_options, first_options)
+        self.assertEqual([message['to'] for message in retry_messages], [message['to'] for message in first_messages])
+
+        # Sadece hatalı sıradaki mesaj başarısız sayılır
+        statuses = dict(OutboxMessage.objects.values_list('subscriber__email', 'status'))
+        failed_email = retry_messages[1]['to']
+        self.assertEqual(statuses.pop(failed_email), 'failed')
+        self.assertEqual(set(statuses.values()), {'sent'})
+        self.assertIn('Geçersiz alıcı', OutboxMessage.objects.get(subscriber__email=failed_email).error)
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.total_sent, self.campaign.bounces), (3, 1))
+
+class ThreadRecordingSender(FakeEmailSender):
+    """Gönderimi yapan iş parçacıklarını da kaydeden sahte gönderici"""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def send_campaign_email(self, campaign, subscriber, email_content, idempotency_key=None):
+        self.threads.add(threading.get_ident())
+        # İş parçacıklarının kuyruğu paylaşması için kısa bir ağ beklemesi
+        time.sleep(0.001)
+        return super().send_campaign_email(campaign, subscriber, email_content, idempotency_key)
+
+    def send_campaign_batch(self, campaign, subscribers, email_content, idempotency_key=None):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.001)
+        return super().send_campaign_batch(campaign, subscribers, email_content, idempotency_key)
+
+
+class SendEngineTests(TestCase):
+    """Havuzdaki iş parçacıkları her aboneye tam olarak bir kez göndermeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('havuz', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Liste')
+        cls.campaign = Campaign.objects.create(
+            user=cls.user, name='Kampanya', subject='Konu', content='İçerik', status='sending'
+        )
+        cls.campaign.mail_lists.add(cls.mail_list)
+        Subscriber.objects.bulk_create([
+            Subscriber(mail_list=cls.mail_list, email=f'havuz{i}@example.com') for i in range(40)
+        ])
+        cls.subscriber_ids = sorted(Subscriber.objects.values_list('id', flat=True))
+
+    def setUp(self):
+        enqueue_campaign(self.campaign)
+
+    def run_engine(self, **options):
+        sender = ThreadRecordingSender()
+        engine = CampaignSendEngine(sender, concurrency=4, rate_limit=0, **options)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sent, failed = engine.run(self.campaign, claim_outbox_batch('isci-1'))
+        self.assertEqual((sent, failed), (40, 0))
+        self.assertEqual(sorted(sender.sent), self.subscriber_ids)
+        self.assertGreater(len(sender.threads), 1)
+        self.assertFalse(OutboxMessage.objects.exclude(status='sent').exists())
+        self.assertEqual(EmailLog.objects.filter(campaign=self.campaign).count(), 40)
+        self.assertEqual(Campaign.objects.get(pk=self.campaign.pk).total_sent, 40)
+        return sender
+
+    def test_single_transport_sends_each_subscriber_once(self):
+        sender = self.run_engine(transport='single')
+        self.assertEqual(len(set(sender.keys)), 40)
+
+    def test_batch_transport_sends_each_subscriber_once(self):
+        sender = self.run_engine(transport='batch', batch_size=3)
+        self.assertEqual(len(sender.keys), 14)
+
+
+class HyperLogLogTests(TestCase):
+    """Taslak tahminleri p=14 için yaklaşık %1 hata içinde kalmalı"""
+
+    def test_estimate_error(self):
+        for size in (100, 10000, 100000):
+            sketch = HyperLogLog()
+            sketch.update(f'abone-{i}' for i in range(size))
+            self.assertLess(abs(sketch.count() - size) / size, 0.025)
+
+    def test_merge_is_union(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        first.update(range(0, 30000))
+        second.update(range(20000, 50000))
+        merged = HyperLogLog.union([first, second])
+        self.assertLess(abs(merged.count() - 50000) / 50000, 0.025)
+        self.assertEqual(HyperLogLog.from_bytes(merged.to_bytes()).registers, merged.registers)
+
+
+class CampaignSchedulerTests(TestCase):
+    """Zamanı gelen kampanya bir kez ve scheduled_time sırasıyla alınmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('planlayici', password='x')
+        now = timezone.now()
+        cls.later = Campaign.objects.create(
+            user=cls.user, name='Sonra', subject='Konu', content='İçerik',
+            status='scheduled', scheduled_time=now + datetime.timedelta(seconds=30)
+        )
+        cls.due = Campaign.objects.create(
+            user=cls.user, name='Şimdi', subject='Konu', content='İçerik',
+            status='scheduled', scheduled_time=now - datetime.timedelta(seconds=1)
+        )
+
+    def test_claim_only_once(self):
+        self.assertIsNotNone(claim_scheduled_campaign(self.due.id))
+        self.assertIsNone(claim_scheduled_campaign(self.due.id))
+        self.assertIsNone(claim_scheduled_campaign(self.later.id))
+        self.due.refresh_from_db()
+        self.assertEqual(self.due.status, 'sending')
+
+    def test_heap_wakes_in_order(self):
+        dispatched = []
+        scheduler = CampaignScheduler(dispatch=dispatched.append, poll_interval=60, lookahead=60)
+        now = timezone.now()
+        scheduler.run_once(now)
+        self.assertEqual(dispatched, [self.due.id])
+        self.assertLessEqual(scheduler.seconds_until_next(now), 30)
+        scheduler.run_once(now + datetime.timedelta(seconds=31))
+        self.assertEqual(dispatched, [self.due.id, self.later.id])
+
+
+class JourneyTests(TestCase):
+    """Akışlar yalnızca zamanı geldiğinde ve bir kez sahiplenilmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('otomasyon', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Hoş Geldin')
+        cls.automation = Automation.objects.create(user=cls.user, name='Drip', mail_list=cls.mail_list)
+        campaign = Campaign.objects.create(user=cls.user, name='Adım', subject='Konu', content='İçerik')
+        cls.step = AutomationStep.objects.create(automation=cls.automation, campaign=campaign, delay_days=1)
+        cls.subscribers = [
+            Subscriber.objects.create(mail_list=cls.mail_list, email=f'akis{i}@example.com')
+            for i in range(3)
+        ]
+
+    def test_start_is_idempotent(self):
+        ids = [subscriber.id for subscriber in self.subscribers]
+        self.assertEqual(start_journeys(self.automation, ids), 3)
+        self.assertEqual(start_journeys(self.automation, ids), 0)
+        self.automation.refresh_from_db()
+        self.assertEqual(self.automation.total_triggered, 3)
+
+    def test_claims_only_due_journeys(self):
+        start_journeys(self.automation, [subscriber.id for subscriber in self.subscribers])
+        self.assertEqual(claim_due_journeys('isci-1'), [])
+        tomorrow = timezone.now() + datetime.timedelta(days=1, minutes=1)
+        claimed = claim_due_journeys('isci-1', now=tomorrow)
+        self.assertEqual(len(claimed), 3)
+        self.assertEqual(claim_due_journeys('isci-2', now=tomorrow), [])
+        self.assertEqual(JourneyState.objects.filter(status='running', claimed_by='isci-1').count(), 3)
+
+
+class SubscriptionTriggerTests(TestCase):
+    """Abonelik tetikleyicisi her kayıtta otomasyon tablosunu sorgulamamalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tetikleyici', password='x')
+        cls.mail_list = MailList.objects.create(user=cls.user, name='Karşılama')
+        cls.other_list = MailList.objects.create(user=cls.user, name='Diğer')
+        cls.automation = Automation.objects.create(
+            user=cls.user, name='Hoş Geldin', mail_list=cls.mail_list, trigger_type='subscription'
+        )
+        campaign = Campaign.objects.create(user=cls.user, name='Karşılama', subject='Konu', content='İçerik')
+        cls.step = AutomationStep.objects.create(automation=cls.automation, campaign=campaign)
+
+    def setUp(self):
+        subscription_triggers.invalidate()
+        webhook_events.invalidate()
+
+    def test_new_subscriber_starts_journey(self):
+        subscriber = Subscriber.objects.create(mail_list=self.mail_list, email='yeni@example.com')
+        journey = JourneyState.objects.get(subscriber=subscriber)
+        self.assertEqual(journey.automation_id, self.automation.id)
+        self.assertEqual(journey.next_step_id, self.step.id)
+
+    def test_warm_index_costs_no_queries(self):
+        subscription_triggers.get(self.other_list.id)
+        webhook_events.has(self.user.id, 'subscription')
+        with CaptureQueriesContext(connection) as queries:
+            Subscriber.objects.create(mail_list=self.other_list, email='diger@example.com')
+            Subscriber.objects.create(mail_list=self.mail_list, email='yeni@example.com')
+        self.assertFalse([
+            q for q in queries
+            if 'otomasyon_automationstep' in q['sql'] or 'otomasyon_webhook' in q['sql']
+        ])
+        self.assertEqual(JourneyState.objects.count(), 1)
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = ''
+
+
+class FakeSession:
+    """İstekleri kaydeden ve sabit durum kodu döndüren oturum"""
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.requests = []
+
+    def post(self, url, data, headers, timeout):
+        self.requests.append((url, data, headers))
+        return FakeResponse(self.status_code)
+
+
+class WebhookDeliveryTests(TestCase):
+    """Webhook'lar kuyruğa alınmalı, imzalı gönderilmeli ve hata halinde geri çekilmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('entegrasyon', password='x')
+        cls.webhook = Webhook.objects.create(
+            user=cls.user, name='CRM', url='http://crm.example.com/hook',
+            event_type='subscription', secret_key='gizli'
+        )
+
+    def setUp(self):
+        # Webhook önbelleği commit sonrasında temizlenir; test transaction'ı commit edilmez
+        webhook_events.invalidate()
+
+    def test_test_webhook_enqueues_signed_delivery(self):
+        self.client.force_login(self.user)
+        # Bağlantı ön yüklemesi ya da tarayıcı GET isteği olay oluşturmaz
+        self.assertEqual(self.client.get(reverse('test_webhook', args=[self.webhook.id])).status_code, 405)
+        self.assertFalse(WebhookDelivery.objects.exists())
+        self.client.post(reverse('test_webhook', args=[self.webhook.id]))
+        session = FakeSession()
+        self.assertEqual(drain_webhooks('isci', session=session), 1)
+        url, body, headers = session.requests[0]
+        self.assertEqual(url, self.webhook.url)
+        self.assertEqual(
+            headers['X-Webhook-Signature'],
+            sign_payload('gizli', headers['X-Webhook-Timestamp'], body)
+        )
+        self.assertEqual(WebhookDelivery.objects.get().status, 'delivered')
+
+    def test_webhook_list_posts_test_button(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('webhooks'))
+        self.assertContains(
+            response, f'<form method="post" action="{reverse("test_webhook", args=[self.webhook.id])}"'
+        )
+
+    def test_duplicate_events_coalesce(self):
+        enqueue_event(self.user.id, 'subscription', {'email': 'a@example.com'}, coalesce_key='abone-1')
+        enqueue_event(self.user.id, 'subscription', {'email': 'a@example.com'}, coalesce_key='abone-1')
+        self.assertEqual(WebhookDelivery.objects.count(), 1)
+
+    def test_webhook_save_refreshes_event_index(self):
+        self.assertFalse(webhook_events.has(self.user.id, 'unsubscription'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Webhook.objects.create(
+                user=self.user, name='Çıkış', url='http://crm.example.com/cikis', event_type='unsubscription'
+            )
+        self.assertEqual(enqueue_event(self.user.id, 'unsubscription', {'email': 'a@example.com'}), 1)
+
+    def test_import_enqueues_subscription_webhooks(self):
+        mail_list = MailList.objects.create(user=self.user, name='Aktarılan')
+        import_rows(mail_list, [('bir@example.com', 'Bir'), ('iki@example.com', 'İki')])
+        deliveries = WebhookDelivery.objects.filter(event_type='subscription')
+        self.assertEqual(
+            sorted(delivery.payload['data']['email'] for delivery in deliveries),
+            ['bir@example.com', 'iki@example.com']
+        )
+
+    def test_failure_backs_off(self):
+        enqueue_event(self.user.id, 'subscription', {'email': 'a@example.com'}, coalesce_key='abone-1')
+        self.assertEqual(drain_webhooks('isci', session=FakeSession(503)), 1)
+        delivery = WebhookDelivery.objects.get()
+        self.assertEqual((delivery.status, delivery.attempts), ('pending', 1))
+        self.assertGreater(delivery.next_attempt_at, timezone.now())
+        # Geri çekilme süresi dolmadan tekrar gönderilmez
+        self.assertEqual(drain_webhooks('isci', session=FakeSession()), 0)
+
+
+class StubReceiver(http.server.BaseHTTPRequestHandler):
+    """Gelen webhook gövdelerini kaydeden yerel alıcı (keep-alive destekli)"""
+    protocol_version = 'HTTP/1.1'
+    bodies = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.bodies.append(json.loads(body))
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class BatchedWebhookTests(TestCase):
+    """Toplu gönderimli webhook'lar olayları batch_size'lık JSON dizileriyle göndermeli"""
+
+    @classmethod
+    def setUpClass(cls):
+        # setUpTestData alıcının portunu kullandığı için sunucu önce başlatılır
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StubReceiver)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('toplu', password='x')
+        cls.campaign = Campaign.objects.create(user=cls.user, name='Kampanya', subject='Konu', content='İçerik')
+        cls.webhook = Webhook.objects.create(
+            user=cls.user, name='Analitik', event_type='email_opened',
+            url=f'http://127.0.0.1:{cls.server.server_port}/hook',
+            batch_size=100, batch_interval_ms=60000
+        )
+
+    def setUp(self):
+        StubReceiver.bodies = []
+        webhook_events.invalidate()
+
+    def enqueue_opens(self, count):
+        enqueue_campaign_events([
+            ('email_opened', self.campaign.id, f'acilma-{i}', {'subscriber': i})
+            for i in range(count)
+        ])
+
+    def test_full_batches_are_sent_as_arrays(self):
+        self.enqueue_opens(1000)
+        self.assertEqual(drain_webhooks('isci'), 1000)
+        self.assertEqual(len(StubReceiver.bodies), 10)
+        self.assertTrue(all(isinstance(body, list) and len(body) == 100 for body in StubReceiver.bodies))
+        self.assertEqual(WebhookDelivery.objects.filter(status='delivered').count(), 1000)
+
+    @override_settings(WEBHOOK_CLAIM_SIZE=200)
+    def test_batches_larger_than_claim_size_stay_whole(self):
+        Webhook.objects.filter(pk=self.webhook.pk).update(batch_size=1000)
+        self.enqueue_opens(1200)
+        self.assertEqual(drain_webhooks('isci'), 1000)
+        self.assertEqual([len(body) for body in StubReceiver.bodies], [1000])
+        self.assertEqual(WebhookDelivery.objects.filter(status='pending').count(), 200)
+
+    def test_partial_batch_waits_for_interval(self):
+        self.enqueue_opens(5)
+        self.assertEqual(drain_webhooks('isci'), 0)
+        # En eski olayın aralığı dolunca bekleyenlerin tümü tek dizide gider
+        oldest = WebhookDelivery.objects.order_by('next_attempt_at').first()
+        WebhookDelivery.objects.filter(pk=oldest.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(drain_webhooks('isci'), 5)
+        self.assertEqual([len(body) for body in StubReceiver.bodies], [5])
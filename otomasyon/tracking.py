@@ -0,0 +1,333 @@
+# otomasyon/tracking.py
+import atexit
+import base64
+import binascii
+import threading
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .dashboard_cache import invalidate_campaign_dashboards
+from .models import Campaign, ClickTrack, EmailLog, EngagementSketch, Subscriber
+from .webhooks import enqueue_campaign_events
+
+TOKEN_SALT = 'otomasyon.tracking'
+SIGNATURE_LENGTH = 12
+
+TrackingIdentity = namedtuple('TrackingIdentity', ['campaign_id', 'subscriber_id', 'url'])
+TrackingEvent = namedtuple(
+    'TrackingEvent',
+    ['kind', 'campaign_id', 'subscriber_id', 'url', 'user_agent', 'ip_address', 'timestamp']
+)
+
+def _sign(payload):
+    return salted_hmac(TOKEN_SALT, payload, algorithm='sha256').digest()[:SIGNATURE_LENGTH]
+
+def make_token(campaign_id, subscriber_id, url=None):
+    """Kampanya, abone ve hedef URL'yi taşıyan imzalı kısa token üret"""
+    payload = uuid.UUID(str(campaign_id)).bytes + uuid.UUID(str(subscriber_id)).bytes
+    if url:
+        payload += url.encode('utf-8')
+    return base64.urlsafe_b64encode(payload + _sign(payload)).rstrip(b'=').decode('ascii')
+
+def read_token(token):
+    """Token'ı doğrula ve çöz; geçersizse None döndür"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if len(raw) < 32 + SIGNATURE_LENGTH:
+        return None
+    
+    payload, signature = raw[:-SIGNATURE_LENGTH], raw[-SIGNATURE_LENGTH:]
+    if not constant_time_compare(signature, _sign(payload)):
+        return None
+    
+    try:
+        url = payload[32:].decode('utf-8') or None
+    except UnicodeDecodeError:
+        return None
+    return TrackingIdentity(uuid.UUID(bytes=payload[:16]), uuid.UUID(bytes=payload[16:32]), url)
+
+class TrackingBuffer:
+    """Açılma/tıklanma olaylarını bellekte biriktirip toplu yazan write-behind tampon
+    
+    Olaylar istek içinde sadece listeye eklenir; arka plan iş parçacığı
+    TRACKING_FLUSH_INTERVAL saniyede bir (veya tampon dolunca) tümünü tek
+    transaction içinde veritabanına yazar. Kampanya sayaçları saniyeler
+    içinde tutarlı hale gelir.
+    """
+    def __init__(self):
+        self.events = []
+        self.failures = 0
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+    
+    def record(self, event):
+        with self.lock:
+            self.events.append(event)
+            full = len(self.events) >= getattr(settings, 'TRACKING_BUFFER_SIZE', 1000)
+        self._ensure_thread()
+        if full:
+            self.wakeup.set()
+    
+    def _ensure_thread(self):
+        if self.thread and self.thread.is_alive():
+            return
+        with self.lock:
+            if not (self.thread and self.thread.is_alive()):
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+    
+    def _run(self):
+        while True:
+            self.wakeup.wait(getattr(settings, 'TRACKING_FLUSH_INTERVAL', 2))
+            self.wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Takip olayları yazılamadı: {str(e)}")
+    
+    def flush(self):
+        """Biriken olayları veritabanına yaz; yazılan olay sayısını döndür
+        
+        Yazılamayan grup bir sonraki denemeye kalır. TRACKING_MAX_RETRIES
+        denemede de yazılamazsa olaylar tek tek uygulanır ve yine yazılamayanlar
+        atlanır; tek bozuk olay tamponu süresiz kilitlemez.
+        """
+        with self.flush_lock:
+            with self.lock:
+                events, self.events = self.events, []
+            if not events:
+                return 0
+            try:
+                apply_events(events)
+            except Exception:
+                self.failures += 1
+                if self.failures < getattr(settings, 'TRACKING_MAX_RETRIES', 5):
+                    with self.lock:
+                        self.events[:0] = events
+                    raise
+                self.failures = 0
+                return self._apply_one_by_one(events)
+            self.failures = 0
+            return len(events)
+    
+    def _apply_one_by_one(self, events):
+        written = 0
+        for event in events:
+            try:
+                apply_events([event])
+                written += 1
+            except Exception as e:
+                print(f"Takip olayı atlandı ({event.kind} {event.campaign_id}/{event.subscriber_id}): {str(e)}")
+        return written
+
+recorder = TrackingBuffer()
+atexit.register(lambda: recorder.flush())
+
+def record_open(identity, user_agent, ip_address):
+    recorder.record(TrackingEvent(
+        'open', identity.campaign_id, identity.subscriber_id, None,
+        user_agent, ip_address, timezone.now()
+    ))
+
+def record_click(identity, user_agent, ip_address):
+    recorder.record(TrackingEvent(
+        'click', identity.campaign_id, identity.subscriber_id, identity.url,
+        user_agent, ip_address, timezone.now()
+    ))
+
+def apply_events(events):
+    """Olay grubunu toplu sorgularla uygula
+    
+    Log satırları tek sorguda okunur, eksikler bulk_create ile oluşturulur,
+    değişenler bulk_update ile yazılır ve kampanya sayaçlarına sadece
+    artış farkları uygulanır.
+    """
+    # Gönderimden sonra silinen kampanya/abonelerin olayları atlanır; aksi halde
+    # yabancı anahtar hatası tüm grubu geri alır
+    campaign_ids = set(Campaign.objects.filter(
+        id__in={event.campaign_id for event in events}
+    ).values_list('id', flat=True))
+    subscriber_ids = set(Subscriber.objects.filter(
+        id__in={event.subscriber_id for event in events}
+    ).values_list('id', flat=True))
+    events = [
+        event for event in events
+        if event.campaign_id in campaign_ids and event.subscriber_id in subscriber_ids
+    ]
+    if not events:
+        return
+    keys = {(event.campaign_id, event.subscriber_id) for event in events}
+    
+    with transaction.atomic():
+        logs = {}
+        for email_log in EmailLog.objects.filter(
+            campaign_id__in=campaign_ids,
+            subscriber_id__in=subscriber_ids
+        ):
+            logs.setdefault((email_log.campaign_id, email_log.subscriber_id), email_log)
+        
+        # Gönderim logu olmayan olaylar için log oluştur
+        missing = [
+            EmailLog(
+                campaign_id=campaign_id,
+                subscriber_id=subscriber_id,
+                status='sent',
+                message_id=f"{campaign_id}_{subscriber_id}"
+            )
+            for campaign_id, subscriber_id in keys - set(logs)
+        ]
+        if missing:
+            EmailLog.objects.bulk_create(missing)
+            for email_log in missing:
+                logs[(email_log.campaign_id, email_log.subscriber_id)] = email_log
+        
+        changed = {}
+        clicks = {}
+        deltas = {}
+        webhook_events = []
+        for event in events:
+            email_log = logs[(event.campaign_id, event.subscriber_id)]
+            delta = deltas.setdefault(event.campaign_id, {
+                'opens': 0, 'unique_opens': 0, 'clicks': 0, 'unique_clicks': 0
+            })
+            
+            if event.kind == 'open':
+                # Sadece ilk açılmada say
+                if email_log.status == 'opened':
+                    continue
+                if email_log.opened_at is None:
+                    delta['unique_opens'] += 1
+                email_log.status = 'opened'
+                email_log.opened_at = email_log.opened_at or event.timestamp
+                delta['opens'] += 1
+                webhook_events.append((
+                    'email_opened', event.campaign_id, f"{event.campaign_id}:{event.subscriber_id}",
+                    _webhook_data(event)
+                ))
+            else:
+                clicks[(email_log.id, event.url)] = clicks.get((email_log.id, event.url), 0) + 1
+                webhook_events.append((
+                    'email_clicked', event.campaign_id, f"{event.campaign_id}:{event.subscriber_id}:{event.url}",
+                    _webhook_data(event)
+                ))
+                if email_log.status == 'clicked':
+                    continue
+                if email_log.clicked_at is None:
+                    delta['unique_clicks'] += 1
+                email_log.status = 'clicked'
+                email_log.clicked_at = email_log.clicked_at or event.timestamp
+                delta['clicks'] += 1
+            
+            email_log.user_agent = event.user_agent
+            email_log.ip_address = event.ip_address
+            changed[email_log.id] = email_log
+        
+        if changed:
+            # bulk_update auto_now alanını doldurmaz; analitik özeti updated_at'e bakar
+            now = timezone.now()
+            for email_log in changed.values():
+                email_log.updated_at = now
+            EmailLog.objects.bulk_update(
+                list(changed.values()),
+                ['status', 'opened_at', 'clicked_at', 'user_agent', 'ip_address', 'updated_at'],
+                batch_size=500
+            )
+        
+        if clicks:
+            _apply_clicks(clicks)
+        
+        _apply_sketches(events)
+        
+        # Kampanya istatistiklerini artış farklarıyla tek sorguda güncelle
+        Campaign.bulk_increment_counters(deltas)
+        invalidate_campaign_dashboards(deltas)
+        
+        # Webhook'lar aynı transaction'da kuyruğa alınır; HTTP isteğini run_webhooks yapar
+        enqueue_campaign_events(webhook_events)
+
+def _webhook_data(event):
+    data = {
+        'campaign_id': event.campaign_id,
+        'subscriber_id': event.subscriber_id,
+        'timestamp': event.timestamp,
+        'user_agent': event.user_agent,
+        'ip_address': event.ip_address,
+    }
+    if event.url:
+        data['url'] = event.url
+    return data
+
+def _apply_sketches(events):
+    """Olayları kampanya ve kampanya-gün HyperLogLog taslaklarına ekle
+    
+    Tekrarlanan açılmalar da eklenir; taslak aynı aboneyi iki kez saymaz ama
+    aboneyi açtığı her günün taslağına yazar.
+    """
+    members = {}
+    for event in events:
+        day = timezone.localtime(event.timestamp).date()
+        for date in (None, day):
+            members.setdefault((event.campaign_id, event.kind, date), set()).add(event.subscriber_id)
+    
+    # Eksik taslaklar önce boş oluşturulur, ardından satırlar kilitlenerek birleştirilir;
+    # böylece eşzamanlı flush'lar birbirinin register'larını ezmez
+    EngagementSketch.objects.bulk_create(
+        [EngagementSketch(campaign_id=campaign_id, kind=kind, date=date)
+         for campaign_id, kind, date in members],
+        ignore_conflicts=True
+    )
+    days = {date for _, _, date in members if date}
+    rows = EngagementSketch.objects.select_for_update().filter(
+        Q(date__isnull=True) | Q(date__in=days),
+        campaign_id__in={campaign_id for campaign_id, _, _ in members}
+    )
+    
+    now = timezone.now()
+    changed = []
+    for row in rows:
+        values = members.get((row.campaign_id, row.kind, row.date))
+        if not values:
+            continue
+        sketch = row.sketch
+        if sketch.update(values):
+            row.store(sketch)
+            row.updated_at = now
+            changed.append(row)
+    if changed:
+        EngagementSketch.objects.bulk_update(changed, ['registers', 'cardinality', 'updated_at'], batch_size=100)
+
+def _apply_clicks(clicks):
+    """ClickTrack satırlarını tek okuma ve toplu yazımla güncelle"""
+    existing = {
+        (click_track.email_log_id, click_track.url): click_track
+        for click_track in ClickTrack.objects.filter(
+            email_log_id__in={log_id for log_id, _ in clicks},
+            url__in={url for _, url in clicks}
+        )
+    }
+    
+    new_tracks = []
+    updated_tracks = []
+    for (log_id, url), count in clicks.items():
+        click_track = existing.get((log_id, url))
+        if click_track is None:
+            new_tracks.append(ClickTrack(email_log_id=log_id, url=url, click_count=count))
+        else:
+            click_track.click_count = F('click_count') + count
+            updated_tracks.append(click_track)
+    
+    if new_tracks:
+        ClickTrack.objects.bulk_create(new_tracks, ignore_conflicts=True)
+    if updated_tracks:
+        ClickTrack.objects.bulk_update(updated_tracks, ['click_count'], batch_size=500)
@@ -46,6 +46,7 @@ urlpatterns = [
     path('dashboard/mail-lists/<uuid:list_id>/delete/', views.delete_mail_list, name='delete_mail_list'),
     path('dashboard/mail-lists/<uuid:list_id>/import/', views.import_subscribers, name='import_subscribers'),
     path('dashboard/mail-lists/<uuid:list_id>/export/', views.export_subscribers, name='export_subscribers'),
+    path('dashboard/imports/<uuid:job_id>/progress/', views.import_job_progress, name='import_job_progress'),
     
     # Subscriber URLs
     path('dashboard/subscribers/add/', views.add_subscriber, name='add_subscriber'),
@@ -107,6 +108,7 @@ urlpatterns = [
     path('dashboard/api/campaigns/', views.api_campaigns, name='api_campaigns'),
     path('dashboard/api/subscribers/', views.api_subscribers, name='api_subscribers'),
     path('dashboard/api/analytics/', views.api_analytics, name='api_analytics'),
+    path('dashboard/api/export/engagement/', views.api_export_engagement, name='api_export_engagement'),
     
     # Utility URLs
     path('dashboard/get-ai-subject-suggestion/', views.get_ai_subject_suggestion, name='get_ai_subject_suggestion'),
@@ -114,8 +116,8 @@ urlpatterns = [
     path('dashboard/upload-image/', views.upload_image, name='upload_image'),
     
     # Tracking URLs (E-posta açılma ve tıklanma takibi için)
-    path('track/open/<uuid:log_id>/', views.track_open, name='track_open'),
-    path('track/click/<uuid:log_id>/', views.track_click, name='track_click'),
+    path('track/open/<str:token>/', views.track_open, name='track_open'),
+    path('track/click/<str:token>/', views.track_click, name='track_click'),
     path('unsubscribe/<uuid:subscriber_id>/<uuid:campaign_id>/', views.unsubscribe, name='unsubscribe'),
     path('dashboard/automations/steps/<uuid:automation_id>/add/', views.add_automation_step, name='add_automation_step'),
     path('dashboard/automations/steps/<uuid:step_id>/edit/', views.edit_automation_step, name='edit_automation_step'),
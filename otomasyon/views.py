@@ -1,17 +1,21 @@
 import base64
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
-from django.db.models import Count, Sum, Avg
+from django.db.models import Count, Sum, Avg, F
 from django.core.paginator import Paginator
-import csv
+from django.views.decorators.http import require_POST
 import json
 from .models import *
 from .forms import *
+from .dashboard_cache import get_dashboard_payload
+from .rollups import analytics_totals, rate_expression
+from .webhooks import build_payload
 
 # Public Views
 def index(request):
@@ -61,105 +65,111 @@ def register(request):
 # views.py - Dashboard view'ını güncelle
 @login_required
 def dashboard(request):
-    """Dashboard ana sayfa - Tamamen dinamik veriler"""
-    # Mail listeleri ve aboneler
-    mail_lists = MailList.objects.filter(user=request.user)
-    campaigns = Campaign.objects.filter(user=request.user)
-    automations = Automation.objects.filter(user=request.user)
-    
-    # Dinamik hesaplamalar
-    total_subscribers = Subscriber.objects.filter(
-        mail_list__user=request.user, 
-        is_active=True
-    ).count()
+    """Dashboard ana sayfa - kullanıcı başına önbelleğe alınmış veriler"""
+    # Performans grafiği verileri (7/30/90/365 gün)
+    try:
+        performance_days = int(request.GET.get('days', 30))
+    except ValueError:
+        performance_days = 30
+    if performance_days not in PERFORMANCE_WINDOWS:
+        performance_days = 30
+    
+    # Veri değiştiğinde signals.py ve toplu yazma yolları önbelleği temizler
+    context = dict(get_dashboard_payload(request.user, performance_days, build_dashboard_payload))
+    context.update({
+        'mail_lists': MailList.objects.filter(user=request.user),
+        'automations': Automation.objects.filter(user=request.user),
+        'performance_windows': PERFORMANCE_WINDOWS,
+    })
+    return render(request, 'dashboard/dashboard.html', context)
+
+def build_dashboard_payload(user, performance_days):
+    """Dashboard verilerini hesaplar; sonuç önbelleğe yazıldığı için sorgu seti içermez"""
+    campaigns = Campaign.objects.filter(user=user)
     
-    total_campaigns = campaigns.count()
+    # Dinamik hesaplamalar - liste sayısı ve aktif abone toplamı tek sorguda
+    list_totals = MailList.objects.filter(user=user).aggregate(
+        list_count=Count('id'),
+        total_subscribers=Sum('subscriber_count', default=0)
+    )
     
     # Aktif otomasyon sayısı
-    active_automations_count = automations.filter(is_active=True).count()
-    
-    # Son 30 günün istatistikleri
-    thirty_days_ago = timezone.now() - timezone.timedelta(days=30)
-    recent_campaigns = campaigns.filter(sent_at__gte=thirty_days_ago)
-    
-    total_sent_recent = sum(c.total_sent for c in recent_campaigns)
-    total_opens_recent = sum(c.opens for c in recent_campaigns)
+    active_automations_count = Automation.objects.filter(user=user, is_active=True).count()
     
-    success_rate = 0
-    if total_sent_recent > 0:
-        success_rate = (total_opens_recent / total_sent_recent) * 100
+    # Son 30 günün istatistikleri (rollup_analytics ile önceden hesaplanmış günlük özetler)
+    recent_totals = analytics_totals(user, days=30)
     
     # Yaklaşan kampanyalar
-    upcoming_campaigns = campaigns.filter(
+    upcoming_campaigns = list(campaigns.filter(
         status='scheduled', 
         scheduled_time__gte=timezone.now()
-    ).order_by('scheduled_time')[:5]
+    ).order_by('scheduled_time')[:5])
     
     # Son kampanyalar
-    recent_campaigns_list = campaigns.order_by('-created_at')[:5]
+    recent_campaigns_list = list(campaigns.order_by('-created_at')[:5])
     
-    # Performans grafiği verileri
-    performance_data = get_performance_data(request.user)
+    # Son 30 günün kampanyalarını açan tekil abone sayısı (HyperLogLog taslaklarının birleşimi)
+    unique_openers_recent = EngagementSketch.merged(EngagementSketch.objects.filter(
+        campaign__user=user,
+        campaign__sent_at__gte=timezone.now() - timezone.timedelta(days=30),
+        kind='open',
+        date__isnull=True
+    )).count()
     
-    context = {
-        'mail_lists': mail_lists,
+    return {
+        'list_count': list_totals['list_count'],
         'campaigns': recent_campaigns_list,
-        'automations': automations,
-        'total_subscribers': total_subscribers,
-        'total_campaigns': total_campaigns,
-        'success_rate': round(success_rate, 2),
+        'total_subscribers': list_totals['total_subscribers'],
+        'total_campaigns': campaigns.count(),
+        'success_rate': round(recent_totals['open_rate'], 2),
         'upcoming_campaigns': upcoming_campaigns,
-        'performance_data': performance_data,
-        'total_sent_recent': total_sent_recent,
-        'total_opens_recent': total_opens_recent,
+        'performance_data': get_performance_data(user, performance_days),
+        'total_sent_recent': recent_totals['emails_sent'],
+        'total_opens_recent': recent_totals['emails_opened'],
+        'unique_openers_recent': unique_openers_recent,
         'active_automations_count': active_automations_count,  # Yeni eklendi
+        'performance_days': performance_days,
     }
-    return render(request, 'dashboard/dashboard.html', context)
 
-def get_performance_data(user):
-    """30 günlük performans verileri"""
+PERFORMANCE_WINDOWS = (7, 30, 90, 365)
+
+def get_performance_data(user, days=30):
+    """Günlük performans verileri - pencere boyutundan bağımsız tek sorgu"""
     import json
-    from django.db.models import Count, Sum
-    from django.utils import timezone
+    from django.db.models import Sum
+    from django.db.models.functions import TruncDate
     from datetime import timedelta
     
-    end_date = timezone.now()
-    start_date = end_date - timedelta(days=30)
+    end_date = timezone.localdate()
+    start_date = end_date - timedelta(days=days)
+    
+    # Günlük toplamlar tek gruplu sorguda
+    daily = {
+        row['day']: row
+        for row in Campaign.objects.filter(
+            user=user,
+            sent_at__date__gte=start_date,
+            sent_at__date__lte=end_date
+        ).annotate(day=TruncDate('sent_at')).values('day').annotate(
+            sent=Sum('total_sent'),
+            opens=Sum('opens'),
+            clicks=Sum('clicks')
+        ).order_by()
+    }
     
-    # Günlük istatistikleri al
+    # Boş günler sıfırla doldurulur
     dates = []
     sent_data = []
     open_data = []
     click_data = []
     
-    current_date = start_date
-    while current_date <= end_date:
-        next_date = current_date + timedelta(days=1)
-        
-        # O gün gönderilen toplam e-posta sayısı
-        daily_sent = Campaign.objects.filter(
-            user=user,
-            sent_at__date=current_date
-        ).aggregate(total=Sum('total_sent'))['total'] or 0
-        
-        # O gün açılan toplam e-posta sayısı
-        daily_opens = Campaign.objects.filter(
-            user=user,
-            sent_at__date=current_date
-        ).aggregate(total=Sum('opens'))['total'] or 0
-        
-        # O gün tıklanan toplam link sayısı
-        daily_clicks = Campaign.objects.filter(
-            user=user,
-            sent_at__date=current_date
-        ).aggregate(total=Sum('clicks'))['total'] or 0
-        
+    for offset in range(days + 1):
+        current_date = start_date + timedelta(days=offset)
+        row = daily.get(current_date, {})
         dates.append(current_date.strftime('%d %b'))
-        sent_data.append(daily_sent)
-        open_data.append(daily_opens)
-        click_data.append(daily_clicks)
-        
-        current_date = next_date
+        sent_data.append(row.get('sent') or 0)
+        open_data.append(row.get('opens') or 0)
+        click_data.append(row.get('clicks') or 0)
     
     return {
         'dates': json.dumps(dates),
@@ -420,61 +430,84 @@ def edit_mail_list(request, list_id):
 
 @login_required
 def import_subscribers(request, list_id):
-    """CSV'den abone içe aktar"""
+    """CSV'den abone içe aktar - dosya diske yazılır, iş arka planda çalışır"""
+    from .importers import start_import_job_async
+    
     mail_list = get_object_or_404(MailList, id=list_id, user=request.user)
     
-    if request.method == 'POST' and request.FILES.get('csv_file'):
-        csv_file = request.FILES['csv_file']
-        decoded_file = csv_file.read().decode('utf-8').splitlines()
-        reader = csv.DictReader(decoded_file)
-        
-        imported_count = 0
-        skipped_count = 0
-        
-        for row in reader:
-            email = row.get('email', '').strip()
-            name = row.get('name', '').strip()
+    if request.method == 'POST':
+        csv_form = CSVImportForm(request.POST, request.FILES)
+        if csv_form.is_valid():
+            job = ImportJob.objects.create(
+                user=request.user,
+                mail_list=mail_list,
+                file=csv_form.cleaned_data['csv_file'],
+                email_column=csv_form.cleaned_data['email_column'],
+                name_column=csv_form.cleaned_data['name_column'],
+                has_headers=csv_form.cleaned_data['has_headers']
+            )
+            start_import_job_async(job.id)
             
-            if email:
-                # E-posta zaten var mı kontrol et
-                if not Subscriber.objects.filter(mail_list=mail_list, email=email).exists():
-                    Subscriber.objects.create(
-                        mail_list=mail_list,
-                        email=email,
-                        name=name
-                    )
-                    imported_count += 1
-                else:
-                    skipped_count += 1
-        
-        # Abone sayısını güncelle
-        mail_list.update_counts()
-        
-        messages.success(request, f'{imported_count} abone başarıyla eklendi. {skipped_count} abone atlandı (zaten mevcut).')
-        return redirect('mail_list_detail', list_id=mail_list.id)
+            if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'job_id': str(job.id),
+                    'progress_url': reverse('import_job_progress', args=[job.id])
+                })
+            
+            messages.success(request, 'İçe aktarma başlatıldı. Aboneler arka planda ekleniyor.')
+            return redirect('mail_list_detail', list_id=mail_list.id)
+    else:
+        csv_form = CSVImportForm()
+    
+    return render(request, 'dashboard/import_subscribers.html', {
+        'mail_list': mail_list,
+        'csv_form': csv_form
+    })
+
+@login_required
+def import_job_progress(request, job_id):
+    """İçe aktarma işinin ilerlemesi (JSON)"""
+    job = get_object_or_404(ImportJob, id=job_id, user=request.user)
     
-    return render(request, 'dashboard/import_subscribers.html', {'mail_list': mail_list})
+    return JsonResponse({
+        'id': str(job.id),
+        'mail_list': str(job.mail_list_id),
+        'status': job.status,
+        'processed': job.processed,
+        'inserted': job.inserted,
+        'skipped': job.skipped,
+        'invalid': job.invalid,
+        'error': job.error,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    })
 
 @login_required
 def export_subscribers(request, list_id):
-    """Aboneleri CSV'ye dışa aktar"""
-    mail_list = get_object_or_404(MailList, id=list_id, user=request.user)
-    subscribers = mail_list.subscribers.filter(is_active=True)
+    """Aboneleri CSV'ye dışa aktar - satır satır akış halinde"""
+    from django.conf import settings as django_settings
+    from .exporters import iter_csv, iter_gzip
     
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="{mail_list.name}_aboneler.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow(['Email', 'Ad Soyad', 'Telefon', 'Şirket', 'Abonelik Tarihi'])
+    mail_list = get_object_or_404(MailList, id=list_id, user=request.user)
+    subscribers = mail_list.subscribers.filter(is_active=True).values_list(
+        'email', 'name', 'phone', 'company', 'subscribed_at'
+    ).order_by()
+    
+    rows = (
+        (email, name, phone, company, subscribed_at.strftime('%d.%m.%Y'))
+        for email, name, phone, company, subscribed_at in subscribers.iterator(
+            chunk_size=getattr(django_settings, 'EXPORT_CHUNK_SIZE', 2000)
+        )
+    )
+    content = iter_csv(['Email', 'Ad Soyad', 'Telefon', 'Şirket', 'Abonelik Tarihi'], rows)
+    filename = f"{mail_list.name}_aboneler.csv"
     
-    for subscriber in subscribers:
-        writer.writerow([
-            subscriber.email,
-            subscriber.name,
-            subscriber.phone,
-            subscriber.company,
-            subscriber.subscribed_at.strftime('%d.%m.%Y')
-        ])
+    if request.GET.get('gzip'):
+        response = StreamingHttpResponse(iter_gzip(content), content_type='application/gzip')
+        filename += '.gz'
+    else:
+        response = StreamingHttpResponse(content, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     
     return response
 
@@ -824,27 +857,17 @@ def analytics(request):
 def analytics_overview(request):
     """Analitik genel bakış"""
     # 30 günlük istatistikler
-    end_date = timezone.now()
-    start_date = end_date - timezone.timedelta(days=30)
-    
-    campaigns = Campaign.objects.filter(
-        user=request.user,
-        sent_at__range=[start_date, end_date]
-    )
-    
-    total_emails_sent = sum(c.total_sent for c in campaigns)
-    total_opens = sum(c.opens for c in campaigns)
-    total_clicks = sum(c.clicks for c in campaigns)
-    
-    open_rate = (total_opens / total_emails_sent * 100) if total_emails_sent > 0 else 0
-    click_rate = (total_clicks / total_emails_sent * 100) if total_emails_sent > 0 else 0
+    totals = analytics_totals(request.user, days=30)
+    total_emails_sent = totals['emails_sent']
+    total_opens = totals['emails_opened']
+    total_clicks = totals['emails_clicked']
     
     context = {
         'total_emails_sent': total_emails_sent,
         'total_opens': total_opens,
         'total_clicks': total_clicks,
-        'open_rate': round(open_rate, 2),
-        'click_rate': round(click_rate, 2),
+        'open_rate': round(totals['open_rate'], 2),
+        'click_rate': round(totals['click_rate'], 2),
         'period': '30 gün'
     }
     return render(request, 'dashboard/analytics_overview.html', context)
@@ -860,15 +883,15 @@ def analytics_subscribers(request):
     """Abone analitikleri"""
     mail_lists = MailList.objects.filter(user=request.user)
     
-    total_subscribers = sum(ml.subscriber_count for ml in mail_lists)
-    total_unsubscribed = sum(ml.unsubscribed_count for ml in mail_lists)
+    list_totals = mail_lists.aggregate(
+        total_subscribers=Sum('subscriber_count', default=0),
+        total_unsubscribed=Sum('unsubscribed_count', default=0)
+    )
+    total_subscribers = list_totals['total_subscribers']
+    total_unsubscribed = list_totals['total_unsubscribed']
     
     # Son 30 gündeki yeni aboneler
-    thirty_days_ago = timezone.now() - timezone.timedelta(days=30)
-    new_subscribers = Subscriber.objects.filter(
-        mail_list__user=request.user,
-        subscribed_at__gte=thirty_days_ago
-    ).count()
+    new_subscribers = analytics_totals(request.user, days=30)['new_subscribers']
     
     context = {
         'total_subscribers': total_subscribers,
@@ -1037,12 +1060,23 @@ def edit_webhook(request, webhook_id):
 
 
 @login_required
+@require_POST
 def test_webhook(request, webhook_id):
     """Webhook test et"""
+    # Kalıcı bir gönderim kaydı oluşturduğu için sadece CSRF korumalı POST ile çalışır
     webhook = get_object_or_404(Webhook, id=webhook_id, user=request.user)
     
-    # Burada webhook test işlemi yapılacak
-    messages.info(request, 'Webhook test işlemi geliştirme aşamasındadır.')
+    # Test olayı doğrudan bu webhook için kuyruğa alınır; gönderimi run_webhooks yapar
+    WebhookDelivery.objects.create(
+        webhook=webhook,
+        event_type='test',
+        payload=build_payload('test', {
+            'webhook_id': webhook.id,
+            'event_type': webhook.event_type,
+            'message': 'Bu bir test olayıdır.',
+        })
+    )
+    messages.success(request, 'Test olayı kuyruğa alındı, kısa süre içinde gönderilecek.')
     return redirect('webhooks')
 
 # API Views
@@ -1091,19 +1125,51 @@ def api_subscribers(request):
 @login_required
 def api_analytics(request):
     """Analitik API"""
-    # Basit analitik verisi
-    campaigns = Campaign.objects.filter(user=request.user)
+    # Kampanya sayısı ve ortalama açılma oranı veritabanında hesaplanır
+    campaign_totals = Campaign.objects.filter(user=request.user).aggregate(
+        total_campaigns=Count('id'),
+        average_open_rate=Avg(rate_expression(F('unique_opens'), F('total_sent')), default=0)
+    )
     
     data = {
-        'total_campaigns': campaigns.count(),
-        'total_emails_sent': sum(c.total_sent for c in campaigns),
-        'average_open_rate': round(
-            sum(c.get_open_rate() for c in campaigns) / campaigns.count() if campaigns.count() > 0 else 0, 
-            2
-        )
+        'total_campaigns': campaign_totals['total_campaigns'],
+        'total_emails_sent': analytics_totals(request.user)['emails_sent'],
+        'average_open_rate': round(campaign_totals['average_open_rate'], 2)
     }
     return JsonResponse(data)
 
+@login_required
+def api_export_engagement(request):
+    """EmailLog/ClickTrack verisini NDJSON veya CSV olarak akış halinde dışa aktar"""
+    from .exporters import iter_engagement_export, iter_gzip, parse_bound
+    
+    kind = request.GET.get('type', 'logs')
+    export_format = request.GET.get('format', 'ndjson')
+    try:
+        content = iter_engagement_export(
+            kind,
+            export_format,
+            user=request.user,
+            campaign_id=request.GET.get('campaign') or None,
+            since=parse_bound(request.GET.get('since')),
+            until=parse_bound(request.GET.get('until'), end=True)
+        )
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    extension = 'csv' if export_format == 'csv' else 'ndjson'
+    content_type = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    filename = f"{kind}.{extension}"
+    # CSV varsayılan olarak sıkıştırılır
+    if request.GET.get('gzip', '1' if export_format == 'csv' else '') not in ('', '0'):
+        content = iter_gzip(content)
+        content_type = 'application/gzip'
+        filename += '.gz'
+    
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 # Utility Views
 @login_required
 def get_ai_subject_suggestion(request):
@@ -1153,110 +1219,37 @@ from django.http import HttpResponse
 import base64
 from django.views.decorators.csrf import csrf_exempt
 
+TRACKING_PIXEL = base64.b64decode('R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7')
+
 @csrf_exempt
-def track_open(request, subscriber_id, campaign_id):
-    """E-posta açılma takibi"""
-    try:
-        subscriber = Subscriber.objects.get(id=subscriber_id)
-        campaign = Campaign.objects.get(id=campaign_id)
-        
-        # EmailLog kaydını bul veya oluştur
-        email_log, created = EmailLog.objects.get_or_create(
-            campaign=campaign,
-            subscriber=subscriber,
-            defaults={
-                'status': 'sent',
-                'message_id': f"{campaign_id}_{subscriber_id}"
-            }
-        )
-        
-        # Sadece ilk açılmada say
-        if email_log.status != 'opened':
-            email_log.status = 'opened'
-            email_log.opened_at = timezone.now()
-            email_log.user_agent = request.META.get('HTTP_USER_AGENT', '')
-            email_log.ip_address = get_client_ip(request)
-            email_log.save()
-            
-            # Kampanya istatistiklerini güncelle
-            campaign.opens += 1
-            campaign.unique_opens = EmailLog.objects.filter(
-                campaign=campaign, 
-                status='opened'
-            ).values('subscriber').distinct().count()
-            campaign.save()
-            
-            print(f"E-posta açıldı: {subscriber.email} - {campaign.name}")
-        
-        # 1x1 transparent GIF döndür
-        gif_data = base64.b64decode('R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7')
-        response = HttpResponse(gif_data, content_type='image/gif')
-        response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response['Pragma'] = 'no-cache'
-        response['Expires'] = '0'
-        return response
-        
-    except (Subscriber.DoesNotExist, Campaign.DoesNotExist):
-        # Hata durumunda yine de GIF döndür (hata vermesin)
-        gif_data = base64.b64decode('R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7')
-        return HttpResponse(gif_data, content_type='image/gif')
+def track_open(request, token):
+    """E-posta açılma takibi - token'dan çözülür, veritabanına istek içinde gidilmez"""
+    from .tracking import read_token, record_open
+    
+    identity = read_token(token)
+    if identity:
+        record_open(identity, request.META.get('HTTP_USER_AGENT', ''), get_client_ip(request))
+    
+    # 1x1 transparent GIF döndür
+    response = HttpResponse(TRACKING_PIXEL, content_type='image/gif')
+    response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+    response['Pragma'] = 'no-cache'
+    response['Expires'] = '0'
+    return response
 
 @csrf_exempt
-def track_click(request, subscriber_id, campaign_id):
-    """E-posta tıklanma takibi"""
-    try:
-        subscriber = Subscriber.objects.get(id=subscriber_id)
-        campaign = Campaign.objects.get(id=campaign_id)
-        original_url = request.GET.get('url', '')
-        
-        if not original_url:
-            return redirect('/')
-        
-        # EmailLog kaydını bul veya oluştur
-        email_log, created = EmailLog.objects.get_or_create(
-            campaign=campaign,
-            subscriber=subscriber,
-            defaults={
-                'status': 'sent',
-                'message_id': f"{campaign_id}_{subscriber_id}"
-            }
-        )
-        
-        # Tıklanma kaydı oluştur
-        click_track, created = ClickTrack.objects.get_or_create(
-            email_log=email_log,
-            url=original_url,
-            defaults={'click_count': 1}
-        )
-        
-        if not created:
-            click_track.click_count += 1
-            click_track.save()
-        
-        # EmailLog durumunu güncelle
-        if email_log.status != 'clicked':
-            email_log.status = 'clicked'
-            email_log.clicked_at = timezone.now()
-            email_log.user_agent = request.META.get('HTTP_USER_AGENT', '')
-            email_log.ip_address = get_client_ip(request)
-            email_log.save()
-            
-            # Kampanya istatistiklerini güncelle
-            campaign.clicks += 1
-            campaign.unique_clicks = EmailLog.objects.filter(
-                campaign=campaign, 
-                status='clicked'
-            ).values('subscriber').distinct().count()
-            campaign.save()
-            
-            print(f"Link tıklandı: {subscriber.email} - {original_url}")
-        
-        # Orijinal URL'ye yönlendir
-        return redirect(original_url)
-        
-    except (Subscriber.DoesNotExist, Campaign.DoesNotExist):
-        # Hata durumunda orijinal URL'ye yönlendir
-        return redirect(original_url)
+def track_click(request, token):
+    """E-posta tıklanma takibi - sadece imzalı URL'lere yönlendirir"""
+    from .tracking import read_token, record_click
+    
+    identity = read_token(token)
+    if not identity or not identity.url:
+        return redirect('/')
+    
+    record_click(identity, request.META.get('HTTP_USER_AGENT', ''), get_client_ip(request))
+    
+    # Orijinal URL'ye yönlendir
+    return redirect(identity.url)
 
 def get_client_ip(request):
     """İstemci IP adresini al"""
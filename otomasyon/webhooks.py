@@ -0,0 +1,361 @@
+# otomasyon/webhooks.py
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .models import Webhook, WebhookDelivery
+
+SIGNATURE_HEADER = 'X-Webhook-Signature'
+TIMESTAMP_HEADER = 'X-Webhook-Timestamp'
+EVENT_HEADER = 'X-Webhook-Event'
+DELIVERY_HEADER = 'X-Webhook-Delivery'
+BATCH_HEADER = 'X-Webhook-Batch-Size'
+
+# Bu kodlar dışındaki 4xx yanıtları kalıcı hata sayılır ve tekrar denenmez
+RETRYABLE_CLIENT_ERRORS = {408, 409, 425, 429}
+
+def build_payload(event_type, data, occurred_at=None):
+    return {
+        'event': event_type,
+        'occurred_at': occurred_at or timezone.now(),
+        'data': data,
+    }
+
+def first_attempt_at(batch_size, batch_interval_ms, now):
+    """Toplu gönderimli webhook'larda olay en geç batch_interval_ms sonra gönderilir"""
+    if batch_size > 1:
+        return now + timezone.timedelta(milliseconds=batch_interval_ms)
+    return now
+
+class WebhookEventIndex:
+    """Kullanıcı -> aktif webhook olay türleri eşlemesinin işlem içi önbelleği
+
+    Webhook'u olmayan kullanıcıların abone kayıtları ve takip olayları için
+    sorgu çalışmaz. Webhook değiştiğinde signals.py tarafından geçersiz kılınır;
+    başka süreçlerdeki değişiklikler en geç WEBHOOK_INDEX_TTL saniye sonra görülür.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = None
+        self.built_at = 0
+
+    def invalidate(self):
+        with self.lock:
+            self.events = None
+
+    def _current(self):
+        ttl = getattr(settings, 'WEBHOOK_INDEX_TTL', 60)
+        with self.lock:
+            if self.events is None or time.monotonic() - self.built_at > ttl:
+                events = {}
+                for user_id, event_type in Webhook.objects.filter(is_active=True).values_list('user_id', 'event_type'):
+                    events.setdefault(user_id, set()).add(event_type)
+                self.events = events
+                self.built_at = time.monotonic()
+            return self.events
+
+    def has(self, user_id, event_type):
+        return event_type in self._current().get(user_id, ())
+
+    def has_any(self, event_types):
+        return any(set(event_types) & user_events for user_events in self._current().values())
+
+webhook_events = WebhookEventIndex()
+
+def subscriber_data(subscriber):
+    return {
+        'subscriber_id': subscriber.id,
+        'email': subscriber.email,
+        'name': subscriber.name,
+        'mail_list_id': subscriber.mail_list_id,
+        'subscribed_at': subscriber.subscribed_at,
+        'unsubscribed_at': subscriber.unsubscribed_at,
+    }
+
+def enqueue_event(user_id, event_type, data, coalesce_key=''):
+    """Kullanıcının bu olaya abone aktif webhook'ları için gönderim kaydı oluşturur
+
+    HTTP isteği yapılmaz; gönderimi run_webhooks işçisi yapar. coalesce_key
+    verilirse aynı olay ilk gönderimini beklerken tekrar kuyruğa alınmaz.
+    """
+    return enqueue_user_events(user_id, event_type, [(coalesce_key, data)])
+
+def enqueue_user_events(user_id, event_type, events):
+    """Aynı kullanıcı ve olay türündeki (coalesce_key, data) olaylarını toplu kuyruğa alır
+
+    Webhook'lar tek sorguda bulunur, tüm kayıtlar tek bulk_create ile yazılır.
+    """
+    if not events or not webhook_events.has(user_id, event_type):
+        return 0
+    webhooks = list(Webhook.objects.filter(
+        user_id=user_id,
+        event_type=event_type,
+        is_active=True
+    ).values_list('id', 'batch_size', 'batch_interval_ms'))
+    now = timezone.now()
+    deliveries = []
+    for coalesce_key, data in events:
+        payload = build_payload(event_type, data, now)
+        deliveries.extend(
+            WebhookDelivery(
+                webhook_id=webhook_id,
+                event_type=event_type,
+                payload=payload,
+                coalesce_key=coalesce_key,
+                next_attempt_at=first_attempt_at(batch_size, batch_interval_ms, now)
+            )
+            for webhook_id, batch_size, batch_interval_ms in webhooks
+        )
+    if deliveries:
+        WebhookDelivery.objects.bulk_create(deliveries, ignore_conflicts=True, batch_size=500)
+    return len(deliveries)
+
+def enqueue_campaign_events(events):
+    """Kampanya olaylarını (event_type, campaign_id, coalesce_key, data) toplu kuyruğa alır
+
+    Kampanya sahiplerinin webhook'ları tek sorguda bulunur ve tüm kayıtlar tek
+    bulk_create ile yazılır; takip tamponunun her flush'ında bir kez çağrılır.
+    """
+    if not events or not webhook_events.has_any({event[0] for event in events}):
+        return 0
+    now = timezone.now()
+    targets = {}
+    for webhook_id, event_type, campaign_id, batch_size, batch_interval_ms in Webhook.objects.filter(
+        is_active=True,
+        event_type__in={event[0] for event in events},
+        user__campaigns__id__in={event[1] for event in events}
+    ).values_list('id', 'event_type', 'user__campaigns__id', 'batch_size', 'batch_interval_ms'):
+        targets.setdefault((event_type, campaign_id), []).append(
+            (webhook_id, first_attempt_at(batch_size, batch_interval_ms, now))
+        )
+
+    deliveries = []
+    for event_type, campaign_id, coalesce_key, data in events:
+        payload = None
+        for webhook_id, next_attempt_at in targets.get((event_type, campaign_id), []):
+            payload = payload or build_payload(event_type, data)
+            deliveries.append(WebhookDelivery(
+                webhook_id=webhook_id,
+                event_type=event_type,
+                payload=payload,
+                coalesce_key=coalesce_key,
+                next_attempt_at=next_attempt_at
+            ))
+    if deliveries:
+        WebhookDelivery.objects.bulk_create(deliveries, ignore_conflicts=True, batch_size=500)
+    return len(deliveries)
+
+def sign_payload(secret_key, timestamp, body):
+    """Alıcının doğrulaması için 'zaman.gövde' üzerinde HMAC-SHA256 imzası"""
+    message = f"{timestamp}.".encode('utf-8') + body
+    return 'sha256=' + hmac.new(secret_key.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+def make_session(pool_size=None):
+    """Webhook istekleri için keep-alive bağlantı havuzlu oturum"""
+    pool_size = pool_size or getattr(settings, 'WEBHOOK_CONCURRENCY', 4)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'User-Agent': 'EmailOtomasyon-Webhook/1.0',
+    })
+    return session
+
+def retry_delay(attempts):
+    """Üstel geri çekilme; yarısı sabit, yarısı rastgele (aynı anda tekrar denemeleri dağıtır)"""
+    base = getattr(settings, 'WEBHOOK_RETRY_BASE_SECONDS', 10)
+    cap = getattr(settings, 'WEBHOOK_RETRY_MAX_SECONDS', 3600)
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def release_stale_deliveries(lease_seconds=None):
+    """Çöken işçilerin üzerinde kalan gönderimleri tekrar kuyruğa al"""
+    if lease_seconds is None:
+        lease_seconds = getattr(settings, 'WEBHOOK_LEASE_SECONDS', 300)
+    expired = timezone.now() - timezone.timedelta(seconds=lease_seconds)
+    return WebhookDelivery.objects.filter(
+        status='sending',
+        claimed_at__lt=expired
+    ).update(status='pending', claimed_by='')
+
+def claim_deliveries(worker_id, limit=None, now=None):
+    """Zamanı gelen gönderimlerden bir grubu bu işçi adına sahiplen
+
+    claim_outbox_batch ile aynı yöntem: PostgreSQL'de SKIP LOCKED, diğer
+    veritabanlarında koşullu UPDATE. Toplu gönderimli bir webhook'un en eski
+    olayının zamanı geldiyse ya da bekleyen olayı batch_size'a ulaştıysa,
+    henüz zamanı gelmemiş ilk denemeleri de aynı gruba alınır. Toplu gruplar
+    limit yüzünden bölünmez; sahiplenme gerekirse batch_size'a kadar büyür.
+    """
+    limit = limit or getattr(settings, 'WEBHOOK_CLAIM_SIZE', 200)
+    now = now or timezone.now()
+    ready_batches = WebhookDelivery.objects.filter(
+        status='pending',
+        webhook__batch_size__gt=1
+    ).values('webhook_id', 'webhook__batch_size').annotate(
+        waiting=Count('id'),
+        oldest=Min('next_attempt_at')
+    ).filter(
+        Q(waiting__gte=F('webhook__batch_size')) | Q(oldest__lte=now)
+    ).values('webhook_id')
+    pending = WebhookDelivery.objects.filter(
+        Q(next_attempt_at__lte=now) | Q(webhook_id__in=ready_batches, attempts=0),
+        status='pending'
+    )
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        ids = list(pending.order_by('next_attempt_at').values_list('id', flat=True)[:limit])
+        if not ids:
+            return []
+        # limit toplu gönderimleri bölmesin: batch_size'a tamamlanmamış grupların
+        # bekleyen olayları da alınır (batch_size, WEBHOOK_CLAIM_SIZE'dan büyük olabilir)
+        for row in WebhookDelivery.objects.filter(id__in=ids, webhook__batch_size__gt=1).values(
+            'webhook_id', 'event_type', 'webhook__batch_size'
+        ).annotate(claimed=Count('id')).order_by():
+            missing = -row['claimed'] % row['webhook__batch_size']
+            if missing:
+                ids += list(pending.filter(
+                    webhook_id=row['webhook_id'],
+                    event_type=row['event_type']
+                ).exclude(id__in=ids).order_by('next_attempt_at').values_list('id', flat=True)[:missing])
+        WebhookDelivery.objects.filter(id__in=ids, status='pending').update(
+            status='sending',
+            claimed_by=worker_id,
+            claimed_at=now,
+            attempts=F('attempts') + 1
+        )
+
+    return list(
+        WebhookDelivery.objects.filter(
+            id__in=ids,
+            status='sending',
+            claimed_by=worker_id
+        ).select_related('webhook').order_by('next_attempt_at')
+    )
+
+def post_group(session, webhook, deliveries):
+    """Grubu imzalayıp tek POST ile gönderir; (durum kodu, hata) döndürür
+
+    Toplu gönderimli webhook'larda gövde olayların JSON dizisidir ve her öğe
+    kendi delivery_id'sini taşır; diğerlerinde tek olayın nesnesi gönderilir.
+    """
+    if webhook.batch_size > 1:
+        body = [dict(delivery.payload, delivery_id=delivery.id) for delivery in deliveries]
+        delivery_header = str(len(deliveries))
+    else:
+        body = deliveries[0].payload
+        delivery_header = str(deliveries[0].id)
+    body = json.dumps(body, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+    timestamp = str(int(time.time()))
+    headers = {
+        EVENT_HEADER: deliveries[0].event_type,
+        TIMESTAMP_HEADER: timestamp,
+    }
+    headers[BATCH_HEADER if webhook.batch_size > 1 else DELIVERY_HEADER] = delivery_header
+    if webhook.secret_key:
+        headers[SIGNATURE_HEADER] = sign_payload(webhook.secret_key, timestamp, body)
+
+    try:
+        response = session.post(
+            webhook.url,
+            data=body,
+            headers=headers,
+            timeout=getattr(settings, 'WEBHOOK_TIMEOUT', 10)
+        )
+    except requests.RequestException as e:
+        return None, str(e)
+    if 200 <= response.status_code < 300:
+        return response.status_code, ''
+    return response.status_code, f"HTTP {response.status_code}: {response.text[:500]}"
+
+def group_deliveries(deliveries):
+    """Gönderimleri webhook ve olay türüne göre en fazla batch_size'lık gruplara böler"""
+    groups = {}
+    for delivery in deliveries:
+        groups.setdefault((delivery.webhook_id, delivery.event_type), []).append(delivery)
+    result = []
+    for group in groups.values():
+        size = max(group[0].webhook.batch_size, 1)
+        result.extend(group[i:i + size] for i in range(0, len(group), size))
+    return result
+
+def result_fields(attempts, status_code, error, now):
+    """Bir isteğin sonucu; gruptaki tüm satırlara tek UPDATE ile yazılır"""
+    fields = {'response_status': status_code, 'claimed_by': '', 'error': error, 'updated_at': now}
+    if not error:
+        fields.update(status='delivered', delivered_at=now)
+        return fields
+
+    permanent = status_code and 400 <= status_code < 500 and status_code not in RETRYABLE_CLIENT_ERRORS
+    if permanent or attempts >= getattr(settings, 'WEBHOOK_MAX_ATTEMPTS', 8):
+        fields['status'] = 'failed'
+    else:
+        fields.update(
+            status='pending',
+            next_attempt_at=now + timezone.timedelta(seconds=retry_delay(attempts))
+        )
+    return fields
+
+def drain_webhooks(worker_id, session=None, claim_size=None, concurrency=None):
+    """Zamanı gelen gönderim kalmayana kadar sahiplen ve gönder
+
+    Her grup tek istektir; istekler aynı oturumun bağlantı havuzu üzerinden
+    concurrency iş parçacığıyla yapılır ve iş parçacıkları veritabanına dokunmaz.
+    """
+    concurrency = concurrency or getattr(settings, 'WEBHOOK_CONCURRENCY', 4)
+    own_session = session is None
+    session = session or make_session(concurrency)
+    processed = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                release_stale_deliveries()
+                deliveries = claim_deliveries(worker_id, claim_size)
+                if not deliveries:
+                    break
+
+                groups = group_deliveries(deliveries)
+                results = executor.map(lambda group: post_group(session, group[0].webhook, group), groups)
+                now = timezone.now()
+                delivered = {}
+                failed = 0
+                for group, (status_code, error) in zip(groups, results):
+                    ids = [delivery.id for delivery in group]
+                    if error:
+                        failed += len(group)
+                        attempts = max(delivery.attempts for delivery in group)
+                        WebhookDelivery.objects.filter(id__in=ids).update(
+                            **result_fields(attempts, status_code, error, now)
+                        )
+                    else:
+                        delivered.setdefault(status_code, []).extend(ids)
+                # Başarılı gruplar yanıt koduna göre tek UPDATE ile işaretlenir
+                for status_code, ids in delivered.items():
+                    WebhookDelivery.objects.filter(id__in=ids).update(**result_fields(0, status_code, '', now))
+
+                if failed:
+                    print(f"{failed}/{len(deliveries)} webhook gönderimi başarısız, tekrar denenecek")
+                processed += len(deliveries)
+    finally:
+        if own_session:
+            session.close()
+
+    return processed